@@ -0,0 +1,85 @@
+"""Compare the memory kept alive by parsed matches with and without slotted objects.
+
+Run from the repository root with ``python -m benchmarks.memory``.
+"""
+### Imports ###
+import argparse
+import dataclasses
+import gc
+import json
+import tracemalloc
+import typing
+from typing import Any, Callable, Dict, List
+
+from dataclass_wizard import fromdict
+
+from valaw.decoder import decode
+from valaw.objects import MatchDto
+
+from .payloads import make_match
+
+### Helper Functions ###
+def plain_clone(cls: type, clones: Dict[type, type]) -> type:
+    """Rebuild a slotted dataclass as a plain dataclass with a per-instance ``__dict__``."""
+    if cls in clones:
+        return clones[cls]
+
+    def substitute(hint: Any) -> Any:
+        args = typing.get_args(hint)
+        if dataclasses.is_dataclass(hint):
+            return plain_clone(hint, clones)
+        if typing.get_origin(hint) is typing.Union:
+            return typing.Optional[substitute(args[0])]
+        if typing.get_origin(hint) is list:
+            return typing.List[substitute(args[0])]
+        return hint
+
+    hints = typing.get_type_hints(cls)
+    clone = dataclasses.make_dataclass(cls.__name__, [
+        (field.name, substitute(hints[field.name]), field) for field in dataclasses.fields(cls)
+    ])
+    clone.__module__ = __name__
+    globals()[cls.__name__] = clone
+    clones[cls] = clone
+    return clone
+
+def measure(decoder: Callable[[Dict[str, Any]], Any], bodies: List[bytes]) -> int:
+    """Return the number of bytes still allocated after decoding every body and dropping the raw JSON."""
+    gc.collect()
+    tracemalloc.start()
+    parsed = [decoder(json.loads(body)) for body in bodies]
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del parsed
+    return size
+
+### Main ###
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--matches", type=int, default=50, help="number of matches to parse")
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    bodies = [json.dumps(make_match(seed)).encode() for seed in range(args.matches)]
+    plain = plain_clone(MatchDto, {})
+
+    results = {"matches": args.matches}
+    for name, decoder in (
+        ("plain", lambda data: fromdict(plain, data)),
+        ("slotted", lambda data: fromdict(MatchDto, data)),
+        ("slotted_fast_decode", lambda data: decode(MatchDto, data)),
+    ):
+        results[f"{name}_bytes_per_match"] = measure(decoder, bodies) // args.matches
+    for name in ("slotted", "slotted_fast_decode"):
+        results[f"{name}_saving"] = 1 - results[f"{name}_bytes_per_match"] / results["plain_bytes_per_match"]
+
+    if args.json:
+        print(json.dumps(results))
+    else:
+        print(f"plain dataclasses:                 {results['plain_bytes_per_match'] / 1024:8.1f} KiB per match")
+        print(f"slotted dataclasses:               {results['slotted_bytes_per_match'] / 1024:8.1f} KiB per match ({results['slotted_saving']:.1%} saved)")
+        print(f"slotted dataclasses, fast_decode:  {results['slotted_fast_decode_bytes_per_match'] / 1024:8.1f} KiB per match ({results['slotted_fast_decode_saving']:.1%} saved)")
+
+if __name__ == "__main__":
+    main()
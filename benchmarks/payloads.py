@@ -0,0 +1,202 @@
+"""Synthetic payloads shaped like Riot API responses."""
+### Imports ###
+import random
+import uuid
+from typing import Any, Dict, List
+
+### Helper Functions ###
+def _uuid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128)))
+
+def _location(rng: random.Random) -> Dict[str, int]:
+    return {"x": rng.randint(-8000, 8000), "y": rng.randint(-8000, 8000)}
+
+def _player_locations(rng: random.Random, puuids: List[str]) -> List[Dict[str, Any]]:
+    return [{"puuid": puuid, "viewRadians": rng.random() * 6.28, "location": _location(rng)} for puuid in puuids]
+
+### Payloads ###
+def make_match(seed: int = 0, players: int = 10, rounds: int = 24) -> Dict[str, Any]:
+    """Build a raw match shaped like a GET_getMatch response.
+
+    :param seed: Seed for the random generator, the same seed always builds the same match.
+    :param players: The number of players, split over two teams.
+    :param rounds: The number of rounds.
+    """
+    rng = random.Random(seed)
+    puuids = [_uuid(rng) for _ in range(players)]
+    weapons = [_uuid(rng) for _ in range(18)]
+    teams = ["Red", "Blue"]
+    match = {
+        "matchInfo": {
+            "matchId": _uuid(rng),
+            "mapId": "/Game/Maps/Ascent/Ascent",
+            "gameLengthMillis": rounds * 100000,
+            "gameStartMillis": 1700000000000 + seed * 1000,
+            "provisioningFlowId": "Matchmaking",
+            "isCompleted": True,
+            "customGameName": "",
+            "queueId": "competitive",
+            "gameMode": "/Game/GameModes/Bomb/BombGameMode.BombGameMode_C",
+            "isRanked": True,
+            "seasonId": _uuid(rng),
+        },
+        "players": [{
+            "puuid": puuid,
+            "gameName": f"Player{index}",
+            "tagLine": "NA1",
+            "teamId": teams[index % 2],
+            "partyId": _uuid(rng),
+            "characterId": _uuid(rng),
+            "stats": {
+                "score": rng.randint(0, 9000),
+                "roundsPlayed": rounds,
+                "kills": rng.randint(0, 30),
+                "deaths": rng.randint(0, 30),
+                "assists": rng.randint(0, 15),
+                "playtimeMillis": rounds * 100000,
+                "abilityCasts": {"grenadeCasts": 1, "ability1Casts": 2, "ability2Casts": 3, "ultimateCasts": 1},
+            },
+            "competitiveTier": rng.randint(0, 27),
+            "isObserver": False,
+            "playerCard": _uuid(rng),
+            "playerTitle": _uuid(rng),
+            "accountLevel": rng.randint(1, 500),
+        } for index, puuid in enumerate(puuids)],
+        "coaches": [],
+        "teams": [{
+            "teamId": team,
+            "won": team == "Red",
+            "roundsPlayed": rounds,
+            "roundsWon": rounds // 2 + 1 if team == "Red" else rounds // 2 - 1,
+            "numPoints": rounds // 2 + 1 if team == "Red" else rounds // 2 - 1,
+        } for team in teams],
+        "roundResults": [],
+    }
+
+    for round_num in range(rounds):
+        stats = []
+        for puuid in puuids:
+            kills = [{
+                "timeSinceGameStartMillis": round_num * 100000 + rng.randint(0, 90000),
+                "timeSinceRoundStartMillis": rng.randint(0, 90000),
+                "killer": puuid,
+                "victim": rng.choice([other for other in puuids if other != puuid]),
+                "victimLocation": _location(rng),
+                "assistants": [rng.choice(puuids)] if rng.random() < 0.5 else [],
+                "playerLocations": _player_locations(rng, puuids),
+                "finishingDamage": {"damageType": "Weapon", "damageItem": rng.choice(weapons), "isSecondaryFireMode": False},
+            } for _ in range(rng.choice([0, 0, 1, 1, 2, 3]))]
+            damage = [{
+                "receiver": rng.choice(puuids),
+                "damage": rng.randint(1, 150),
+                "legshots": rng.randint(0, 2),
+                "bodyshots": rng.randint(0, 4),
+                "headshots": rng.randint(0, 2),
+            } for _ in range(rng.randint(0, 4))]
+            stats.append({
+                "puuid": puuid,
+                "kills": kills,
+                "damage": damage,
+                "score": rng.randint(0, 600),
+                "economy": {
+                    "loadoutValue": rng.randint(800, 5000),
+                    "weapon": rng.choice(weapons),
+                    "armor": rng.choice(weapons),
+                    "remaining": rng.randint(0, 9000),
+                    "spent": rng.randint(0, 5000),
+                },
+                "ability": {"grenadeEffects": None, "ability1Effects": None, "ability2Effects": None, "ultimateEffects": None},
+            })
+        planted = rng.random() < 0.5
+        match["roundResults"].append({
+            "roundNum": round_num,
+            "roundResult": "Eliminated",
+            "roundCeremony": "CeremonyDefault",
+            "winningTeam": rng.choice(teams),
+            "bombPlanter": puuids[0] if planted else None,
+            "bombDefuser": None,
+            "plantRoundTime": rng.randint(0, 90000) if planted else 0,
+            "plantPlayerLocations": _player_locations(rng, puuids) if planted else None,
+            "plantLocation": _location(rng) if planted else {"x": 0, "y": 0},
+            "plantSite": "A" if planted else "",
+            "defuseRoundTime": 0,
+            "defusePlayerLocations": None,
+            "defuseLocation": {"x": 0, "y": 0},
+            "playerStats": stats,
+            "roundResultCode": "Elimination",
+        })
+    return match
+
+def make_account(puuid: str, gameName: str = "Player", tagLine: str = "NA1") -> Dict[str, Any]:
+    """Build a raw account shaped like a GET_getByPuuid response."""
+    return {"puuid": puuid, "gameName": gameName, "tagLine": tagLine}
+
+def make_active_shard(puuid: str) -> Dict[str, Any]:
+    """Build a raw active shard shaped like a GET_getActiveShard response."""
+    return {"puuid": puuid, "game": "val", "activeShard": "na"}
+
+def make_content(seed: int = 0, items: int = 200, locale: str = "") -> Dict[str, Any]:
+    """Build raw content shaped like a GET_getContent response.
+
+    :param seed: Seed for the random generator, the same seed always builds the same content.
+    :param items: The number of items in each of the larger lists (skins, chromas, cards...).
+    :param locale: The requested locale, when empty every item carries localizedNames for all locales.
+    """
+    rng = random.Random(seed)
+    locales = ["ar-AE", "de-DE", "en-GB", "en-US", "es-ES", "es-MX", "fr-FR", "id-ID", "it-IT", "ja-JP",
+               "ko-KR", "pl-PL", "pt-BR", "ru-RU", "th-TH", "tr-TR", "vi-VN", "zh-CN", "zh-TW"]
+
+    def item(kind: str, index: int) -> Dict[str, Any]:
+        name = f"{kind} {index}"
+        entry = {"name": name, "id": _uuid(rng), "assetName": f"{kind}_{index}_PrimaryAsset", "assetPath": f"ShooterGame/Content/{kind}/{index}"}
+        if not locale:
+            entry["localizedNames"] = {code.replace("-", "_"): f"{name} ({code})" for code in locales}
+        return entry
+
+    sizes = {
+        "characters": 25, "maps": 12, "chromas": items, "skins": items, "skinLevels": items, "equips": 20,
+        "gameModes": 15, "totems": 0, "sprays": items, "sprayLevels": items, "charms": items // 2,
+        "charmLevels": items // 2, "playerCards": items, "playerTitles": items, "ceremonies": 8,
+    }
+    content = {"version": f"release-09.{seed:02d}-shipping-1-{rng.randint(100000, 999999)}"}
+    for kind, size in sizes.items():
+        content[kind] = [item(kind, index) for index in range(size)]
+    content["acts"] = [{
+        "name": f"Act {index}", "id": _uuid(rng), "isActive": index == 0, "type": "act", "parentId": None,
+        **({} if locale else {"localizedNames": {code.replace("-", "_"): f"Act {index} ({code})" for code in locales}})
+    } for index in range(30)]
+    return content
+
+def make_matchlist(puuid: str, seed: int = 0, matches: int = 20) -> Dict[str, Any]:
+    """Build a raw matchlist shaped like a GET_getMatchlist response."""
+    rng = random.Random(seed)
+    return {"puuid": puuid, "history": [{
+        "matchId": _uuid(rng), "gameStartTimeMillis": 1700000000000 - index * 3600000, "queueId": "competitive"
+    } for index in range(matches)]}
+
+def make_recent(seed: int = 0, matches: int = 100, currentTime: int = 1700000000000) -> Dict[str, Any]:
+    """Build a raw recent matches list shaped like a GET_getRecent response."""
+    rng = random.Random(seed)
+    return {"currentTime": currentTime, "matchIds": [_uuid(rng) for _ in range(matches)]}
+
+def make_leaderboard(actId: str, startIndex: int = 0, size: int = 200, totalPlayers: int = 10000, seed: int = 0) -> Dict[str, Any]:
+    """Build a page of a raw leaderboard shaped like a GET_getLeaderboard response.
+
+    Players are the same for every call with the same seed, so pages fit together.
+    """
+    players = []
+    for rank in range(startIndex + 1, min(startIndex + size, totalPlayers) + 1):
+        rng = random.Random(seed * 1000003 + rank)
+        players.append({
+            "puuid": _uuid(rng), "gameName": f"Player{rank}", "tagLine": "NA1", "leaderboardRank": rank,
+            "rankedRating": max(0, 1500 - rank // 10), "numberOfWins": rng.randint(50, 400), "competitiveTier": 27 if rank <= 500 else 24,
+        })
+    return {
+        "actId": actId, "players": players, "totalPlayers": totalPlayers, "immortalStartingPage": 1,
+        "immortalStartingIndex": 1, "topTierRRThreshold": 550, "tierDetails": {}, "startIndex": startIndex,
+        "shard": "na", "query": None,
+    }
+
+def make_platform_data(region: str = "na") -> Dict[str, Any]:
+    """Build raw platform data shaped like a GET_getPlatformData response, without maintenances or incidents."""
+    return {"id": region.upper(), "name": region.upper(), "locales": ["en_US"], "maintenances": [], "incidents": []}
@@ -0,0 +1,117 @@
+"""Replay the requests recorded in a cassette against the current client, with no network.
+
+Record traffic by passing ``cassette=valaw.Cassette(path, "record")`` to a client, then run
+``python -m benchmarks.replay path`` to send every recorded request again, in order,
+and decode each response the way the client method that made it would. Results use
+the same format as ``benchmarks.run``, so ``--compare`` works across builds.
+"""
+### Imports ###
+import argparse
+import asyncio
+import json
+import platform
+import time
+from typing import Any, Callable, Dict, List
+
+import valaw
+from valaw.client import DEFAULT_JSON_LOADS
+from valaw.objects import (
+    AccountDto, ActiveShardDto, ContentDto, LeaderboardDto, MatchlistDto, PlatformDataDto, RecentMatchesDto
+)
+
+from .run import compare, percentile, report, version
+
+### Constants ###
+DTOS = {
+    "GET_getByPuuid": AccountDto, "GET_getByRiotId": AccountDto, "GET_getByAccessToken": AccountDto,
+    "GET_getActiveShard": ActiveShardDto, "GET_getContent": ContentDto, "GET_getMatchlist": MatchlistDto,
+    "GET_getRecent": RecentMatchesDto, "GET_getLeaderboard": LeaderboardDto, "GET_getConsoleMatchlist": MatchlistDto,
+    "GET_getConsoleRecent": RecentMatchesDto, "GET_getConsoleLeaderboard": LeaderboardDto, "GET_getPlatformData": PlatformDataDto,
+}
+"""The object each client method decodes its response into, matches are handled separately."""
+
+### Replay ###
+def decoder(client: valaw.Client, endpoint: str) -> Callable[[Any], Any]:
+    if endpoint in ("GET_getMatch", "GET_getConsoleMatch"):
+        return client._decode_match
+    cls = DTOS.get(endpoint)
+    if cls is None:
+        return lambda payload: payload
+    return lambda payload: client._decode(cls, payload)
+
+async def replay(args: argparse.Namespace) -> Dict[str, Any]:
+    """Send every recorded request through the client and return the results."""
+    cassette = valaw.Cassette(args.cassette, "replay", speed=args.speed)
+    durations: List[float] = []
+    metrics = valaw.Metrics(on_request_end=lambda event: durations.append(event.duration))
+    async with valaw.Client("replay", "americas", rate_limit=False, coalesce=False, retry_policy=None, cassette=cassette, metrics=metrics, fast_decode=args.fast_decode) as client:
+        semaphore = asyncio.Semaphore(args.concurrency)
+        first = cassette.records[0].time if len(cassette) else 0.0
+        started = time.perf_counter()
+        errors = 0
+
+        async def send(record):
+            nonlocal errors
+            if args.pace:
+                # Keep the recorded spacing between requests, scaled by the replay speed.
+                await asyncio.sleep(max(0.0, (record.time - first) / (args.speed or 1.0) - (time.perf_counter() - started)))
+            async with semaphore:
+                try:
+                    decoder(client, record.endpoint)(await client._request(record.url, client._headers, record.route, record.endpoint))
+                except Exception:
+                    errors += 1
+
+        await asyncio.gather(*(send(record) for record in cassette.records))
+        seconds = time.perf_counter() - started
+
+    snapshot = metrics.snapshot()
+    requests = snapshot["requests"]
+    json_decode = sum(endpoint["json_decode"]["sum"] for endpoint in snapshot["endpoints"].values())
+    fromdict = sum(summary["sum"] for summary in snapshot["fromdict"].values())
+    return {
+        "requests": requests,
+        "errors": errors,
+        "statuses": snapshot["statuses"],
+        "seconds": seconds,
+        "requests_per_second": requests / seconds if seconds else None,
+        "latency_p50": percentile(durations, 0.5),
+        "latency_p99": percentile(durations, 0.99),
+        "json_decode_per_call": json_decode / requests if requests else None,
+        "fromdict_per_call": fromdict / requests if requests else None,
+        "retained_bytes_per_call": None,
+    }
+
+### Main ###
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("cassette", help="the cassette file to replay")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--speed", type=float, help="delay responses by their recorded latency divided by this, defaults to no delay")
+    parser.add_argument("--pace", action="store_true", help="send requests at their recorded times, scaled by --speed")
+    parser.add_argument("--fast-decode", action="store_true", help="build objects with the compiled decoders")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="compare the results with a previous JSON file")
+    args = parser.parse_args()
+
+    results = {"replay": asyncio.run(replay(args))}
+    output = {
+        "meta": {
+            "valaw": version(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "json_loads": f"{DEFAULT_JSON_LOADS.__module__}.{DEFAULT_JSON_LOADS.__name__}",
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "config": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+        },
+        "results": results,
+    }
+    report(results)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(output, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), output)
+
+if __name__ == "__main__":
+    main()
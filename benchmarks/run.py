@@ -0,0 +1,231 @@
+"""Measure client throughput, latency, decode time and memory against a local mock of the Riot API.
+
+Run from the repository root with ``python -m benchmarks.run``. The mock server runs in
+a separate process so it does not compete with the client for the event loop. Save the
+results with ``--output`` and compare two runs with ``--compare``.
+"""
+### Imports ###
+import argparse
+import asyncio
+import gc
+import json
+import platform
+import socket
+import subprocess
+import sys
+import time
+import tracemalloc
+from importlib import metadata
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import valaw
+from valaw.client import DEFAULT_JSON_LOADS
+
+### Constants ###
+SCENARIOS = ("get_match", "get_content", "leaderboard", "bulk")
+LOWER_IS_BETTER = ("latency_p50", "latency_p99", "json_decode_per_call", "fromdict_per_call", "retained_bytes_per_call")
+HIGHER_IS_BETTER = ("requests_per_second",)
+
+### Helper Functions ###
+def percentile(values: List[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+def version() -> str:
+    try:
+        return metadata.version("valaw")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def start_server(args: argparse.Namespace) -> subprocess.Popen:
+    """Start the mock server in a subprocess and wait until it accepts connections."""
+    command = [
+        sys.executable, "-m", "benchmarks.server", "--port", str(args.port),
+        "--latency", str(args.latency), "--jitter", str(args.jitter),
+        "--error-rate", str(args.error_rate), "--error-status", str(args.error_status),
+    ]
+    if args.app_limits:
+        command += ["--app-limits", args.app_limits]
+    if args.method_limits:
+        command += ["--method-limits", args.method_limits]
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL)
+    deadline = time.monotonic() + 15
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", args.port), timeout=0.2).close()
+            return process
+        except OSError:
+            if process.poll() is not None:
+                raise RuntimeError("The mock server exited before it started listening.")
+            time.sleep(0.05)
+    process.terminate()
+    raise RuntimeError("The mock server did not start listening in time.")
+
+### Scenarios ###
+async def gather_limited(calls: List[Callable[[], Awaitable[Any]]], concurrency: int) -> List[Any]:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(call):
+        async with semaphore:
+            return await call()
+
+    return await asyncio.gather(*(run(call) for call in calls), return_exceptions=True)
+
+def scenario_calls(name: str, client: valaw.Client, args: argparse.Namespace, offset: int) -> Callable[[], Awaitable[List[Any]]]:
+    """Return a coroutine function running one pass of a scenario and returning its results.
+
+    ``offset`` keeps match ids distinct between passes, so nothing is served by coalescing.
+    """
+    if name == "get_match":
+        return lambda: gather_limited([
+            (lambda index=index: client.GET_getMatch(f"match-{offset + index}", "na")) for index in range(args.calls)
+        ], args.concurrency)
+    if name == "get_content":
+        # One at a time, concurrent calls for the same URL would be coalesced.
+        return lambda: gather_limited([lambda: client.GET_getContent("na")] * args.content_calls, 1)
+    if name == "leaderboard":
+        async def leaderboard():
+            return [player async for player in client.iter_leaderboard(f"act-{offset}", "na", concurrency=args.concurrency)]
+        return leaderboard
+    if name == "bulk":
+        async def bulk():
+            ids = [f"bulk-{offset + index}" for index in range(args.calls)]
+            return [result async for _, result in client.get_matches(ids, "na", concurrency=args.concurrency)]
+        return bulk
+    raise ValueError(f"Unknown scenario {name}.")
+
+async def measure(name: str, args: argparse.Namespace, base_url: str) -> Dict[str, Any]:
+    """Run a scenario twice, once timed and once under tracemalloc, and return its results."""
+    durations: List[float] = []
+    metrics = valaw.Metrics(on_request_end=lambda event: durations.append(event.duration))
+    async with valaw.Client(["bench-key-1"], "americas", base_url=base_url, metrics=metrics, fast_decode=args.fast_decode) as client:
+        # Warm up the connection pool and the server's payload cache.
+        await scenario_calls(name, client, args, 10 ** 6)()
+        metrics.reset()
+        durations.clear()
+
+        started = time.perf_counter()
+        results = await scenario_calls(name, client, args, 0)()
+        seconds = time.perf_counter() - started
+        snapshot = metrics.snapshot()
+        requests = snapshot["requests"]
+        errors = sum(isinstance(result, Exception) for result in results)
+        json_decode = sum(endpoint["json_decode"]["sum"] for endpoint in snapshot["endpoints"].values())
+        fromdict = sum(summary["sum"] for summary in snapshot["fromdict"].values())
+        del results
+
+        # Memory kept alive by the results of each call, measured separately since tracing slows everything down.
+        client.metrics = None
+        gc.collect()
+        tracemalloc.start()
+        baseline, _ = tracemalloc.get_traced_memory()
+        results = await scenario_calls(name, client, args, 2 * 10 ** 6)()
+        gc.collect()
+        retained, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del results
+
+    return {
+        "requests": requests,
+        "errors": errors,
+        "statuses": snapshot["statuses"],
+        "seconds": seconds,
+        "requests_per_second": requests / seconds if seconds else None,
+        "latency_p50": percentile(durations, 0.5),
+        "latency_p99": percentile(durations, 0.99),
+        "json_decode_per_call": json_decode / requests if requests else None,
+        "fromdict_per_call": fromdict / requests if requests else None,
+        "retained_bytes_per_call": (retained - baseline) // requests if requests else None,
+        "peak_bytes": peak - baseline,
+    }
+
+### Reporting ###
+def compare(previous: Dict[str, Any], current: Dict[str, Any]):
+    """Print the change of every metric between two result files."""
+    for name, result in current["results"].items():
+        old = previous.get("results", {}).get(name)
+        if old is None:
+            continue
+        print(f"{name}:")
+        for metric in HIGHER_IS_BETTER + LOWER_IS_BETTER:
+            before, after = old.get(metric), result.get(metric)
+            if not before or after is None:
+                continue
+            change = after / before - 1
+            better = change > 0 if metric in HIGHER_IS_BETTER else change < 0
+            print(f"  {metric:26} {before:12.6g} -> {after:12.6g}  {change:+7.1%} {'better' if better else 'worse' if change else ''}")
+
+def report(results: Dict[str, Dict[str, Any]]):
+    def show(value: Optional[float], scale: float, unit: str) -> str:
+        return f"{'-' if value is None else f'{value * scale:.2f}':>9} {unit}"
+
+    for name, result in results.items():
+        print(
+            f"{name:12} {show(result['requests_per_second'], 1, 'req/s')}  p50 {show(result['latency_p50'], 1000, 'ms')}  "
+            f"p99 {show(result['latency_p99'], 1000, 'ms')}  json {show(result['json_decode_per_call'], 1000, 'ms')}  "
+            f"fromdict {show(result['fromdict_per_call'], 1000, 'ms')}  {show(result['retained_bytes_per_call'], 1 / 1024, 'KiB/call')}  "
+            f"errors {result['errors']}"
+        )
+
+### Main ###
+async def run(args: argparse.Namespace) -> Dict[str, Dict[str, Any]]:
+    base_url = f"http://127.0.0.1:{args.port}/{{route}}"
+    return {name: await measure(name, args, base_url) for name in args.scenarios}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("scenarios", nargs="*", default=list(SCENARIOS), help=f"scenarios to run, defaults to all of {', '.join(SCENARIOS)}")
+    parser.add_argument("--calls", type=int, default=200, help="match requests per get_match and bulk pass")
+    parser.add_argument("--content-calls", type=int, default=10, help="content requests per get_content pass")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--fast-decode", action="store_true", help="build objects with the compiled decoders")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds the server delays every response by")
+    parser.add_argument("--jitter", type=float, default=0.0, help="maximum extra random server delay in seconds")
+    parser.add_argument("--app-limits", help='application rate limits the server enforces, e.g. "500:10"')
+    parser.add_argument("--method-limits", help="method rate limits the server enforces")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests the server fails")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--port", type=int, default=0, help="port for the mock server, defaults to a free one")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="compare the results with a previous JSON file")
+    args = parser.parse_args()
+    for name in args.scenarios:
+        if name not in SCENARIOS:
+            parser.error(f"unknown scenario {name}, valid scenarios are: {', '.join(SCENARIOS)}")
+    args.port = args.port or free_port()
+
+    server = start_server(args)
+    try:
+        results = asyncio.run(run(args))
+    finally:
+        server.terminate()
+        server.wait()
+
+    output = {
+        "meta": {
+            "valaw": version(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "json_loads": f"{DEFAULT_JSON_LOADS.__module__}.{DEFAULT_JSON_LOADS.__name__}",
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "config": {key: value for key, value in vars(args).items() if key not in ("output", "compare", "port")},
+        },
+        "results": results,
+    }
+    report(results)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(output, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+"""A local stand-in for the Riot API, serving synthetic payloads for every endpoint the client calls.
+
+Point a client at it with ``valaw.Client(..., base_url=server.base_url)``. Run it on its
+own with ``python -m benchmarks.server --port 8080``.
+"""
+### Imports ###
+import argparse
+import asyncio
+import json
+import random
+import time
+import zlib
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from aiohttp import web
+
+from . import payloads
+
+### Helper Functions ###
+def parse_limits(limits: Optional[str]) -> List[Tuple[int, int]]:
+    """Parse a Riot rate limit header value such as ``"20:1,100:120"`` into (requests, seconds) pairs."""
+    if not limits:
+        return []
+    return [tuple(int(part) for part in limit.split(":")) for limit in limits.split(",")]
+
+def _seed(value: str) -> int:
+    return zlib.crc32(value.encode())
+
+### Rate Limits ###
+class _Windows:
+    """Fixed rate limit windows counting the requests of one key, as the API does."""
+
+    def __init__(self, limits: List[Tuple[int, int]]):
+        self.limits = limits
+        self.starts = [0.0] * len(limits)
+        self.counts = [0] * len(limits)
+
+    def hit(self) -> Optional[float]:
+        """Count a request and return None, or the seconds until it may be retried if a limit is exceeded."""
+        now = time.monotonic()
+        for index, (_, seconds) in enumerate(self.limits):
+            if now - self.starts[index] >= seconds:
+                self.starts[index], self.counts[index] = now, 0
+        retry_after = None
+        for index, (requests, seconds) in enumerate(self.limits):
+            if self.counts[index] >= requests:
+                wait = self.starts[index] + seconds - now
+                retry_after = wait if retry_after is None else max(retry_after, wait)
+        if retry_after is not None:
+            return retry_after
+        for index in range(len(self.limits)):
+            self.counts[index] += 1
+        return None
+
+    def header(self) -> str:
+        return ",".join(f"{count}:{seconds}" for count, (_, seconds) in zip(self.counts, self.limits))
+
+### Mock Server ###
+class MockRiotServer:
+    """An aiohttp server answering every client endpoint with synthetic payloads.
+
+    Paths are prefixed with the routing value, so the base URL is
+    ``http://host:port/{route}``. Bodies are built once per distinct resource and kept,
+    so serving is cheap compared to the client work being measured.
+
+    :param host: The interface to listen on, defaults to "127.0.0.1".
+    :param port: The port to listen on, defaults to 0 (any free port).
+    :param latency: Seconds every response is delayed by, defaults to 0.
+    :param jitter: Extra delay in seconds, drawn uniformly between 0 and this, defaults to 0.
+    :param app_limits: Application rate limits per key in the X-App-Rate-Limit format, e.g. "20:1,100:120". Defaults to None (no limits, no rate limit headers).
+    :param method_limits: Method rate limits per key and endpoint in the X-Method-Rate-Limit format, defaults to None.
+    :param error_rate: The fraction of requests answered with ``error_status``, defaults to 0.
+    :param error_status: The status code of injected errors, defaults to 503.
+    :param rounds: The number of rounds of every served match, defaults to 24.
+    :param distinct_matches: The number of different match bodies served, match ids share them by hash. Defaults to 64.
+    :param content_items: The size of the larger content lists, defaults to 200.
+    :param leaderboard_size: The number of players on every leaderboard, defaults to 10000.
+    :param seed: Seed for latency and error injection, defaults to 0.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0, jitter: float = 0.0, app_limits: Optional[str] = None, method_limits: Optional[str] = None, error_rate: float = 0.0, error_status: int = 503, rounds: int = 24, distinct_matches: int = 64, content_items: int = 200, leaderboard_size: int = 10000, seed: int = 0):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.app_limits = app_limits
+        self.method_limits = method_limits
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.rounds = rounds
+        self.distinct_matches = distinct_matches
+        self.content_items = content_items
+        self.leaderboard_size = leaderboard_size
+        self.requests = 0
+        """The number of requests received, including the ones answered with errors or 429s."""
+        self.statuses: Dict[int, int] = {}
+        """The number of responses sent by status code."""
+        self._rng = random.Random(seed)
+        self._bodies: Dict[Any, bytes] = {}
+        self._app_windows: Dict[str, _Windows] = {}
+        self._method_windows: Dict[Tuple[str, str], _Windows] = {}
+        self._runner: Optional[web.AppRunner] = None
+
+    @property
+    def base_url(self) -> str:
+        """The base URL to pass to the client."""
+        return f"http://{self.host}:{self.port}/{{route}}"
+
+    def _body(self, key: Any, build: Callable[[], Dict[str, Any]]) -> bytes:
+        body = self._bodies.get(key)
+        if body is None:
+            body = self._bodies[key] = json.dumps(build()).encode()
+        return body
+
+    def app(self) -> web.Application:
+        """Return the aiohttp application, for running it some other way."""
+        routes = [
+            ("/{route}/riot/account/v1/accounts/by-puuid/{puuid}", "account", lambda r: ("account", r.match_info["puuid"]), lambda r: payloads.make_account(r.match_info["puuid"])),
+            ("/{route}/riot/account/v1/accounts/by-riot-id/{gameName}/{tagLine}", "account-riot-id", lambda r: ("riot-id", r.match_info["gameName"], r.match_info["tagLine"]), lambda r: payloads.make_account(f"puuid-{r.match_info['gameName']}", r.match_info["gameName"], r.match_info["tagLine"])),
+            ("/{route}/riot/account/v1/accounts/me", "account-me", lambda r: ("me",), lambda r: payloads.make_account("puuid-me")),
+            ("/{route}/riot/account/v1/active-shards/by-game/val/by-puuid/{puuid}", "active-shard", lambda r: ("shard", r.match_info["puuid"]), lambda r: payloads.make_active_shard(r.match_info["puuid"])),
+            ("/{route}/val/content/v1/contents", "content", lambda r: ("content", r.query.get("locale", "")), lambda r: payloads.make_content(0, self.content_items, r.query.get("locale", ""))),
+            ("/{route}/val/match/v1/matches/{matchId}", "match", self._match_key, lambda r: payloads.make_match(self._match_key(r)[1], rounds=self.rounds)),
+            ("/{route}/val/match/v1/matchlists/by-puuid/{puuid}", "matchlist", lambda r: ("matchlist", r.match_info["puuid"]), lambda r: payloads.make_matchlist(r.match_info["puuid"], _seed(r.match_info["puuid"]))),
+            ("/{route}/val/match/v1/recent-matches/by-queue/{queue}", "recent", lambda r: ("recent", r.match_info["queue"]), lambda r: payloads.make_recent(_seed(r.match_info["queue"]))),
+            ("/{route}/val/ranked/v1/leaderboards/by-act/{actId}", "leaderboard", self._leaderboard_key, self._leaderboard),
+            ("/{route}/val/match/console/v1/matches/{matchId}", "console-match", self._match_key, lambda r: payloads.make_match(self._match_key(r)[1], rounds=self.rounds)),
+            ("/{route}/val/match/console/v1/matchlists/by-puuid/{puuid}", "console-matchlist", lambda r: ("matchlist", r.match_info["puuid"]), lambda r: payloads.make_matchlist(r.match_info["puuid"], _seed(r.match_info["puuid"]))),
+            ("/{route}/val/match/console/v1/recent-matches/by-queue/{queue}", "console-recent", lambda r: ("recent", r.match_info["queue"]), lambda r: payloads.make_recent(_seed(r.match_info["queue"]))),
+            ("/{route}/val/console/ranked/v1/leaderboards/by-act/{actId}", "console-leaderboard", self._leaderboard_key, self._leaderboard),
+            ("/{route}/val/status/v1/platform-data", "platform-data", lambda r: ("platform", r.match_info["route"]), lambda r: payloads.make_platform_data(r.match_info["route"])),
+        ]
+        app = web.Application()
+        for path, method, key, build in routes:
+            app.router.add_get(path, self._handler(method, key, build))
+        app.router.add_get("/{route}/", self._root)
+        return app
+
+    def _match_key(self, request: web.Request) -> Tuple:
+        return ("match", _seed(request.match_info["matchId"]) % self.distinct_matches)
+
+    def _leaderboard_key(self, request: web.Request) -> Tuple:
+        query = request.query
+        return ("leaderboard", request.match_info["actId"], int(query.get("startIndex", 0)), int(query.get("size", 200)))
+
+    def _leaderboard(self, request: web.Request) -> Dict[str, Any]:
+        _, actId, startIndex, size = self._leaderboard_key(request)
+        return payloads.make_leaderboard(actId, startIndex, size, self.leaderboard_size)
+
+    def _respond(self, status: int, body: bytes, headers: Dict[str, str]) -> web.Response:
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        return web.Response(status=status, body=body, headers=headers, content_type="application/json")
+
+    async def _root(self, request: web.Request) -> web.Response:
+        return self._respond(403, b'{"status": {"message": "Forbidden", "status_code": 403}}', {})
+
+    def _handler(self, method: str, key: Callable[[web.Request], Any], build: Callable[[web.Request], Dict[str, Any]]):
+        async def handle(request: web.Request) -> web.Response:
+            self.requests += 1
+            delay = self.latency + (self._rng.random() * self.jitter if self.jitter else 0.0)
+            if delay:
+                await asyncio.sleep(delay)
+
+            token = request.headers.get("X-Riot-Token")
+            if not token:
+                return self._respond(401, b'{"status": {"message": "Unauthorized", "status_code": 401}}', {})
+
+            headers: Dict[str, str] = {}
+            limited = None
+            if self.app_limits:
+                windows = self._app_windows.get(token)
+                if windows is None:
+                    windows = self._app_windows[token] = _Windows(parse_limits(self.app_limits))
+                retry_after = windows.hit()
+                if retry_after is not None:
+                    limited = ("application", retry_after)
+                headers["X-App-Rate-Limit"] = self.app_limits
+                headers["X-App-Rate-Limit-Count"] = windows.header()
+            if self.method_limits:
+                windows = self._method_windows.get((token, method))
+                if windows is None:
+                    windows = self._method_windows[(token, method)] = _Windows(parse_limits(self.method_limits))
+                retry_after = windows.hit() if limited is None else None
+                if retry_after is not None:
+                    limited = ("method", retry_after)
+                headers["X-Method-Rate-Limit"] = self.method_limits
+                headers["X-Method-Rate-Limit-Count"] = windows.header()
+            if limited is not None:
+                headers["X-Rate-Limit-Type"] = limited[0]
+                headers["Retry-After"] = str(max(1, round(limited[1] + 0.5)))
+                return self._respond(429, b'{"status": {"message": "Rate limit exceeded", "status_code": 429}}', headers)
+
+            if self.error_rate and self._rng.random() < self.error_rate:
+                return self._respond(self.error_status, json.dumps({"status": {"message": "Injected error", "status_code": self.error_status}}).encode(), headers)
+            return self._respond(200, self._body(key(request), lambda: build(request)), headers)
+        return handle
+
+    async def start(self) -> "MockRiotServer":
+        """Start listening, setting ``port`` if it was 0."""
+        self._runner = web.AppRunner(self.app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        """Stop the server."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> "MockRiotServer":
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.stop()
+
+### Main ###
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds every response is delayed by")
+    parser.add_argument("--jitter", type=float, default=0.0, help="maximum extra random delay in seconds")
+    parser.add_argument("--app-limits", help='application rate limits, e.g. "20:1,100:120"')
+    parser.add_argument("--method-limits", help='method rate limits, e.g. "250:10"')
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with --error-status")
+    parser.add_argument("--error-status", type=int, default=503)
+    args = parser.parse_args()
+
+    server = MockRiotServer(args.host, args.port, args.latency, args.jitter, args.app_limits, args.method_limits, args.error_rate, args.error_status)
+    web.run_app(server.app(), host=args.host, port=args.port, access_log=None)
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,46 @@
 from .client import Client, Exceptions
+from .retry import RetryPolicy
+from .connection import ConnectionConfig
+from .keys import KeyPool
+from .breaker import CircuitBreakerPolicy
+from .hedging import HedgePolicy, LatencyHistogram
+from .metrics import Metrics, RequestEvent
+from .cassette import Cassette
+from .cache import CacheBackend, MemoryCache
+from .store import MatchStore
+from .leaderboard import LeaderboardSnapshot, LeaderboardDiff
+from .watcher import RecentMatchesWatcher
+from .crawler import Crawler, BloomFilter
+from .content import ContentIndex, ContentManager
+from .analytics import MatchEvents, PlayerStats
+from .export import MatchExporter
 from . import objects
 
 __all__ = [
     "Client",
     "Exceptions",
+    "RetryPolicy",
+    "ConnectionConfig",
+    "KeyPool",
+    "CircuitBreakerPolicy",
+    "HedgePolicy",
+    "LatencyHistogram",
+    "Metrics",
+    "RequestEvent",
+    "Cassette",
+    "CacheBackend",
+    "MemoryCache",
+    "MatchStore",
+    "LeaderboardSnapshot",
+    "LeaderboardDiff",
+    "RecentMatchesWatcher",
+    "Crawler",
+    "BloomFilter",
+    "ContentIndex",
+    "ContentManager",
+    "MatchEvents",
+    "PlayerStats",
+    "MatchExporter",
     "objects",
     ]
 __author__ = "Jet612"
\ No newline at end of file
@@ -0,0 +1,370 @@
+### Imports ###
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from .objects import MatchDto
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+### Constants ###
+TRADE_WINDOW_MILLIS = 5000
+"""How soon after a death the killer must die for the death to count as traded in KAST."""
+COLUMNS = (
+    "matches", "roundsPlayed", "score", "kills", "deaths", "assists", "damage", "headshots", "bodyshots", "legshots",
+    "kastRounds", "firstKills", "firstDeaths", "twoKills", "threeKills", "fourKills", "fiveKills", "spent", "loadoutValue"
+)
+"""The integer totals kept for every player row of PlayerStats."""
+
+Match = Union[MatchDto, Dict[str, Any]]
+
+### Helper Functions ###
+def _require_numpy():
+    if np is None:
+        raise ImportError("numpy is required for match analytics, install it with: pip install valaw[numpy]")
+
+def _ratio(numerator: "np.ndarray", denominator: "np.ndarray", scale: float = 1.0) -> "np.ndarray":
+    out = np.zeros(len(numerator), dtype=np.float64)
+    np.divide(numerator * scale, denominator, out=out, where=denominator != 0)
+    return out
+
+### Match Events ###
+@dataclass
+class MatchEvents:
+    """The players, rounds, kills, damage and economy of one or more matches, flattened into numpy arrays.
+
+    Every match is read once, in a single Python pass, into parallel arrays that PlayerStats
+    aggregates with vectorized operations. Players and rounds are numbered across the
+    whole batch, and events refer to them by those numbers. Observers are left out, and
+    killers or receivers that are not players of the match are -1.
+
+    :param matchIds: The matchId of every match.
+    :param slots: The largest number of players in a match of the batch.
+    :param puuids: The puuid of every player row as a bytes array. A puuid playing several matches has a row in each.
+    :param playerMatch: The match of every player row.
+    :param playerTeam: The team of every player row, numbered within its match.
+    :param playerSlot: The position of every player row within its match.
+    :param roundMatch: The match of every round.
+    :param statRound: The round of every PlayerRoundStatsDto.
+    :param statPlayer: The player row of every PlayerRoundStatsDto.
+    :param score: The score of every PlayerRoundStatsDto.
+    :param spent: The credits spent in every PlayerRoundStatsDto.
+    :param loadoutValue: The loadout value of every PlayerRoundStatsDto.
+    :param killRound: The round of every kill.
+    :param killTime: The time since round start of every kill in milliseconds.
+    :param killer: The killer row of every kill.
+    :param victim: The victim row of every kill.
+    :param assistKill: The kill of every assist.
+    :param assistPlayer: The player row of every assist.
+    :param damageRound: The round of every DamageDto.
+    :param attacker: The player row dealing every DamageDto.
+    :param receiver: The player row receiving every DamageDto.
+    :param damage: The damage of every DamageDto.
+    :param headshots: The headshots of every DamageDto.
+    :param bodyshots: The bodyshots of every DamageDto.
+    :param legshots: The legshots of every DamageDto.
+    """
+    matchIds: List[str]
+    slots: int
+    puuids: "np.ndarray"
+    playerMatch: "np.ndarray"
+    playerTeam: "np.ndarray"
+    playerSlot: "np.ndarray"
+    roundMatch: "np.ndarray"
+    statRound: "np.ndarray"
+    statPlayer: "np.ndarray"
+    score: "np.ndarray"
+    spent: "np.ndarray"
+    loadoutValue: "np.ndarray"
+    killRound: "np.ndarray"
+    killTime: "np.ndarray"
+    killer: "np.ndarray"
+    victim: "np.ndarray"
+    assistKill: "np.ndarray"
+    assistPlayer: "np.ndarray"
+    damageRound: "np.ndarray"
+    attacker: "np.ndarray"
+    receiver: "np.ndarray"
+    damage: "np.ndarray"
+    headshots: "np.ndarray"
+    bodyshots: "np.ndarray"
+    legshots: "np.ndarray"
+
+    def __len__(self) -> int:
+        return len(self.matchIds)
+
+    @classmethod
+    def from_matches(cls, matches: Iterable[Match]) -> "MatchEvents":
+        """Flatten MatchDto objects or raw match dicts.
+
+        Requires numpy. Raw match dicts, as returned with ``raw_data=True``, are read without
+        building any objects, which is much faster than decoding MatchDto first.
+
+        :param matches: The matches, a single match is also accepted.
+        :type matches: Iterable[Union[MatchDto, Dict]]
+        :rtype: MatchEvents
+        """
+        _require_numpy()
+        if isinstance(matches, (MatchDto, dict)):
+            matches = [matches]
+        matchIds, puuids, playerMatch, playerTeam, playerSlot, roundMatch = [], [], [], [], [], []
+        statRound, statPlayer, score, spent, loadoutValue = [], [], [], [], []
+        killRound, killTime, killer, victim, assistKill, assistPlayer = [], [], [], [], [], []
+        damageRound, attacker, receiver, damage, headshots, bodyshots, legshots = [], [], [], [], [], [], []
+        slots = 0
+
+        for index, match in enumerate(matches):
+            # dict.get and getattr take the same arguments, so one loop reads both raw dicts and objects.
+            get = dict.get if isinstance(match, dict) else getattr
+            matchIds.append(get(get(match, "matchInfo"), "matchId"))
+            rows, teams = {}, {}
+            for player in get(match, "players") or ():
+                if get(player, "isObserver"):
+                    continue
+                rows[get(player, "puuid")] = len(puuids)
+                playerSlot.append(len(rows) - 1)
+                puuids.append(get(player, "puuid").encode())
+                playerMatch.append(index)
+                playerTeam.append(teams.setdefault(get(player, "teamId"), len(teams)))
+            slots = max(slots, len(rows))
+            row_of = rows.get
+
+            for roundResult in get(match, "roundResults") or ():
+                roundIndex = len(roundMatch)
+                roundMatch.append(index)
+                for stats in get(roundResult, "playerStats") or ():
+                    row = row_of(get(stats, "puuid"))
+                    if row is None:
+                        continue
+                    economy = get(stats, "economy")
+                    statRound.append(roundIndex)
+                    statPlayer.append(row)
+                    score.append(get(stats, "score") or 0)
+                    spent.append((get(economy, "spent") or 0) if economy is not None else 0)
+                    loadoutValue.append((get(economy, "loadoutValue") or 0) if economy is not None else 0)
+                    for kill in get(stats, "kills") or ():
+                        assistants = get(kill, "assistants")
+                        if assistants:
+                            for assistant in assistants:
+                                assistKill.append(len(killRound))
+                                assistPlayer.append(row_of(assistant, -1))
+                        killRound.append(roundIndex)
+                        killTime.append(get(kill, "timeSinceRoundStartMillis") or 0)
+                        killer.append(row_of(get(kill, "killer"), -1))
+                        victim.append(row_of(get(kill, "victim"), -1))
+                    for hit in get(stats, "damage") or ():
+                        damageRound.append(roundIndex)
+                        attacker.append(row)
+                        receiver.append(row_of(get(hit, "receiver"), -1))
+                        damage.append(get(hit, "damage") or 0)
+                        headshots.append(get(hit, "headshots") or 0)
+                        bodyshots.append(get(hit, "bodyshots") or 0)
+                        legshots.append(get(hit, "legshots") or 0)
+
+        def ints(values: List[int]) -> "np.ndarray":
+            return np.array(values, dtype=np.int64)
+
+        return cls(
+            matchIds, slots,
+            puuids=np.array(puuids, dtype=bytes) if puuids else np.array([], dtype="S1"),
+            playerMatch=ints(playerMatch), playerTeam=ints(playerTeam), playerSlot=ints(playerSlot), roundMatch=ints(roundMatch),
+            statRound=ints(statRound), statPlayer=ints(statPlayer), score=ints(score), spent=ints(spent), loadoutValue=ints(loadoutValue),
+            killRound=ints(killRound), killTime=ints(killTime), killer=ints(killer), victim=ints(victim),
+            assistKill=ints(assistKill), assistPlayer=ints(assistPlayer),
+            damageRound=ints(damageRound), attacker=ints(attacker), receiver=ints(receiver), damage=ints(damage),
+            headshots=ints(headshots), bodyshots=ints(bodyshots), legshots=ints(legshots),
+        )
+
+### Player Stats ###
+class PlayerStats:
+    """Per-player totals computed from MatchEvents, stored as one integer array per name in COLUMNS.
+
+    Requires numpy. Rates such as ADR and headshot percentage are properties computed from
+    the totals, so rows can be summed, for example across matches with :meth:`by_puuid`,
+    and the rates stay correct.
+
+    Kills and damage only count against the other team. Deaths count every death. A
+    round counts towards KAST if the player got a kill or an assist, survived, or was
+    killed by a player who died within ``trade_window`` milliseconds. The first kill
+    of a round is credited to its killer and victim even if it was not against an enemy.
+    When a player dies more than once a round, as in deathmatch, a trade counts from the
+    killer's first death, and multi-kills count every kill of the round.
+
+    :param puuids: The puuid of every row as a bytes array.
+    :type puuids: numpy.ndarray
+    :param columns: An integer array for every name in COLUMNS.
+    :type columns: Dict[str, numpy.ndarray]
+    :param matchIds: The matchId of every row, defaults to None (rows span several matches).
+    :type matchIds: List[str], optional
+    """
+
+    def __init__(self, puuids: "np.ndarray", columns: Dict[str, "np.ndarray"], matchIds: Optional[List[str]] = None):
+        _require_numpy()
+        missing = [name for name in COLUMNS if name not in columns]
+        if missing:
+            raise ValueError(f"Missing stat columns: {missing}.")
+        if any(len(columns[name]) != len(puuids) for name in COLUMNS):
+            raise ValueError("Every stat column must have one value per puuid.")
+        self.puuids = puuids
+        self.columns = {name: columns[name] for name in COLUMNS}
+        self.matchIds = matchIds
+
+    def __len__(self) -> int:
+        return len(self.puuids)
+
+    def __getattr__(self, name: str) -> "np.ndarray":
+        columns = self.__dict__.get("columns")
+        if columns is not None and name in columns:
+            return columns[name]
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+    @classmethod
+    def from_matches(cls, matches: Iterable[Match], trade_window: int = TRADE_WINDOW_MILLIS) -> "PlayerStats":
+        """Compute the stats of every player of every match, one row per player and match.
+
+        :param matches: MatchDto objects or raw match dicts, a single match is also accepted.
+        :type matches: Iterable[Union[MatchDto, Dict]]
+        :param trade_window: How soon after a death in milliseconds the killer must die for a KAST trade, defaults to 5000.
+        :type trade_window: int
+        :rtype: PlayerStats
+        """
+        return cls.from_events(MatchEvents.from_matches(matches), trade_window)
+
+    @classmethod
+    def from_events(cls, events: MatchEvents, trade_window: int = TRADE_WINDOW_MILLIS) -> "PlayerStats":
+        """Compute the stats of every player row of flattened matches.
+
+        :param events: The flattened matches.
+        :type events: MatchEvents
+        :param trade_window: How soon after a death in milliseconds the killer must die for a KAST trade, defaults to 5000.
+        :type trade_window: int
+        :rtype: PlayerStats
+        """
+        players, slots = len(events.puuids), max(events.slots, 1)
+        cells = len(events.roundMatch) * slots
+        team, slot = events.playerTeam, events.playerSlot
+
+        def count(rows: "np.ndarray", weights: Optional["np.ndarray"] = None) -> "np.ndarray":
+            return np.bincount(rows, weights, minlength=players).astype(np.int64)
+
+        def cell(rounds: "np.ndarray", rows: "np.ndarray") -> "np.ndarray":
+            # Every (round, player) pair has its own cell in a rounds x slots grid.
+            return rounds * slots + slot[rows]
+
+        killer, victim, killRound = events.killer, events.victim, events.killRound
+        died = victim >= 0
+        enemyKill = (killer >= 0) & died
+        enemyKill[enemyKill] = team[killer[enemyKill]] != team[victim[enemyKill]]
+        hit = events.receiver >= 0
+        hit[hit] = team[events.attacker[hit]] != team[events.receiver[hit]]
+        assisted = events.assistPlayer >= 0
+
+        columns = {
+            "matches": np.ones(players, dtype=np.int64),
+            "roundsPlayed": count(events.statPlayer),
+            "score": count(events.statPlayer, events.score),
+            "kills": count(killer[enemyKill]),
+            "deaths": count(victim[died]),
+            "assists": count(events.assistPlayer[assisted]),
+            "damage": count(events.attacker[hit], events.damage[hit]),
+            "headshots": count(events.attacker[hit], events.headshots[hit]),
+            "bodyshots": count(events.attacker[hit], events.bodyshots[hit]),
+            "legshots": count(events.attacker[hit], events.legshots[hit]),
+            "spent": count(events.statPlayer, events.spent),
+            "loadoutValue": count(events.statPlayer, events.loadoutValue),
+        }
+
+        # The first kill of every round: sort by round then time and keep the first kill of each round.
+        order = np.lexsort((events.killTime, killRound))
+        _, starts = np.unique(killRound[order], return_index=True)
+        first = order[starts]
+        columns["firstKills"] = count(killer[first][killer[first] >= 0])
+        columns["firstDeaths"] = count(victim[first][died[first]])
+
+        # Multi-kills: enemy kills per (round, player) cell.
+        killCells = cell(killRound[enemyKill], killer[enemyKill])
+        perCell = np.bincount(killCells, minlength=cells)
+        cellPlayer = np.full(cells, -1, dtype=np.int64)
+        cellPlayer[cell(events.statRound, events.statPlayer)] = events.statPlayer
+        cellPlayer[killCells] = killer[enemyKill]
+        multi = np.flatnonzero(perCell >= 2)
+        multiKills = np.minimum(perCell[multi], 5)
+        for kills, name in ((2, "twoKills"), (3, "threeKills"), (4, "fourKills"), (5, "fiveKills")):
+            columns[name] = count(cellPlayer[multi[multiKills == kills]])
+
+        # KAST: mark the cells with a kill, an assist, a survival or a traded death.
+        # Kills are listed by killer, not by time, so keep the earliest death of every cell.
+        alive = np.iinfo(np.int64).max
+        deathTime = np.full(cells, alive, dtype=np.int64)
+        np.minimum.at(deathTime, cell(killRound[died], victim[died]), events.killTime[died])
+        kast = deathTime == alive
+        kast[killCells] = True
+        kast[cell(killRound[events.assistKill[assisted]], events.assistPlayer[assisted])] = True
+        traded = died & (killer >= 0)
+        killerDeath = deathTime[cell(killRound[traded], killer[traded])]
+        delay = killerDeath - events.killTime[traded]
+        tradedCells = cell(killRound[traded], victim[traded])
+        kast[tradedCells[(killerDeath != alive) & (delay >= 0) & (delay <= trade_window)]] = True
+        columns["kastRounds"] = count(events.statPlayer, kast[cell(events.statRound, events.statPlayer)])
+
+        return cls(events.puuids, columns, [events.matchIds[match] for match in events.playerMatch])
+
+    def by_puuid(self) -> "PlayerStats":
+        """Return the totals of every puuid across all of its rows, ordered by puuid.
+
+        :rtype: PlayerStats
+        """
+        puuids, inverse = np.unique(self.puuids, return_inverse=True)
+        return PlayerStats(puuids, {
+            name: np.bincount(inverse, column, minlength=len(puuids)).astype(np.int64)
+            for name, column in self.columns.items()
+        })
+
+    @property
+    def acs(self) -> "np.ndarray":
+        """Average combat score, score per round."""
+        return _ratio(self.score, self.roundsPlayed)
+
+    @property
+    def adr(self) -> "np.ndarray":
+        """Average damage per round dealt to the other team."""
+        return _ratio(self.damage, self.roundsPlayed)
+
+    @property
+    def kd(self) -> "np.ndarray":
+        """Kills per death, 0 without deaths."""
+        return _ratio(self.kills, self.deaths)
+
+    @property
+    def headshot_percent(self) -> "np.ndarray":
+        """The percentage of shots that hit the other team that were headshots."""
+        return _ratio(self.headshots, self.headshots + self.bodyshots + self.legshots, 100.0)
+
+    @property
+    def kast_percent(self) -> "np.ndarray":
+        """The percentage of rounds with a kill, assist, survival or traded death."""
+        return _ratio(self.kastRounds, self.roundsPlayed, 100.0)
+
+    @property
+    def econ_rating(self) -> "np.ndarray":
+        """Damage dealt per 1000 credits spent."""
+        return _ratio(self.damage, self.spent, 1000.0)
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Return every row as a dict of its puuid, matchId, totals and rates.
+
+        :rtype: List[Dict[str, Any]]
+        """
+        rates = {name: getattr(self, name).tolist() for name in ("acs", "adr", "kd", "headshot_percent", "kast_percent", "econ_rating")}
+        columns = {name: column.tolist() for name, column in self.columns.items()}
+        rows = []
+        for index, puuid in enumerate(self.puuids.tolist()):
+            row = {"puuid": puuid.decode()}
+            if self.matchIds is not None:
+                row["matchId"] = self.matchIds[index]
+            row.update((name, column[index]) for name, column in columns.items())
+            row.update((name, rate[index]) for name, rate in rates.items())
+            rows.append(row)
+        return rows
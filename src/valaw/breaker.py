@@ -0,0 +1,156 @@
+### Imports ###
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+### Constants ###
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+### Circuit Breaker Policy ###
+@dataclass(frozen=True)
+class CircuitBreakerPolicy:
+    """Controls when the client stops sending requests to an unhealthy region or cluster.
+
+    Each routing value has its own circuit. It opens after ``failure_threshold`` failures
+    in a row, where a failure is a connection error, a timeout, a 5xx response or, if
+    ``slow_call_seconds`` is set, a response slower than that. While open, requests fail
+    immediately with CircuitOpen. After ``reset_timeout`` seconds, up to
+    ``half_open_requests`` requests are let through: if they succeed the circuit closes,
+    otherwise it opens again.
+
+    :param failure_threshold: The number of consecutive failures that opens a circuit, defaults to 5.
+    :type failure_threshold: int
+    :param reset_timeout: How long a circuit stays open before it is probed in seconds, defaults to 30.
+    :type reset_timeout: float
+    :param half_open_requests: The number of probe requests let through at once while half open, defaults to 1.
+    :type half_open_requests: int
+    :param slow_call_seconds: Responses slower than this count as failures, defaults to None (latency is ignored).
+    :type slow_call_seconds: float, optional
+    :param platform_hints: Whether or not GET_getPlatformData results are used as a hint, a route with an ongoing maintenance or critical incident opens after a single failure. Defaults to True.
+    :type platform_hints: bool
+    :param hint_ttl: How long a platform data hint lasts in seconds, unless renewed by another GET_getPlatformData call, defaults to 600.
+    :type hint_ttl: float
+    """
+    failure_threshold: int = 5
+    reset_timeout: float = 30.0
+    half_open_requests: int = 1
+    slow_call_seconds: Optional[float] = None
+    platform_hints: bool = True
+    hint_ttl: float = 600.0
+
+### Circuit Breaker ###
+class _Circuit:
+    __slots__ = ("state", "failures", "opened_at", "probes", "suspect_until")
+
+    def __init__(self):
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probes = 0
+        self.suspect_until = 0.0
+
+
+class CircuitBreaker:
+    """Tracks one circuit per routing value (region or cluster).
+
+    :param policy: The thresholds the circuits follow.
+    :type policy: CircuitBreakerPolicy
+    """
+
+    def __init__(self, policy: CircuitBreakerPolicy):
+        self.policy = policy
+        self._circuits: Dict[str, _Circuit] = {}
+
+    def _circuit(self, route: str) -> _Circuit:
+        circuit = self._circuits.get(route)
+        if circuit is None:
+            circuit = self._circuits[route] = _Circuit()
+        return circuit
+
+    def state(self, route: str) -> str:
+        """Return the state of the circuit for ``route``: "closed", "open" or "half_open"."""
+        circuit = self._circuit(route)
+        if circuit.state == OPEN and time.monotonic() - circuit.opened_at >= self.policy.reset_timeout:
+            return HALF_OPEN
+        return circuit.state
+
+    def allow(self, route: str) -> Optional[float]:
+        """Check whether a request to ``route`` may be sent.
+
+        Every allowed request must be followed by a call to :meth:`record` or :meth:`release`.
+
+        :param route: The routing value of the request.
+        :return: None if the request may be sent, otherwise the number of seconds until the circuit is probed again.
+        """
+        circuit = self._circuit(route)
+        if circuit.state == CLOSED:
+            return None
+        now = time.monotonic()
+        if circuit.state == OPEN:
+            remaining = circuit.opened_at + self.policy.reset_timeout - now
+            if remaining > 0:
+                return remaining
+            circuit.state = HALF_OPEN
+        if circuit.probes >= self.policy.half_open_requests:
+            return self.policy.reset_timeout
+        circuit.probes += 1
+        return None
+
+    def _open(self, circuit: _Circuit):
+        circuit.state = OPEN
+        circuit.opened_at = time.monotonic()
+        circuit.probes = 0
+
+    def record(self, route: str, success: bool, latency: Optional[float] = None):
+        """Record the outcome of a request allowed by :meth:`allow`.
+
+        :param route: The routing value of the request.
+        :param success: Whether or not the host answered without a 5xx status.
+        :param latency: How long the request took in seconds.
+        """
+        policy = self.policy
+        circuit = self._circuit(route)
+        slow = policy.slow_call_seconds is not None and latency is not None and latency > policy.slow_call_seconds
+        if circuit.state == HALF_OPEN:
+            circuit.probes = max(circuit.probes - 1, 0)
+        if success and not slow:
+            circuit.failures = 0
+            if circuit.state == HALF_OPEN:
+                circuit.state = CLOSED
+            return
+
+        circuit.failures += 1
+        threshold = 1 if circuit.suspect_until > time.monotonic() else policy.failure_threshold
+        if circuit.state == HALF_OPEN or circuit.failures >= threshold:
+            self._open(circuit)
+
+    def release(self, route: str):
+        """Give back a request allowed by :meth:`allow` without recording an outcome, e.g. when it was cancelled."""
+        circuit = self._circuit(route)
+        if circuit.state == HALF_OPEN:
+            circuit.probes = max(circuit.probes - 1, 0)
+
+    def hint(self, route: str, platform_data: Any):
+        """Use a GET_getPlatformData result as a hint about the health of ``route``.
+
+        :param route: The region the platform data was requested for.
+        :param platform_data: A PlatformDataDto or raw platform data dict.
+        """
+        if not self.policy.platform_hints:
+            return
+
+        def entries(name: str):
+            value = platform_data.get(name) if isinstance(platform_data, dict) else getattr(platform_data, name, None)
+            return value or []
+
+        def field(entry: Any, name: str) -> Optional[str]:
+            return entry.get(name) if isinstance(entry, dict) else getattr(entry, name, None)
+
+        degraded = (
+            any(field(entry, "maintenance_status") == "in_progress" for entry in entries("maintenances"))
+            or any(field(entry, "incident_severity") == "critical" and not field(entry, "archived_at") for entry in entries("incidents"))
+        )
+        circuit = self._circuit(route)
+        circuit.suspect_until = time.monotonic() + self.policy.hint_ttl if degraded else 0.0
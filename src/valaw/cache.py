@@ -0,0 +1,92 @@
+### Imports ###
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+### Constants ###
+FOREVER = None
+"""TTL value for entries that never expire."""
+
+DEFAULT_TTLS: Dict[str, Optional[float]] = {
+    "GET_getByPuuid": 3600,
+    "GET_getByRiotId": 3600,
+    "GET_getByAccessToken": 0,
+    "GET_getActiveShard": 600,
+    "GET_getContent": 3600,
+    "GET_getMatch": FOREVER,
+    "GET_getMatchlist": 60,
+    "GET_getRecent": 10,
+    "GET_getLeaderboard": 300,
+    "GET_getConsoleMatch": FOREVER,
+    "GET_getConsoleMatchlist": 60,
+    "GET_getConsoleRecent": 10,
+    "GET_getConsoleLeaderboard": 300,
+    "GET_getPlatformData": 5,
+}
+"""Default cache TTL in seconds for each client method. 0 disables caching, None never expires."""
+
+### Cache Backends ###
+class CacheBackend(ABC):
+    """Interface for response caches used by :class:`valaw.Client`.
+
+    Keys are request URLs and values are the parsed JSON responses, or the response bodies when the client uses ``raw_bytes``.
+    Values are returned as stored, not copied.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for ``key``, or None if it is missing or expired."""
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: Optional[float] = FOREVER):
+        """Store ``value`` under ``key`` for ``ttl`` seconds, or forever if ``ttl`` is None."""
+
+    @abstractmethod
+    async def delete(self, key: str):
+        """Remove ``key`` from the cache if present."""
+
+    @abstractmethod
+    async def clear(self):
+        """Remove every entry from the cache."""
+
+
+class MemoryCache(CacheBackend):
+    """In-memory LRU cache.
+
+    :param maxsize: The maximum number of entries kept, the least recently used entry is evicted first. Defaults to 1024.
+    :type maxsize: int
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        if maxsize < 1:
+            raise ValueError("Invalid maxsize, must be at least 1.")
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, Tuple[Optional[float], Any]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if expires is not None and expires <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = FOREVER):
+        expires = time.monotonic() + ttl if ttl is not None else None
+        self._entries[key] = (expires, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    async def delete(self, key: str):
+        self._entries.pop(key, None)
+
+    async def clear(self):
+        self._entries.clear()
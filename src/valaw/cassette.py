@@ -0,0 +1,239 @@
+### Imports ###
+import asyncio
+import json
+import os
+import time
+import zlib
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Deque, Dict, Iterator, List, Optional, Tuple
+
+import aiohttp
+from multidict import CIMultiDict, CIMultiDictProxy
+
+### Constants ###
+MAGIC = b"VALAW-CASSETTE 1\n"
+"""The first line of every cassette file."""
+RECORD = "record"
+REPLAY = "replay"
+AUTO = "auto"
+
+### Helper Functions ###
+def _repeatable(record: "CassetteRecord") -> bool:
+    """Whether or not a record may be replayed again once the responses of its URL run out."""
+    return record.status != 429 and record.status < 500
+
+### Records ###
+@dataclass
+class CassetteRecord:
+    """A recorded response, without its body.
+
+    :param url: The requested URL.
+    :param route: The region or cluster the request was made against.
+    :param endpoint: The client method that made the request.
+    :param status: The HTTP status code of the response.
+    :param headers: The response headers, in order.
+    :param time: When the request was sent, as a time.time() value.
+    :param elapsed: How long the response took to arrive in seconds.
+    :param size: The size of the compressed body in the cassette file.
+    :param offset: Where the compressed body starts in the cassette file.
+    """
+    url: str
+    route: str
+    endpoint: str
+    status: int
+    headers: List[Tuple[str, str]]
+    time: float
+    elapsed: float
+    size: int = 0
+    offset: int = 0
+
+
+class CassetteResponse:
+    """A replayed response, with the parts of aiohttp.ClientResponse the client uses."""
+
+    def __init__(self, record: CassetteRecord, body: bytes):
+        self.url = record.url
+        self.status = record.status
+        self.headers = CIMultiDictProxy(CIMultiDict(record.headers))
+        self._body = body
+
+    async def read(self) -> bytes:
+        return self._body
+
+    async def text(self, encoding: str = "utf-8") -> str:
+        return self._body.decode(encoding, errors="replace")
+
+    async def json(self, loads=json.loads, **kwargs) -> Any:
+        return loads(self._body)
+
+    def release(self):
+        pass
+
+### Cassette ###
+class Cassette:
+    """Records the responses a client receives to a file and replays them without a network.
+
+    Each response is stored with its status, headers, timing and zlib-compressed body.
+    API keys and other request headers are never written. When replaying, requests are
+    matched by URL: repeated requests for a URL get its recorded responses in order.
+    Once they run out, "replay" mode serves the last one that was not a 429 or 5xx
+    again, while "auto" mode sends the request and records the response. Responses
+    recorded during this session are never replayed, so retries and polling reach
+    the network.
+
+    Replays run at full speed by default. Set ``speed`` to delay each response by its
+    recorded latency divided by ``speed``, so 1.0 reproduces the original timing.
+
+    :param path: The cassette file.
+    :type path: str
+    :param mode: "record" to start a new file, "replay" to only serve recorded responses, or "auto" to replay recorded responses and record new ones, appending them to the file. Defaults to "auto".
+    :type mode: str
+    :param speed: How much faster than recorded responses are replayed, defaults to None (no delay).
+    :type speed: float, optional
+    :param compression: The zlib level bodies are compressed with, defaults to 6.
+    :type compression: int
+    :raises ValueError: If the mode is invalid, or the file is not a cassette.
+    :raises FileNotFoundError: If the mode is "replay" and the file does not exist.
+    """
+
+    def __init__(self, path: str, mode: str = AUTO, speed: Optional[float] = None, compression: int = 6):
+        if mode not in (RECORD, REPLAY, AUTO):
+            raise ValueError(f"Invalid mode, valid modes are: {RECORD}, {REPLAY}, {AUTO}.")
+        if speed is not None and speed <= 0:
+            raise ValueError("Invalid speed, must be positive.")
+        self.path = path
+        self.mode = mode
+        self.speed = speed
+        self.compression = compression
+        self.records: List[CassetteRecord] = []
+        """Every record in the file, in the order they were recorded."""
+        self.hits = 0
+        """The number of requests served from the cassette."""
+        self._index: Dict[str, Deque[CassetteRecord]] = {}
+        self._last: Dict[str, CassetteRecord] = {}
+        self._reader = None
+        self._writer = None
+
+        if mode == RECORD:
+            with open(path, "wb") as f:
+                f.write(MAGIC)
+        elif mode == REPLAY or os.path.exists(path):
+            self._load()
+
+    @property
+    def recording(self) -> bool:
+        """Whether or not requests missing from the cassette are sent and recorded."""
+        return self.mode != REPLAY
+
+    def _load(self):
+        with open(self.path, "rb") as f:
+            if f.readline() != MAGIC:
+                raise ValueError(f"{self.path} is not a cassette file.")
+            while True:
+                line = f.readline()
+                if not line:
+                    break
+                record = CassetteRecord(**json.loads(line))
+                record.headers = [tuple(header) for header in record.headers]
+                record.offset = f.tell()
+                f.seek(record.size, os.SEEK_CUR)
+                self._add(record)
+
+    def _add(self, record: CassetteRecord):
+        self.records.append(record)
+        self._index.setdefault(record.url, deque()).append(record)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __iter__(self) -> Iterator[CassetteRecord]:
+        return iter(self.records)
+
+    def body(self, record: CassetteRecord) -> bytes:
+        """Return the body of a record, read from the cassette file."""
+        if self._reader is None:
+            self._reader = open(self.path, "rb")
+        self._reader.seek(record.offset)
+        return zlib.decompress(self._reader.read(record.size))
+
+    def find(self, url: str) -> Optional[CassetteRecord]:
+        """Return the next recorded response for ``url``.
+
+        :return: The record, or None if there is none left to replay and the request should be sent.
+        """
+        queue = self._index.get(url)
+        if queue:
+            record = queue.popleft()
+            if _repeatable(record):
+                self._last[url] = record
+            return record
+        if self.recording:
+            return None
+        return self._last.get(url)
+
+    def rewind(self):
+        """Start replaying every URL from its first recorded response again."""
+        self._index = {}
+        self._last = {}
+        for record in self.records:
+            self._index.setdefault(record.url, deque()).append(record)
+
+    def get(self, session: aiohttp.ClientSession, url: str, headers: Dict[str, str], timeout: aiohttp.ClientTimeout, route: str, endpoint: str):
+        """Return an async context manager yielding the response to a GET request.
+
+        :param session: The session used when the request is not in the cassette.
+        :param url: The URL to request.
+        :param headers: The request headers, not recorded.
+        :param timeout: The request timeout.
+        :param route: The region or cluster of the request.
+        :param endpoint: The client method making the request.
+        :return: The context manager, or None if the request is not in the cassette and the mode is "replay".
+        """
+        record = self.find(url)
+        if record is not None:
+            return self._replay(record)
+        if not self.recording:
+            return None
+        return self._record(session, url, headers, timeout, route, endpoint)
+
+    @asynccontextmanager
+    async def _replay(self, record: CassetteRecord) -> AsyncIterator[CassetteResponse]:
+        if self.speed is not None:
+            await asyncio.sleep(record.elapsed / self.speed)
+        self.hits += 1
+        yield CassetteResponse(record, self.body(record))
+
+    @asynccontextmanager
+    async def _record(self, session: aiohttp.ClientSession, url: str, headers: Dict[str, str], timeout: aiohttp.ClientTimeout, route: str, endpoint: str) -> AsyncIterator[aiohttp.ClientResponse]:
+        sent, started = time.time(), time.monotonic()
+        async with session.get(url, headers=headers, timeout=timeout) as resp:
+            body = await resp.read()
+            record = CassetteRecord(url, route, endpoint, resp.status, list(resp.headers.items()), sent, time.monotonic() - started)
+            self._write(record, body)
+            yield resp
+
+    def _write(self, record: CassetteRecord, body: bytes):
+        compressed = zlib.compress(body, self.compression)
+        record.size = len(compressed)
+        if self._writer is None:
+            self._writer = open(self.path, "ab")
+            if self._writer.tell() == 0:
+                self._writer.write(MAGIC)
+        line = json.dumps({
+            "url": record.url, "route": record.route, "endpoint": record.endpoint, "status": record.status,
+            "headers": record.headers, "time": record.time, "elapsed": record.elapsed, "size": record.size
+        }).encode()
+        self._writer.write(line + b"\n")
+        record.offset = self._writer.tell()
+        self._writer.write(compressed)
+        self._writer.flush()
+        self.records.append(record)
+
+    def close(self):
+        """Close the cassette file."""
+        for f in (self._reader, self._writer):
+            if f is not None:
+                f.close()
+        self._reader = self._writer = None
@@ -1,8 +1,12 @@
 ### Imports ###
 import aiohttp
+import asyncio
+import functools
 import json
+import time
 from dataclass_wizard import fromdict
-from typing import Union, Dict, List, Optional
+from collections import deque
+from typing import Any, AsyncIterator, Callable, Iterable, Tuple, Union, Dict, List, Optional
 from urllib.parse import quote
 
 from .objects import (
@@ -10,11 +14,30 @@ from .objects import (
     ActiveShardDto,
     ContentDto,
     MatchDto,
+    LazyMatchDto,
+    RoundResultDto,
     MatchlistDto,
     RecentMatchesDto,
     LeaderboardDto,
+    PlayerDto,
     PlatformDataDto
 )
+from .ratelimit import retry_after_seconds
+from .keys import KeyPool
+from .retry import RetryPolicy
+from .cache import CacheBackend, DEFAULT_TTLS
+from .store import MatchStore
+from .decoder import decode
+from .connection import ConnectionConfig
+from .breaker import CircuitBreaker, CircuitBreakerPolicy
+from .hedging import HedgePolicy, LatencyHistogram
+from .metrics import Metrics, RequestEvent
+from .cassette import Cassette
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 ### Constants ###
 REGIONS = {"ap", "br", "esports", "eu", "kr", "latam", "na"}
@@ -44,6 +67,12 @@ CONSOLE_QUEUES = {
 PLATFORM_TYPES = {"playstation", "xbox"}
 """Set of valid platform types."""
 
+DEFAULT_BASE_URL = "https://{route}.api.riotgames.com"
+"""API host template, {route} is replaced with the region or cluster."""
+
+DEFAULT_JSON_LOADS: Callable[[bytes], Any] = orjson.loads if orjson is not None else json.loads
+"""Function used to parse response bodies when the client is not given one, orjson.loads if orjson is installed."""
+
 ### Custom Exceptions ###
 class Exceptions:
     class InvalidCluster(ValueError):
@@ -58,9 +87,10 @@ class Exceptions:
         More information about response errors can be found at:
         https://developer.riotgames.com/docs/portal#web-apis_response-codes
         """
-        def __init__(self, status_code: int, status_message: str):
+        def __init__(self, status_code: int, status_message: str, retry_after: Optional[float] = None):
             self.status_code = status_code
             self.status_message = status_message
+            self.retry_after = retry_after
             self.message = f"{status_code} - {status_message}"
             super().__init__(self.message)
 
@@ -79,6 +109,22 @@ class Exceptions:
     class InvalidRiotAPIKey(ValueError):
         """Invalid Riot API Key. A Riot API key is required."""
 
+    class DeadlineExceeded(TimeoutError):
+        """The deadline for the request was exceeded before a response was received."""
+
+    class CircuitOpen(Exception):
+        """The circuit breaker for the routing value is open, the request was not sent."""
+        def __init__(self, route: str, retry_in: float):
+            self.route = route
+            self.retry_in = retry_in
+            super().__init__(f"Circuit open for {route}, retry in {retry_in:.1f}s.")
+
+    class CassetteMiss(LookupError):
+        """The request is not in the cassette being replayed, the request was not sent."""
+        def __init__(self, url: str):
+            self.url = url
+            super().__init__(f"No recorded response for {url}.")
+
 ### Helper Functions ###
 def validate_region(region: str):
     """Validate the provided region.
@@ -116,120 +162,521 @@ def validate_key(key: str):
     if key is None or key == "":
         raise Exceptions.InvalidRiotAPIKey("A Riot API key is required.")
 
-async def verify_content(response: aiohttp.ClientResponse):
-    """Helper function to verify response content-type and handle the response appropriately.
+async def verify_content(response: aiohttp.ClientResponse, loads: Optional[Callable[[bytes], Any]] = None):
+    """Helper function to read the response body and parse it as JSON.
+
+    The body is decoded straight from the response bytes, without building an intermediate string.
 
     :param response: The aiohttp response object.
-    :raises FailedToParseJSON: If the content type is not valid.
+    :param loads: The function used to parse the body, defaults to DEFAULT_JSON_LOADS.
+    :raises FailedToParseJSON: If the body is not valid JSON.
     :return: Parsed JSON response.
     """
-    content_type = (response.headers.get("Content-Type") or "").strip().lower()
-    mime_type = content_type.split(";", 1)[0].strip()
-    valid_json_types = {"application/json", "text/json"}
-
-    if mime_type in valid_json_types:
-        try:
-            return await response.json(content_type=None)
-        except json.JSONDecodeError as exc:
-            raise Exceptions.FailedToParseJSON(
-                f"Failed to parse JSON, content-type: {content_type or 'missing'}."
-            ) from exc
-
-    raw_text = await response.text()
+    body = await response.read()
     try:
-        return json.loads(raw_text)
-    except json.JSONDecodeError as exc:
+        return (loads or DEFAULT_JSON_LOADS)(body)
+    except Exception as exc:
+        content_type = (response.headers.get("Content-Type") or "").strip().lower()
         raise Exceptions.FailedToParseJSON(
             f"Failed to parse JSON, content-type: {content_type or 'missing'}."
         ) from exc
 
+def _decode_round_results(fast_decode: bool, metrics: Optional[Metrics], data: List[dict]) -> List[RoundResultDto]:
+    """Convert the raw roundResults of a LazyMatchDto.
+
+    This is a module-level function, so a deferred match does not keep its client alive.
+    """
+    results = []
+    for round_result in data:
+        started = time.perf_counter()
+        results.append(decode(RoundResultDto, round_result) if fast_decode else fromdict(RoundResultDto, round_result))
+        if metrics is not None:
+            metrics.record_fromdict(RoundResultDto, time.perf_counter() - started)
+    return results
+
 
 ### Client ###
 class Client:
     """The client that connects to the Riot Games API.
 
-    :param token: A Riot Games API access token used to authenticate requests.
-    :type token: str
+    :param token: A Riot Games API access token used to authenticate requests. Pass several tokens, or a KeyPool, to spread requests over multiple keys, each with its own rate limits.
+    :type token: Union[str, Iterable[str], KeyPool]
     :param cluster: The default cluster to use in requests. The nearest cluster to the host computer/server should be selected.
     :type cluster: str
-    :param raw_data: Whether or not to send raw JSON data or not. If False, Riot Games API requests will return an object. Defaults to False.
+    :param raw_data: Whether or not to send raw JSON data or not. If False, Riot Games API requests will return an object. Defaults to False. Raw dicts from the cache or a coalesced request are shared with other callers, so they must not be mutated.
     :type raw_data: bool
+    :param rate_limit: Whether or not to hold back requests that would exceed the rate limits reported by the Riot Games API. Defaults to True.
+    :type rate_limit: bool
+    :param retry_policy: How failed requests are retried. Pass None to disable retries. Defaults to RetryPolicy().
+    :type retry_policy: RetryPolicy, optional
+    :param deadline: The default overall time limit in seconds for a call, including retries and rate limit waits. Defaults to None (no limit).
+    :type deadline: float, optional
+    :param coalesce: Whether or not concurrent identical requests share a single network call. Defaults to True.
+    :type coalesce: bool
+    :param cache: The cache to store responses in, e.g. MemoryCache(). Defaults to None (no caching).
+    :type cache: CacheBackend, optional
+    :param cache_ttls: Per-method cache TTLs in seconds, merged over DEFAULT_TTLS. 0 disables caching for a method, None never expires.
+    :type cache_ttls: Dict[str, Optional[float]], optional
+    :param match_store: A MatchStore checked before fetching a match, completed matches are written through to it. Defaults to None.
+    :type match_store: MatchStore, optional
+    :param fast_decode: Whether or not to build objects with decoders compiled for each object type instead of dataclass_wizard.fromdict. The objects are identical but built several times faster. Defaults to False.
+    :type fast_decode: bool
+    :param lazy_rounds: Whether or not matches are returned as LazyMatchDto, which only decodes roundResults when it is first accessed. Defaults to False.
+    :type lazy_rounds: bool
+    :param json_loads: The function used to parse response bodies, called with the raw bytes. Defaults to DEFAULT_JSON_LOADS.
+    :type json_loads: Callable[[bytes], Any], optional
+    :param raw_bytes: Whether or not to return the undecoded response body as bytes, skipping JSON parsing entirely. Takes precedence over raw_data. Defaults to False.
+    :type raw_bytes: bool
+    :param connection: Connection pool, keep-alive, DNS cache and timeout settings. Defaults to ConnectionConfig().
+    :type connection: ConnectionConfig
+    :param prewarm: Whether or not to open a connection to every API host when entering the client as a context manager, see warmup(). Defaults to False.
+    :type prewarm: bool
+    :param circuit_breaker: When to stop sending requests to an unhealthy region or cluster, requests to an open circuit raise CircuitOpen. Defaults to None (no circuit breaker).
+    :type circuit_breaker: CircuitBreakerPolicy, optional
+    :param hedge_policy: When to send a duplicate of a request that is slower than recent requests to the same endpoint. Defaults to None (no hedging).
+    :type hedge_policy: HedgePolicy, optional
+    :param base_url: The API host for a region or cluster, ``{route}`` is replaced with the routing value. Only needed to point the client at a proxy or a mock server. Defaults to "https://{route}.api.riotgames.com".
+    :type base_url: str
+    :param cassette: Records every response to a file, or replays recorded responses instead of sending requests. Defaults to None (requests are sent).
+    :type cassette: Cassette, optional
+    :param metrics: Where request counts, latencies and timings are recorded, and the hooks called around every request. Defaults to None (nothing is recorded).
+    :type metrics: Metrics, optional
     """
     
-    def __init__(self, token: str, cluster: str, raw_data: bool = False):
+    def __init__(self, token: Union[str, Iterable[str], KeyPool], cluster: str, raw_data: bool = False, rate_limit: bool = True, retry_policy: Optional[RetryPolicy] = RetryPolicy(), deadline: Optional[float] = None, coalesce: bool = True, cache: Optional[CacheBackend] = None, cache_ttls: Optional[Dict[str, Optional[float]]] = None, match_store: Optional[MatchStore] = None, fast_decode: bool = False, lazy_rounds: bool = False, json_loads: Optional[Callable[[bytes], Any]] = None, raw_bytes: bool = False, connection: ConnectionConfig = ConnectionConfig(), prewarm: bool = False, circuit_breaker: Optional[CircuitBreakerPolicy] = None, hedge_policy: Optional[HedgePolicy] = None, base_url: str = DEFAULT_BASE_URL, cassette: Optional[Cassette] = None, metrics: Optional[Metrics] = None):
         """Initialize the client."""
         validate_cluster(cluster)
-        validate_key(token)
-
-        self.token = token
+        if not isinstance(token, KeyPool):
+            tokens = [token] if token is None or isinstance(token, str) else list(token)
+            if not tokens:
+                raise Exceptions.InvalidRiotAPIKey("A Riot API key is required.")
+            for key in tokens:
+                validate_key(key)
+            token = KeyPool(tokens)
+
+        self.keys = token
+        self.token = token.tokens[0]
+        self.rate_limit = rate_limit
         self.cluster = cluster
         self.raw_data = raw_data
+        self.retry_policy = retry_policy
+        self.deadline = deadline
+        self.coalesce = coalesce
+        self.cache = cache
+        self.cache_ttls = {**DEFAULT_TTLS, **(cache_ttls or {})}
+        self.match_store = match_store
+        self.fast_decode = fast_decode
+        self.lazy_rounds = lazy_rounds
+        self.json_loads = json_loads or DEFAULT_JSON_LOADS
+        self.raw_bytes = raw_bytes
+        self.connection = connection
+        self.prewarm = prewarm
+        self.hedge_policy = hedge_policy
+        self.base_url = base_url.rstrip("/")
+        self.cassette = cassette
+        self.metrics = metrics
+        self.latency: Dict[str, LatencyHistogram] = {}
+        """Latency histograms of recent successful requests, keyed by client method."""
         self._headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
                           "AppleWebKit/537.36 (KHTML, like Gecko) "
                           "Chrome/112.0.0.0 Safari/537.36",
             "Accept-Language": "en-US,en;q=0.9",
             "Accept-Charset": "application/x-www-form-urlencoded; charset=UTF-8",
-            "Origin": "https://developer.riotgames.com",
-            "X-Riot-Token": self.token
+            "Origin": "https://developer.riotgames.com"
         }
-        self._timeout = aiohttp.ClientTimeout(total=30)
+        self._inflight: Dict[Tuple[str, Optional[str]], asyncio.Future] = {}
+        self._waiters: Dict[Tuple[str, Optional[str]], List[Optional[RequestEvent]]] = {}
+        self._breaker: Optional[CircuitBreaker] = CircuitBreaker(circuit_breaker) if circuit_breaker is not None else None
         self.session: Optional[aiohttp.ClientSession] = None
 
     async def __aenter__(self):
         self._ensure_session()
+        if self.prewarm:
+            await self.warmup()
         return self
 
     async def __aexit__(self, exc_type, exc, tb):
         await self.close()
 
+    def _host(self, route: str) -> str:
+        return self.base_url.format(route=route)
+
     def _ensure_session(self) -> aiohttp.ClientSession:
         if self.session is None or self.session.closed:
-            self.session = aiohttp.ClientSession(timeout=self._timeout)
+            self.session = aiohttp.ClientSession(connector=self.connection.connector(), timeout=self.connection.timeout())
         return self.session
 
+    async def warmup(self, routes: Optional[Iterable[str]] = None, connections: int = 1) -> List[str]:
+        """Open connections to the API hosts ahead of time so the first requests skip the DNS lookup and TLS handshake.
+
+        Each connection is opened with an unauthenticated request to the host root, which does not count against the rate limits,
+        and is then kept in the pool for ``connection.keepalive_timeout`` seconds.
+
+        :param routes: The regions and clusters to connect to. Defaults to every region and cluster.
+        :type routes: Iterable[str], optional
+        :param connections: The number of connections to open to each host, defaults to 1.
+        :type connections: int
+        :return: The routes that were connected to successfully, none when replaying a cassette.
+        :rtype: List[str]
+        """
+        if self.cassette is not None and not self.cassette.recording:
+            return []
+        session = self._ensure_session()
+        routes = sorted(REGIONS | CLUSTERS) if routes is None else [route.lower() for route in routes]
+        headers = {"User-Agent": self._headers["User-Agent"]}
+
+        async def connect(route: str):
+            async with session.get(f"{self._host(route)}/", headers=headers, allow_redirects=False) as resp:
+                await resp.read()
+
+        results = await asyncio.gather(
+            *(connect(route) for route in routes for _ in range(connections)),
+            return_exceptions=True
+        )
+        return [
+            route for index, route in enumerate(routes)
+            if not all(isinstance(result, Exception) for result in results[index * connections:(index + 1) * connections])
+        ]
+
     async def close(self):
-        """Close the aiohttp session."""
+        """Close the aiohttp session and the cassette, if any."""
         if self.session and not self.session.closed:
             await self.session.close()
-
-    async def _request(self, url: str, headers: dict) -> dict:
-        """Make a GET request and return parsed JSON."""
-        session = self._ensure_session()
-        async with session.get(url, headers=headers) as resp:
-            if resp.status >= 400:
+        if self.cassette is not None:
+            self.cassette.close()
+
+    async def _request(self, url: str, headers: dict, route: str, endpoint: str, deadline: Optional[float] = None) -> dict:
+        """Make a GET request and return parsed JSON.
+
+        When coalescing is enabled, concurrent calls for the same URL and credentials
+        share a single in-flight request and all receive the same parsed JSON. The API
+        key is picked from the key pool for every attempt, so it is not part of the headers.
+
+        :param url: The full URL to request.
+        :param headers: The headers to send.
+        :param route: The routing value (region or cluster) the URL points at, used for rate limiting.
+        :param endpoint: The name of the client method making the request, used for rate limiting.
+        :param deadline: The overall time limit in seconds for the call. Defaults to self.deadline.
+        :raises DeadlineExceeded: If the deadline passes before a response is received.
+        :raises CircuitOpen: If the circuit breaker for the region or cluster is open.
+        """
+        if self.metrics is None:
+            return await self._get(url, headers, route, endpoint, deadline)
+        async with self.metrics.track(endpoint, route, url) as event:
+            return await self._get(url, headers, route, endpoint, deadline, event)
+
+    async def _get(self, url: str, headers: dict, route: str, endpoint: str, deadline: Optional[float] = None, event: Optional[RequestEvent] = None) -> dict:
+        """Return a response from the cache, an in-flight request or a new request."""
+        deadline = self.deadline if deadline is None else deadline
+        cached = self.cache is not None and "Authorization" not in headers and self.cache_ttls.get(endpoint, 0) != 0
+        if cached:
+            payload = await self.cache.get(url)
+            if self.metrics is not None:
+                self.metrics.record_cache(endpoint, payload is not None)
+            if event is not None:
+                event.cached = payload is not None
+            if payload is not None:
+                return payload
+
+        if not self.coalesce:
+            return await self._load(url, headers, route, endpoint, deadline, cached, [event] if event is not None else None)
+
+        key = (url, headers.get("Authorization"))
+        task = self._inflight.get(key)
+        if task is None:
+            # The shared request has no deadline of its own, every caller only waits for as long as its deadline allows.
+            waiters = self._waiters[key] = []
+            task = asyncio.ensure_future(self._load(url, headers, route, endpoint, None, cached, waiters if self.metrics is not None and self.metrics.hooked else None))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._forget_inflight(key, done))
+
+        waiters = self._waiters[key]
+        waiters.append(event)
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), deadline)
+        except asyncio.TimeoutError:
+            if task.done():
+                raise
+            raise Exceptions.DeadlineExceeded(f"Deadline exceeded while requesting {endpoint}.") from None
+        finally:
+            if self._inflight.get(key) is task:
+                waiters.remove(event)
+                if not waiters and not task.done():
+                    # Every caller gave up, stop retrying on their behalf.
+                    task.cancel()
+
+    def _forget_inflight(self, key: Tuple[str, Optional[str]], task: asyncio.Future):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+            del self._waiters[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved in case every caller has gone away.
+            task.exception()
+
+    async def _load(self, url: str, headers: dict, route: str, endpoint: str, deadline: Optional[float], cached: bool, events: Optional[List[Optional[RequestEvent]]] = None) -> dict:
+        """Fetch a URL and, if ``cached`` is set, store the response in the cache."""
+        payload = await self._fetch(url, headers, route, endpoint, deadline, events)
+        if cached:
+            ttl = self.cache_ttls.get(endpoint)
+            if ttl is None and endpoint in {"GET_getMatch", "GET_getConsoleMatch"}:
+                # Only finished matches are immutable.
+                match = self.json_loads(payload) if isinstance(payload, bytes) else payload
+                match_info = match.get("matchInfo") if isinstance(match, dict) else None
+                if not (match_info or {}).get("isCompleted"):
+                    return payload
+            await self.cache.set(url, payload, ttl)
+        return payload
+
+    async def _fetch(self, url: str, headers: dict, route: str, endpoint: str, deadline: Optional[float] = None, events: Optional[List[Optional[RequestEvent]]] = None) -> dict:
+        """Make a GET request, retrying according to the retry policy, and return parsed JSON.
+
+        Every event in ``events`` gets the status of the latest response.
+        """
+        expires = time.monotonic() + deadline if deadline is not None else None
+        policy = self.retry_policy
+        route = route.lower()
+        keys = self.keys
+        # A 401 from a player's access token says nothing about the API key.
+        switch_keys = len(keys) > 1 and "Authorization" not in headers
+        attempt, switched, refused = 0, 0, []
+
+        while True:
+            before = keys.available() if switch_keys else None
+            try:
+                if self.hedge_policy is not None and endpoint in self.hedge_policy.endpoints:
+                    return await self._send_hedged(url, headers, route, endpoint, expires, events)
+                return await self._send(url, headers, route, endpoint, expires, events=events)
+            except Exceptions.RiotAPIResponseError as exc:
+                if exc.status_code in (401, 403) and before is not None:
+                    refused.extend(token for token in before if keys.parked(token))
+                    switched += 1
+                    if switched < len(keys) and keys.available():
+                        # The key that failed is parked, try again straight away with another one.
+                        continue
+                    if switched >= len(keys):
+                        # Every key was refused, so the request is at fault rather than the keys.
+                        for token in refused:
+                            keys.unpark(token)
+                if policy is None or attempt >= policy.max_retries or exc.status_code not in policy.retry_statuses:
+                    raise
+                delay = exc.retry_after if exc.status_code == 429 and exc.retry_after is not None else policy.backoff(attempt)
+                if expires is not None and time.monotonic() + delay >= expires:
+                    raise
+            except Exceptions.DeadlineExceeded:
+                raise
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if policy is None or not policy.retry_connection_errors or attempt >= policy.max_retries:
+                    raise
+                delay = policy.backoff(attempt)
+                if expires is not None and time.monotonic() + delay >= expires:
+                    raise
+
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def _histogram(self, endpoint: str) -> LatencyHistogram:
+        histogram = self.latency.get(endpoint)
+        if histogram is None:
+            histogram = self.latency[endpoint] = LatencyHistogram()
+        return histogram
+
+    async def _send_hedged(self, url: str, headers: dict, route: str, endpoint: str, expires: Optional[float] = None, events: Optional[List[Optional[RequestEvent]]] = None) -> dict:
+        """Make a GET request, sending one duplicate if it is slower than the hedge policy allows, and return the first success.
+
+        The delay only starts once the request holds its rate limit slot, and no duplicate is sent
+        while the rate limits would make it wait, so hedging never competes with queued requests.
+        """
+        delay = self.hedge_policy.delay(self._histogram(endpoint))
+        if delay == float("inf"):
+            return await self._send(url, headers, route, endpoint, expires, events=events)
+
+        sent = asyncio.Event()
+        first = asyncio.ensure_future(self._send(url, headers, route, endpoint, expires, sent, events))
+        tasks = {first}
+        waiting = asyncio.ensure_future(sent.wait())
+        try:
+            await asyncio.wait({first, waiting}, return_when=asyncio.FIRST_COMPLETED)
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done and not (self.rate_limit and self.keys.delay(route, endpoint) > 0):
+                tasks.add(asyncio.ensure_future(self._send(url, headers, route, endpoint, expires, events=events)))
+            while True:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                if not tasks:
+                    # Both failed, report the original request's error.
+                    return first.result()
+        finally:
+            waiting.cancel()
+            # The slower request is dropped, if it was already sent it still counts against the rate limits.
+            for task in tasks:
+                task.cancel()
+
+    async def _send(self, url: str, headers: dict, route: str, endpoint: str, expires: Optional[float] = None, sent: Optional[asyncio.Event] = None, events: Optional[List[Optional[RequestEvent]]] = None) -> dict:
+        """Make a single GET request and return parsed JSON, setting ``sent`` once the request holds its rate limit slot.
+
+        Every event in ``events`` gets the status of the response.
+        """
+        breaker = self._breaker
+        if breaker is not None:
+            retry_in = breaker.allow(route)
+            if retry_in is not None:
+                raise Exceptions.CircuitOpen(route, retry_in)
+
+        healthy, latency = None, None
+        metrics = self.metrics
+        try:
+            session = self._ensure_session()
+            keys = self.keys
+            if self.rate_limit:
+                queued = time.monotonic()
                 try:
-                    payload = await verify_content(resp)
-                    status_message = (
-                        payload.get("status", {}).get("message")
-                        if isinstance(payload, dict) else None
-                    ) or str(payload)
-                except Exceptions.FailedToParseJSON:
-                    status_message = await resp.text()
-                raise Exceptions.RiotAPIResponseError(resp.status, status_message)
-            return await verify_content(resp)
-
-    async def GET_getByPuuid(self, puuid: str, cluster: Optional[str] = None) -> Union[AccountDto, Dict]:
+                    token = await asyncio.wait_for(keys.acquire(route, endpoint), self._remaining(expires))
+                except asyncio.TimeoutError:
+                    raise Exceptions.DeadlineExceeded(f"Deadline exceeded while waiting on the rate limit for {endpoint}.") from None
+                if metrics is not None:
+                    metrics.record_rate_limit_wait(endpoint, route, time.monotonic() - queued)
+            else:
+                token = keys.choose(route, endpoint)
+            if sent is not None:
+                sent.set()
+
+            settled = False
+            started = time.monotonic()
+            try:
+                remaining = self._remaining(expires)
+                if remaining == 0.0:
+                    # aiohttp treats a total timeout of 0 as no timeout at all.
+                    raise Exceptions.DeadlineExceeded(f"Deadline exceeded before requesting {endpoint}.")
+                timeout = self.connection.timeout(remaining)
+                if self.cassette is None:
+                    request = session.get(url, headers={**headers, "X-Riot-Token": token}, timeout=timeout)
+                else:
+                    request = self.cassette.get(session, url, {**headers, "X-Riot-Token": token}, timeout, route, endpoint)
+                    if request is None:
+                        raise Exceptions.CassetteMiss(url)
+                async with request as resp:
+                    healthy, latency = resp.status < 500, time.monotonic() - started
+                    keys.update(token, route, endpoint, resp.status, resp.headers, limited=self.rate_limit, blame="Authorization" not in headers)
+                    settled = True
+                    if metrics is not None:
+                        metrics.record_status(endpoint, route, resp.status)
+                    for event in events or ():
+                        if event is not None:
+                            event.status = resp.status
+                    if resp.status >= 400:
+                        try:
+                            payload = await verify_content(resp, self.json_loads)
+                            status_message = (
+                                payload.get("status", {}).get("message")
+                                if isinstance(payload, dict) else None
+                            ) or str(payload)
+                        except Exceptions.FailedToParseJSON:
+                            status_message = await resp.text()
+                        raise Exceptions.RiotAPIResponseError(resp.status, status_message, retry_after_seconds(resp.headers))
+                    if self.raw_bytes:
+                        payload = await resp.read()
+                    elif metrics is None:
+                        payload = await verify_content(resp, self.json_loads)
+                    else:
+                        # Read the body first so only parsing is timed, aiohttp keeps it for verify_content.
+                        await resp.read()
+                        decoding = time.perf_counter()
+                        payload = await verify_content(resp, self.json_loads)
+                        metrics.record_json_decode(endpoint, time.perf_counter() - decoding)
+                    self._histogram(endpoint).add(time.monotonic() - started)
+                    return payload
+            except asyncio.TimeoutError:
+                if expires is not None and time.monotonic() >= expires:
+                    raise Exceptions.DeadlineExceeded(f"Deadline exceeded while requesting {endpoint}.") from None
+                healthy = False
+                raise
+            except aiohttp.ClientConnectionError:
+                healthy = False
+                raise
+            finally:
+                if not settled:
+                    keys.update(token, route, endpoint, limited=self.rate_limit)
+        finally:
+            if breaker is not None:
+                if healthy is None:
+                    breaker.release(route)
+                else:
+                    breaker.record(route, healthy, latency)
+
+    async def _request_match(self, url: str, matchId: str, region: str, endpoint: str, deadline: Optional[float] = None) -> dict:
+        """Return a match from the match store, or request it and write it through if completed."""
+        store = self.match_store
+        if store is not None:
+            # SQLite and zlib block, so the store is used from a worker thread.
+            stored = await asyncio.to_thread(store.get_raw if self.raw_bytes else store.get, matchId)
+            if stored is not None:
+                return stored
+
+        raw_response = await self._request(url, self._headers, region, endpoint, deadline)
+        if store is not None:
+            await asyncio.to_thread(self._store_match, store, raw_response)
+        return raw_response
+
+    def _store_match(self, store: MatchStore, raw_response: Union[dict, bytes]):
+        """Write a match through to the store if it is completed, parsing a raw body only once."""
+        if self.raw_bytes:
+            match, body = self.json_loads(raw_response), raw_response
+        else:
+            match, body = raw_response, None
+        if match.get("matchInfo", {}).get("isCompleted"):
+            store.put(match, body)
+
+    def _decode(self, cls: type, data: dict):
+        """Convert raw JSON into an instance of ``cls``."""
+        metrics = self.metrics
+        if metrics is None:
+            return decode(cls, data) if self.fast_decode else fromdict(cls, data)
+        started = time.perf_counter()
+        result = decode(cls, data) if self.fast_decode else fromdict(cls, data)
+        metrics.record_fromdict(cls, time.perf_counter() - started)
+        return result
+
+    def _decode_match(self, data: dict) -> MatchDto:
+        """Convert a raw match into a MatchDto, deferring roundResults if lazy_rounds is set."""
+        if not self.lazy_rounds:
+            return self._decode(MatchDto, data)
+        match = self._decode(MatchDto, {**data, "roundResults": []})
+        return LazyMatchDto.defer(match.matchInfo, match.players, match.coaches, match.teams, data.get("roundResults") or [], functools.partial(_decode_round_results, self.fast_decode, self.metrics))
+
+    @staticmethod
+    def _remaining(expires: Optional[float]) -> Optional[float]:
+        if expires is None:
+            return None
+        return max(expires - time.monotonic(), 0.0)
+
+    async def GET_getByPuuid(self, puuid: str, cluster: Optional[str] = None, deadline: Optional[float] = None) -> Union[AccountDto, Dict]:
         """Get account by PUUID.
 
         :param puuid: The PUUID of the account.
         :type puuid: str
         :param cluster: The cluster to retrieve from. Defaults to self.cluster.
         :type cluster: str, optional
+        :param deadline: The overall time limit in seconds for this call, including retries. Defaults to the client deadline.
+        :type deadline: float, optional
         :rtype: Union[AccountDto, Dict]
         :raises InvalidCluster: If the provided cluster is invalid.
         :raises RiotAPIResponseError: If the API response indicates an error.
+        :raises DeadlineExceeded: If the deadline passes before a response is received.
+        :raises CircuitOpen: If the circuit breaker for the region or cluster is open.
         """
         cluster = cluster or self.cluster
         validate_cluster(cluster)
 
         puuid = quote(puuid, safe="")
-        raw_response = await self._request(f"https://{cluster}.api.riotgames.com/riot/account/v1/accounts/by-puuid/{puuid}", self._headers)
-        if self.raw_data:
+        raw_response = await self._request(f"{self._host(cluster)}/riot/account/v1/accounts/by-puuid/{puuid}", self._headers, cluster, "GET_getByPuuid", deadline)
+        if self.raw_data or self.raw_bytes:
             return raw_response
-        return fromdict(AccountDto, raw_response)
+        return self._decode(AccountDto, raw_response)
 
-    async def GET_getByRiotId(self, gameName: str, tagLine: str, cluster: Optional[str] = None) -> Union[AccountDto, Dict]:
+    async def GET_getByRiotId(self, gameName: str, tagLine: str, cluster: Optional[str] = None, deadline: Optional[float] = None) -> Union[AccountDto, Dict]:
         """Get account by Riot ID.
 
         :param gameName: The game name of the account (gameName#tagLine).
@@ -238,65 +685,77 @@ class Client:
         :type tagLine: str
         :param cluster: The cluster to retrieve from. Defaults to self.cluster.
         :type cluster: str, optional
+        :param deadline: The overall time limit in seconds for this call, including retries. Defaults to the client deadline.
+        :type deadline: float, optional
         :rtype: Union[AccountDto, Dict]
         :raises InvalidCluster: If the provided cluster is invalid.
         :raises RiotAPIResponseError: If the API response indicates an error.
+        :raises DeadlineExceeded: If the deadline passes before a response is received.
+        :raises CircuitOpen: If the circuit breaker for the region or cluster is open.
         """
         cluster = cluster or self.cluster
         validate_cluster(cluster)
 
         gameName = quote(gameName, safe="")
         tagLine = quote(tagLine, safe="")
-        raw_response = await self._request(f"https://{cluster}.api.riotgames.com/riot/account/v1/accounts/by-riot-id/{gameName}/{tagLine}", self._headers)
-        if self.raw_data:
+        raw_response = await self._request(f"{self._host(cluster)}/riot/account/v1/accounts/by-riot-id/{gameName}/{tagLine}", self._headers, cluster, "GET_getByRiotId", deadline)
+        if self.raw_data or self.raw_bytes:
             return raw_response
-        return fromdict(AccountDto, raw_response)
+        return self._decode(AccountDto, raw_response)
 
-    async def GET_getByAccessToken(self, authorization: str, cluster: Optional[str] = None) -> Union[AccountDto, Dict]:
+    async def GET_getByAccessToken(self, authorization: str, cluster: Optional[str] = None, deadline: Optional[float] = None) -> Union[AccountDto, Dict]:
         """Get account by access token.
 
         :param authorization: The access token.
         :type authorization: str
         :param cluster: The cluster to retrieve from. Defaults to self.cluster.
         :type cluster: str, optional
+        :param deadline: The overall time limit in seconds for this call, including retries. Defaults to the client deadline.
+        :type deadline: float, optional
         :rtype: Union[AccountDto, Dict]
         :raises InvalidCluster: If the provided cluster is invalid.
         :raises RiotAPIResponseError: If the API response indicates an error.
+        :raises DeadlineExceeded: If the deadline passes before a response is received.
+        :raises CircuitOpen: If the circuit breaker for the region or cluster is open.
         """
         cluster = cluster or self.cluster
         validate_cluster(cluster)
 
         headers = {**self._headers, "Authorization": authorization}
-        raw_response = await self._request(f"https://{cluster}.api.riotgames.com/riot/account/v1/accounts/me", headers)
-        if self.raw_data:
+        raw_response = await self._request(f"{self._host(cluster)}/riot/account/v1/accounts/me", headers, cluster, "GET_getByAccessToken", deadline)
+        if self.raw_data or self.raw_bytes:
             return raw_response
-        return fromdict(AccountDto, raw_response)
+        return self._decode(AccountDto, raw_response)
 
-    async def GET_getActiveShard(self, puuid: str, cluster: Optional[str] = None) -> Union[ActiveShardDto, Dict]:
+    async def GET_getActiveShard(self, puuid: str, cluster: Optional[str] = None, deadline: Optional[float] = None) -> Union[ActiveShardDto, Dict]:
         """Get active shard for a player.
 
         :param puuid: The PUUID of the account.
         :type puuid: str
         :param cluster: The cluster to retrieve from. Defaults to self.cluster.
         :type cluster: str, optional
+        :param deadline: The overall time limit in seconds for this call, including retries. Defaults to the client deadline.
+        :type deadline: float, optional
         :rtype: Union[ActiveShardDto, Dict]
         :raises InvalidCluster: If the provided cluster is invalid.
         :raises RiotAPIResponseError: If the API response indicates an error.
+        :raises DeadlineExceeded: If the deadline passes before a response is received.
+        :raises CircuitOpen: If the circuit breaker for the region or cluster is open.
         """
         cluster = cluster or self.cluster
         validate_cluster(cluster)
 
         puuid = quote(puuid, safe="")
-        raw_response = await self._request(f"https://{cluster}.api.riotgames.com/riot/account/v1/active-shards/by-game/val/by-puuid/{puuid}", self._headers)
-        if self.raw_data:
+        raw_response = await self._request(f"{self._host(cluster)}/riot/account/v1/active-shards/by-game/val/by-puuid/{puuid}", self._headers, cluster, "GET_getActiveShard", deadline)
+        if self.raw_data or self.raw_bytes:
             return raw_response
-        return fromdict(ActiveShardDto, raw_response)
+        return self._decode(ActiveShardDto, raw_response)
 
     ######################
     ### VAL-CONTENT-V1 ###
     ######################
 
-    async def GET_getContent(self, region: str, locale: Optional[str] = "") -> Union[ContentDto, Dict]:
+    async def GET_getContent(self, region: str, locale: Optional[str] = "", deadline: Optional[float] = None) -> Union[ContentDto, Dict]:
         """Get content optionally filtered by locale.
 
         A locale is recommended to be used for faster response times.
@@ -305,65 +764,80 @@ class Client:
         :type region: str
         :param locale: The locale to retrieve data for, defaults to "".
         :type locale: str, optional
+        :param deadline: The overall time limit in seconds for this call, including retries. Defaults to the client deadline.
+        :type deadline: float, optional
         :rtype: Union[ContentDto, Dict]
         :raises InvalidRegion: If the provided region is invalid.
         :raises InvalidLocale: If the provided locale is invalid.
         :raises RiotAPIResponseError: If the API response indicates an error.
+        :raises DeadlineExceeded: If the deadline passes before a response is received.
+        :raises CircuitOpen: If the circuit breaker for the region or cluster is open.
         """
+        raw_response = await self._content(region, locale, deadline)
+        if self.raw_data or self.raw_bytes:
+            return raw_response
+        return self._decode(ContentDto, raw_response)
+
+    async def _content(self, region: str, locale: Optional[str] = "", deadline: Optional[float] = None) -> Union[Dict, bytes]:
+        """Request the content and return the parsed JSON, or the body if raw_bytes is set, without decoding it."""
         validate_region(region)
 
         if locale and locale.lower() not in LOCALES:
             raise Exceptions.InvalidLocale(f"Invalid locale, valid locales are: {list(LOCALES.values())}.")
         locale_query = f"?locale={quote(LOCALES[locale.lower()], safe='')}" if locale else ""
 
-        raw_response = await self._request(f"https://{region}.api.riotgames.com/val/content/v1/contents{locale_query}", self._headers)
-        if self.raw_data:
-            return raw_response
-        return fromdict(ContentDto, raw_response)
+        return await self._request(f"{self._host(region)}/val/content/v1/contents{locale_query}", self._headers, region, "GET_getContent", deadline)
 
     ####################
     ### VAL-MATCH-V1 ###
     #################### 
 
-    async def GET_getMatch(self, matchId: str, region: str) -> Union[MatchDto, Dict]:
+    async def GET_getMatch(self, matchId: str, region: str, deadline: Optional[float] = None) -> Union[MatchDto, Dict]:
         """Get match by id.
 
         :param matchId: The match id.
         :type matchId: str
         :param region: The region to execute against.
         :type region: str
+        :param deadline: The overall time limit in seconds for this call, including retries. Defaults to the client deadline.
+        :type deadline: float, optional
         :rtype: Union[MatchDto, Dict]
         :raises InvalidRegion: If the provided region is invalid.
         :raises RiotAPIResponseError: If the API response indicates an error.
+        :raises DeadlineExceeded: If the deadline passes before a response is received.
+        :raises CircuitOpen: If the circuit breaker for the region or cluster is open.
         """
         validate_region(region)
 
-        matchId = quote(matchId, safe="")
-        raw_response = await self._request(f"https://{region}.api.riotgames.com/val/match/v1/matches/{matchId}", self._headers)
-        if self.raw_data:
+        raw_response = await self._request_match(f"{self._host(region)}/val/match/v1/matches/{quote(matchId, safe='')}", matchId, region, "GET_getMatch", deadline)
+        if self.raw_data or self.raw_bytes:
             return raw_response
-        return fromdict(MatchDto, raw_response)
+        return self._decode_match(raw_response)
 
-    async def GET_getMatchlist(self, puuid: str, region: str) -> Union[MatchlistDto, Dict]:
+    async def GET_getMatchlist(self, puuid: str, region: str, deadline: Optional[float] = None) -> Union[MatchlistDto, Dict]:
         """Get matchlist for games played by puuid.
 
         :param puuid: The PUUID of the account.
         :type puuid: str
         :param region: The region to execute against.
         :type region: str
+        :param deadline: The overall time limit in seconds for this call, including retries. Defaults to the client deadline.
+        :type deadline: float, optional
         :rtype: Union[MatchlistDto, Dict]
         :raises InvalidRegion: If the provided region is invalid.
         :raises RiotAPIResponseError: If the API response indicates an error.
+        :raises DeadlineExceeded: If the deadline passes before a response is received.
+        :raises CircuitOpen: If the circuit breaker for the region or cluster is open.
         """
         validate_region(region)
 
         puuid = quote(puuid, safe="")
-        raw_response = await self._request(f"https://{region}.api.riotgames.com/val/match/v1/matchlists/by-puuid/{puuid}", self._headers)
-        if self.raw_data:
+        raw_response = await self._request(f"{self._host(region)}/val/match/v1/matchlists/by-puuid/{puuid}", self._headers, region, "GET_getMatchlist", deadline)
+        if self.raw_data or self.raw_bytes:
             return raw_response
-        return fromdict(MatchlistDto, raw_response)
+        return self._decode(MatchlistDto, raw_response)
 
-    async def GET_getRecent(self, queue: str, region: str) -> Union[RecentMatchesDto, Dict]:
+    async def GET_getRecent(self, queue: str, region: str, deadline: Optional[float] = None) -> Union[RecentMatchesDto, Dict]:
         """Get recent matches.
 
         Returns a list of match ids that have completed 
@@ -379,26 +853,30 @@ class Client:
         :type queue: str
         :param region: The region to execute against.
         :type region: str
+        :param deadline: The overall time limit in seconds for this call, including retries. Defaults to the client deadline.
+        :type deadline: float, optional
         :rtype: Union[RecentMatchesDto, Dict]
         :raises InvalidRegion: If the provided region is invalid.
         :raises InvalidQueue: If the provided queue is invalid.
         :raises RiotAPIResponseError: If the API response indicates an error.
+        :raises DeadlineExceeded: If the deadline passes before a response is received.
+        :raises CircuitOpen: If the circuit breaker for the region or cluster is open.
         """
         validate_region(region)
         if queue.lower() not in QUEUES:
             raise Exceptions.InvalidQueue(f"Invalid queue, valid queues are: {QUEUES}.")
 
         queue = quote(queue, safe="")
-        raw_response = await self._request(f"https://{region}.api.riotgames.com/val/match/v1/recent-matches/by-queue/{queue}", self._headers)
-        if self.raw_data:
+        raw_response = await self._request(f"{self._host(region)}/val/match/v1/recent-matches/by-queue/{queue}", self._headers, region, "GET_getRecent", deadline)
+        if self.raw_data or self.raw_bytes:
             return raw_response
-        return fromdict(RecentMatchesDto, raw_response)
+        return self._decode(RecentMatchesDto, raw_response)
 
     #####################
     ### VAL-RANKED-V1 ###
     #####################
 
-    async def GET_getLeaderboard(self, actId: str, region: str, size: int = 200, startIndex: int = 0) -> Union[LeaderboardDto, Dict]:
+    async def GET_getLeaderboard(self, actId: str, region: str, size: int = 200, startIndex: int = 0, deadline: Optional[float] = None) -> Union[LeaderboardDto, Dict]:
         """Get leaderboard for the competitive queue.
 
         :param actId: The act id.
@@ -409,10 +887,14 @@ class Client:
         :type size: int
         :param startIndex: The index to start from, defaults to 0.
         :type startIndex: int
+        :param deadline: The overall time limit in seconds for this call, including retries. Defaults to the client deadline.
+        :type deadline: float, optional
         :rtype: Union[LeaderboardDto, Dict]
         :raises InvalidRegion: If the provided region is invalid.
         :raises ValueError: If the size is not between 1 and 200.
         :raises RiotAPIResponseError: If the API response indicates an error.
+        :raises DeadlineExceeded: If the deadline passes before a response is received.
+        :raises CircuitOpen: If the circuit breaker for the region or cluster is open.
         """
         validate_region(region)
 
@@ -420,34 +902,37 @@ class Client:
             raise ValueError("Invalid size, valid values: 1 to 200.")
         
         actId = quote(actId, safe="")
-        raw_response = await self._request(f"https://{region}.api.riotgames.com/val/ranked/v1/leaderboards/by-act/{actId}?size={size}&startIndex={startIndex}", self._headers)
-        if self.raw_data:
+        raw_response = await self._request(f"{self._host(region)}/val/ranked/v1/leaderboards/by-act/{actId}?size={size}&startIndex={startIndex}", self._headers, region, "GET_getLeaderboard", deadline)
+        if self.raw_data or self.raw_bytes:
             return raw_response
-        return fromdict(LeaderboardDto, raw_response)
+        return self._decode(LeaderboardDto, raw_response)
         
     ############################
     ### VAL-CONSOLE-MATCH-V1 ###
     ############################
 
-    async def GET_getConsoleMatch(self, matchId: str, region: str) -> Union[MatchDto, Dict]:
+    async def GET_getConsoleMatch(self, matchId: str, region: str, deadline: Optional[float] = None) -> Union[MatchDto, Dict]:
         """Get match console data.
 
         :param matchId: The match id.
         :type matchId: str
         :param region: The region to execute against.
         :type region: str
+        :param deadline: The overall time limit in seconds for this call, including retries. Defaults to the client deadline.
+        :type deadline: float, optional
         :rtype: Union[MatchDto, Dict]
         :raises InvalidRegion: If the provided region is invalid.
         :raises RiotAPIResponseError: If the API response indicates an error.
+        :raises DeadlineExceeded: If the deadline passes before a response is received.
+        :raises CircuitOpen: If the circuit breaker for the region or cluster is open.
         """
         validate_region(region)
-        matchId = quote(matchId, safe="")
-        raw_response = await self._request(f"https://{region}.api.riotgames.com/val/match/console/v1/matches/{matchId}", self._headers)
-        if self.raw_data:
+        raw_response = await self._request_match(f"{self._host(region)}/val/match/console/v1/matches/{quote(matchId, safe='')}", matchId, region, "GET_getConsoleMatch", deadline)
+        if self.raw_data or self.raw_bytes:
             return raw_response
-        return fromdict(MatchDto, raw_response)
+        return self._decode_match(raw_response)
         
-    async def GET_getConsoleMatchlist(self, puuid: str, region: str, platformType: str) -> Union[MatchlistDto, Dict]:
+    async def GET_getConsoleMatchlist(self, puuid: str, region: str, platformType: str, deadline: Optional[float] = None) -> Union[MatchlistDto, Dict]:
         """Get matchlist for console games played by puuid.
 
         :param puuid: The PUUID of the account.
@@ -456,22 +941,26 @@ class Client:
         :type region: str
         :param platformType: The platform type to retrieve matchlist for.
         :type platformType: str
+        :param deadline: The overall time limit in seconds for this call, including retries. Defaults to the client deadline.
+        :type deadline: float, optional
         :rtype: Union[MatchlistDto, Dict]
         :raises InvalidRegion: If the provided region is invalid.
         :raises InvalidPlatformType: If the provided platform type is invalid.
         :raises RiotAPIResponseError: If the API response indicates an error.
+        :raises DeadlineExceeded: If the deadline passes before a response is received.
+        :raises CircuitOpen: If the circuit breaker for the region or cluster is open.
         """
         validate_region(region)
         validate_platform_type(platformType)
 
         puuid = quote(puuid, safe="")
         platformType = quote(platformType, safe="")
-        raw_response = await self._request(f"https://{region}.api.riotgames.com/val/match/console/v1/matchlists/by-puuid/{puuid}?platformType={platformType}", self._headers)
-        if self.raw_data:
+        raw_response = await self._request(f"{self._host(region)}/val/match/console/v1/matchlists/by-puuid/{puuid}?platformType={platformType}", self._headers, region, "GET_getConsoleMatchlist", deadline)
+        if self.raw_data or self.raw_bytes:
             return raw_response
-        return fromdict(MatchlistDto, raw_response)
+        return self._decode(MatchlistDto, raw_response)
         
-    async def GET_getConsoleRecent(self, queue: str, region: str) -> Union[RecentMatchesDto, Dict]:
+    async def GET_getConsoleRecent(self, queue: str, region: str, deadline: Optional[float] = None) -> Union[RecentMatchesDto, Dict]:
         """Get recent console matches.
 
         Returns a list of match ids that have completed 
@@ -487,26 +976,30 @@ class Client:
         :type queue: str
         :param region: The region to execute against.
         :type region: str
+        :param deadline: The overall time limit in seconds for this call, including retries. Defaults to the client deadline.
+        :type deadline: float, optional
         :rtype: Union[RecentMatchesDto, Dict]
         :raises InvalidRegion: If the provided region is invalid.
         :raises InvalidQueue: If the provided queue is invalid.
         :raises RiotAPIResponseError: If the API response indicates an error.
+        :raises DeadlineExceeded: If the deadline passes before a response is received.
+        :raises CircuitOpen: If the circuit breaker for the region or cluster is open.
         """
         validate_region(region)
         if queue.lower() not in CONSOLE_QUEUES:
             raise Exceptions.InvalidQueue(f"Invalid queue, valid queues are: {CONSOLE_QUEUES}.")
 
         queue = quote(queue, safe="")
-        raw_response = await self._request(f"https://{region}.api.riotgames.com/val/match/console/v1/recent-matches/by-queue/{queue}", self._headers)
-        if self.raw_data:
+        raw_response = await self._request(f"{self._host(region)}/val/match/console/v1/recent-matches/by-queue/{queue}", self._headers, region, "GET_getConsoleRecent", deadline)
+        if self.raw_data or self.raw_bytes:
             return raw_response
-        return fromdict(RecentMatchesDto, raw_response)
+        return self._decode(RecentMatchesDto, raw_response)
         
     #############################
     ### VAL-CONSOLE-RANKED-V1 ###
     #############################
 
-    async def GET_getConsoleLeaderboard(self, actId: str, region: str, platformType: str, size: int = 200, startIndex: int = 0) -> Union[LeaderboardDto, Dict]:
+    async def GET_getConsoleLeaderboard(self, actId: str, region: str, platformType: str, size: int = 200, startIndex: int = 0, deadline: Optional[float] = None) -> Union[LeaderboardDto, Dict]:
         """Get leaderboard for the console competitive queue.
 
         :param actId: The act id.
@@ -519,11 +1012,15 @@ class Client:
         :type size: int
         :param startIndex: The index to start from, defaults to 0.
         :type startIndex: int
+        :param deadline: The overall time limit in seconds for this call, including retries. Defaults to the client deadline.
+        :type deadline: float, optional
         :rtype: Union[LeaderboardDto, Dict]
         :raises InvalidRegion: If the provided region is invalid.
         :raises InvalidPlatformType: If the provided platform type is invalid.
         :raises ValueError: If the size is not between 1 and 200.
         :raises RiotAPIResponseError: If the API response indicates an error.
+        :raises DeadlineExceeded: If the deadline passes before a response is received.
+        :raises CircuitOpen: If the circuit breaker for the region or cluster is open.
         """
         validate_region(region)
         validate_platform_type(platformType)
@@ -533,30 +1030,177 @@ class Client:
         
         actId = quote(actId, safe="")
         platformType = quote(platformType, safe="")
-        raw_response = await self._request(f"https://{region}.api.riotgames.com/val/console/ranked/v1/leaderboards/by-act/{actId}?size={size}&startIndex={startIndex}&platformType={platformType}", self._headers)
-        if self.raw_data:
+        raw_response = await self._request(f"{self._host(region)}/val/console/ranked/v1/leaderboards/by-act/{actId}?size={size}&startIndex={startIndex}&platformType={platformType}", self._headers, region, "GET_getConsoleLeaderboard", deadline)
+        if self.raw_data or self.raw_bytes:
             return raw_response
-        return fromdict(LeaderboardDto, raw_response)
+        return self._decode(LeaderboardDto, raw_response)
 
     #####################
     ### VAL-STATUS-V1 ###
     #####################
 
-    async def GET_getPlatformData(self, region: str) -> Union[PlatformDataDto, Dict]:
+    async def GET_getPlatformData(self, region: str, deadline: Optional[float] = None) -> Union[PlatformDataDto, Dict]:
         """Get VALORANT status for the given platform.
 
         :param region: The region to execute against.
         :type region: str
+        :param deadline: The overall time limit in seconds for this call, including retries. Defaults to the client deadline.
+        :type deadline: float, optional
         :rtype: Union[PlatformDataDto, Dict]
         :raises InvalidRegion: If the provided region is invalid.
         :raises RiotAPIResponseError: If the API response indicates an error.
+        :raises DeadlineExceeded: If the deadline passes before a response is received.
+        :raises CircuitOpen: If the circuit breaker for the region or cluster is open.
         """
         validate_region(region)
 
-        raw_response = await self._request(f"https://{region}.api.riotgames.com/val/status/v1/platform-data", self._headers)
-        if self.raw_data:
+        raw_response = await self._request(f"{self._host(region)}/val/status/v1/platform-data", self._headers, region, "GET_getPlatformData", deadline)
+        if self._breaker is not None:
+            self._breaker.hint(region.lower(), self.json_loads(raw_response) if isinstance(raw_response, bytes) else raw_response)
+        if self.raw_data or self.raw_bytes:
             return raw_response
-        return fromdict(PlatformDataDto, raw_response)
+        return self._decode(PlatformDataDto, raw_response)
+
+    ############
+    ### BULK ###
+    ############
+
+    async def get_matches(self, matchIds: Iterable[str], region: str, concurrency: int = 10, console: bool = False, deadline: Optional[float] = None) -> AsyncIterator[Tuple[str, Union[MatchDto, Dict, Exception]]]:
+        """Fetch many matches concurrently, yielding each one as soon as it completes.
+
+        All requests share the client session and rate limiter. A failed match does not
+        stop the batch, the exception it raised is yielded in place of the match instead.
+
+        :param matchIds: The match ids to fetch.
+        :type matchIds: Iterable[str]
+        :param region: The region to execute against.
+        :type region: str
+        :param concurrency: The maximum number of matches fetched at once, defaults to 10.
+        :type concurrency: int
+        :param console: Whether or not to fetch console matches (/val/match/console/v1), defaults to False.
+        :type console: bool
+        :param deadline: The overall time limit in seconds for each match, including retries. Defaults to the client deadline.
+        :type deadline: float, optional
+        :return: An async iterator of (matchId, match or exception) tuples in completion order.
+        :rtype: AsyncIterator[Tuple[str, Union[MatchDto, Dict, Exception]]]
+        :raises InvalidRegion: If the provided region is invalid.
+        :raises ValueError: If the concurrency is less than 1.
+        """
+        validate_region(region)
+        if concurrency < 1:
+            raise ValueError("Invalid concurrency, must be at least 1.")
+
+        fetch = self.GET_getConsoleMatch if console else self.GET_getMatch
+        pending = iter(matchIds)
+        results: asyncio.Queue = asyncio.Queue(maxsize=concurrency)
+        done = object()
+
+        async def worker():
+            for matchId in pending:
+                try:
+                    result = await fetch(matchId, region, deadline=deadline)
+                except Exception as exc:
+                    result = exc
+                await results.put((matchId, result))
+            await results.put(done)
+
+        workers = [asyncio.ensure_future(worker()) for _ in range(concurrency)]
+        try:
+            remaining = len(workers)
+            while remaining:
+                item = await results.get()
+                if item is done:
+                    remaining -= 1
+                    continue
+                yield item
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    async def iter_leaderboard(self, actId: str, region: str, platformType: Optional[str] = None, startIndex: int = 0, limit: Optional[int] = None, pageSize: int = 200, concurrency: int = 5, deadline: Optional[float] = None) -> AsyncIterator[Union[PlayerDto, Dict]]:
+        """Iterate over a whole leaderboard in rank order, fetching pages concurrently.
+
+        The first page is fetched on its own to read totalPlayers, the following pages are then
+        requested up to ``concurrency`` at a time through the client rate limiter. At most
+        ``concurrency`` pages are held in memory at once.
+
+        :param actId: The act id.
+        :type actId: str
+        :param region: The region to execute against.
+        :type region: str
+        :param platformType: The console platform type, if given the console leaderboard is iterated. Defaults to None.
+        :type platformType: str, optional
+        :param startIndex: The index of the first player to yield, defaults to 0.
+        :type startIndex: int
+        :param limit: The maximum number of players to yield, defaults to None (every player).
+        :type limit: int, optional
+        :param pageSize: The number of players requested per page, defaults to 200.
+        :type pageSize: int
+        :param concurrency: The maximum number of pages fetched at once, defaults to 5.
+        :type concurrency: int
+        :param deadline: The overall time limit in seconds for each page, including retries. Defaults to the client deadline.
+        :type deadline: float, optional
+        :return: An async iterator of players, dicts in raw mode.
+        :rtype: AsyncIterator[Union[PlayerDto, Dict]]
+        :raises InvalidRegion: If the provided region is invalid.
+        :raises InvalidPlatformType: If the provided platform type is invalid.
+        :raises ValueError: If the page size is not between 1 and 200, the limit is negative or the concurrency is less than 1.
+        :raises RiotAPIResponseError: If the API response indicates an error.
+        :raises DeadlineExceeded: If the deadline passes before a page is received.
+        :raises CircuitOpen: If the circuit breaker for the region or cluster is open.
+        """
+        validate_region(region)
+        if platformType is not None:
+            validate_platform_type(platformType)
+        if pageSize > 200 or pageSize < 1:
+            raise ValueError("Invalid pageSize, valid values: 1 to 200.")
+        if limit is not None and limit < 0:
+            raise ValueError("Invalid limit, must be at least 0.")
+        if concurrency < 1:
+            raise ValueError("Invalid concurrency, must be at least 1.")
+        if limit == 0:
+            return
+
+        async def fetch(index: int) -> Tuple[int, List[Union[PlayerDto, Dict]]]:
+            size = pageSize if end is None else min(pageSize, end - index)
+            if platformType is None:
+                page = await self.GET_getLeaderboard(actId, region, size, index, deadline=deadline)
+            else:
+                page = await self.GET_getConsoleLeaderboard(actId, region, platformType, size, index, deadline=deadline)
+            if isinstance(page, bytes):
+                page = self.json_loads(page)
+            if isinstance(page, dict):
+                return page.get("totalPlayers") or 0, page.get("players") or []
+            return page.totalPlayers, page.players
+
+        end = None if limit is None else startIndex + limit
+        total, players = await fetch(startIndex)
+        end = total if end is None else min(end, total)
+        for player in players:
+            yield player
+
+        indices = iter(range(startIndex + len(players), end, pageSize) if players else ())
+        pages: deque = deque()
+        try:
+            for index in indices:
+                pages.append(asyncio.ensure_future(fetch(index)))
+                if len(pages) >= concurrency:
+                    break
+            while pages:
+                _, players = await pages.popleft()
+                for index in indices:
+                    pages.append(asyncio.ensure_future(fetch(index)))
+                    break
+                if not players:
+                    # The leaderboard shrank since the first page was read.
+                    break
+                for player in players:
+                    yield player
+        finally:
+            for task in pages:
+                task.cancel()
+            await asyncio.gather(*pages, return_exceptions=True)
 
     ###########
     ### RSO ###
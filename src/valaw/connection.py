@@ -0,0 +1,57 @@
+### Imports ###
+from dataclasses import dataclass
+from typing import Optional
+
+import aiohttp
+
+### Connection Config ###
+@dataclass(frozen=True)
+class ConnectionConfig:
+    """Controls the connection pool and timeouts of the client's aiohttp session.
+
+    Every region and cluster is a separate ``*.api.riotgames.com`` host, so the
+    per-host limit applies to each of them independently. Idle connections are
+    kept open for ``keepalive_timeout`` seconds, bursts that arrive within that
+    window reuse them instead of paying for a new TLS handshake.
+
+    :param limit: The maximum number of open connections across all hosts, defaults to 100. 0 means no limit.
+    :type limit: int
+    :param limit_per_host: The maximum number of open connections to a single host, defaults to 0 (no limit).
+    :type limit_per_host: int
+    :param keepalive_timeout: How long idle connections are kept open in seconds, defaults to 60.
+    :type keepalive_timeout: float
+    :param dns_cache_ttl: How long resolved addresses are cached in seconds, defaults to 300. None caches them forever.
+    :type dns_cache_ttl: float, optional
+    :param connect_timeout: The time limit in seconds for acquiring a connection, including waiting on the pool, the DNS lookup and the TLS handshake, defaults to 10.
+    :type connect_timeout: float, optional
+    :param read_timeout: The time limit in seconds between two reads from the socket, defaults to 30.
+    :type read_timeout: float, optional
+    :param total_timeout: The time limit in seconds for a single request, defaults to 30.
+    :type total_timeout: float, optional
+    """
+    limit: int = 100
+    limit_per_host: int = 0
+    keepalive_timeout: float = 60.0
+    dns_cache_ttl: Optional[float] = 300.0
+    connect_timeout: Optional[float] = 10.0
+    read_timeout: Optional[float] = 30.0
+    total_timeout: Optional[float] = 30.0
+
+    def timeout(self, total: Optional[float] = None) -> aiohttp.ClientTimeout:
+        """Return the request timeout, with the total time limit lowered to ``total`` if it is smaller.
+
+        ``total`` must be positive, aiohttp treats a total of 0 as no time limit.
+        """
+        if total is None or (self.total_timeout is not None and self.total_timeout <= total):
+            total = self.total_timeout
+        return aiohttp.ClientTimeout(total=total, connect=self.connect_timeout, sock_read=self.read_timeout)
+
+    def connector(self) -> aiohttp.TCPConnector:
+        """Return a new connector configured with the pool settings. Must be called with a running event loop."""
+        return aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            use_dns_cache=True,
+            ttl_dns_cache=self.dns_cache_ttl,
+        )
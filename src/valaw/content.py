@@ -0,0 +1,444 @@
+### Imports ###
+import asyncio
+import json
+import os
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .client import LOCALES, Exceptions, validate_region
+from .objects import ActDto, ContentDto, ContentItemDto
+
+### Constants ###
+CATEGORIES = (
+    "characters", "maps", "chromas", "skins", "skinLevels", "equips", "gameModes", "totems",
+    "sprays", "sprayLevels", "charms", "charmLevels", "playerCards", "playerTitles", "acts", "ceremonies"
+)
+"""The lists of ContentDto that are indexed."""
+
+Item = Union[ContentItemDto, ActDto, Dict[str, Any]]
+
+### Helper Functions ###
+def _field(item: Any, name: str) -> Any:
+    return item.get(name) if isinstance(item, dict) else getattr(item, name, None)
+
+def normalize_locale(locale: str) -> str:
+    """Return a locale in the form the API uses, e.g. "en-US", accepting any case and "_" or "-".
+
+    :raises InvalidLocale: If the locale is invalid.
+    """
+    normalized = LOCALES.get(locale.replace("_", "-").lower())
+    if normalized is None:
+        raise Exceptions.InvalidLocale(f"Invalid locale, valid locales are: {list(LOCALES.values())}.")
+    return normalized
+
+def _localized(item: Any, locale: str) -> Optional[str]:
+    """Return the name of an item in ``locale`` from its localizedNames, if it has them."""
+    names = _field(item, "localizedNames")
+    if names is None:
+        return None
+    if isinstance(names, dict):
+        return names.get(locale) or names.get(locale.replace("-", "_"))
+    return getattr(names, locale.replace("-", "_"), None)
+
+def version_key(version: Optional[str]) -> Tuple[Tuple[int, ...], str]:
+    """Return a sort key ordering content versions such as "release-09.10-shipping-12-2847391" by their numbers.
+
+    The numbers are compared as integers, so 09.10 comes after 09.9. A missing version sorts before every other.
+    """
+    if version is None:
+        return (), ""
+    return tuple(int(part) for part in re.findall(r"\d+", version)), version
+
+def merge_locales(contents: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge raw content requested in several locales into one, with localizedNames for each of them.
+
+    The first content is used as the base, and every item gets a localizedNames dict
+    mapping each locale to the item's name in the content requested in that locale.
+    The given dicts are not modified.
+
+    :param contents: Raw content keyed by the locale it was requested in, all of the same version.
+    :type contents: Dict[str, Dict]
+    :rtype: Dict
+    :raises ValueError: If no content is given, or the versions differ.
+    """
+    if not contents:
+        raise ValueError("At least one content is required.")
+    versions = {content.get("version") for content in contents.values()}
+    if len(versions) > 1:
+        raise ValueError(f"Cannot merge different content versions: {sorted(map(str, versions))}.")
+
+    base = next(iter(contents.values()))
+    merged = dict(base)
+    for category in CATEGORIES:
+        names = {
+            locale: {item.get("id"): item.get("name") for item in content.get(category) or []}
+            for locale, content in contents.items()
+        }
+        merged[category] = [
+            {**item, "localizedNames": {
+                locale: by_id.get(item.get("id")) or item.get("name") for locale, by_id in names.items()
+            }}
+            for item in base.get(category) or []
+        ]
+    return merged
+
+### Content Index ###
+class ContentIndex:
+    """Hashed lookups into a GET_getContent response.
+
+    Items of every category are found by id or asset path in constant time. Ids are
+    matched case-insensitively, since content ids are upper case and match data uses lower
+    case. An id found in several categories is looked up in the first of them in CATEGORIES
+    order, unless a category is given. Names in a locale are projected from ``localizedNames`` into one dict per
+    locale, built the first time that locale is asked for.
+
+    An index never changes once built, so one instance can be shared by any number of
+    coroutines. Use :meth:`for_content` or :meth:`fetch` to reuse the index of a content
+    version instead of building it again. Those indexes are kept in a cache shared by the
+    whole process, :meth:`clear_cache` empties it.
+
+    :param content: The content, as a ContentDto or raw dict.
+    :type content: Union[ContentDto, Dict]
+    :param locale: The locale the content was requested in, None if it was requested without one. Defaults to None.
+    :type locale: str, optional
+    """
+
+    _cache: "OrderedDict[Tuple[str, Optional[str], bool], ContentIndex]" = OrderedDict()
+    cache_size = 8
+    """The number of content versions and locales :meth:`for_content` keeps an index for."""
+
+    def __init__(self, content: Union[ContentDto, Dict[str, Any]], locale: Optional[str] = None):
+        self.content = content
+        self.version: str = _field(content, "version")
+        self.locale = normalize_locale(locale) if locale else None
+        self._by_id: Dict[str, Tuple[str, Item]] = {}
+        self._by_category: Dict[Tuple[str, str], Item] = {}
+        self._by_asset_path: Dict[str, Tuple[str, Item]] = {}
+        self._projections: Dict[str, Dict[str, str]] = {}
+
+        for category in CATEGORIES:
+            for item in _field(content, category) or []:
+                entry = (category, item)
+                item_id = _field(item, "id")
+                if item_id:
+                    # The same id can be used in several categories, the first one is kept for lookups without a category.
+                    self._by_id.setdefault(item_id.lower(), entry)
+                    self._by_category[(category, item_id.lower())] = item
+                asset_path = _field(item, "assetPath")
+                if asset_path:
+                    self._by_asset_path.setdefault(asset_path.lower(), entry)
+
+        acts = _field(content, "acts") or []
+        self.active_act: Optional[Item] = next((act for act in acts if _field(act, "isActive") and (_field(act, "type") or "act").lower() == "act"), None)
+        """The act currently in progress, None if the content has no active act."""
+        parent = _field(self.active_act, "parentId") if self.active_act is not None else None
+        episode = self._by_id.get(parent.lower()) if parent else None
+        self.active_episode: Optional[Item] = episode[1] if episode else next((act for act in acts if _field(act, "isActive") and (_field(act, "type") or "").lower() == "episode"), None)
+        """The episode currently in progress, None if the content has no active episode."""
+
+    @classmethod
+    def for_content(cls, content: Union[ContentDto, Dict[str, Any]], locale: Optional[str] = None) -> "ContentIndex":
+        """Return the index of ``content``, reusing the one built for the same version and locale if there is one.
+
+        :param content: The content, as a ContentDto or raw dict.
+        :type content: Union[ContentDto, Dict]
+        :param locale: The locale the content was requested in, None if it was requested without one. Defaults to None.
+        :type locale: str, optional
+        :rtype: ContentIndex
+        """
+        # Raw and decoded content get separate indexes, so items come back in the form they went in.
+        key = (_field(content, "version"), normalize_locale(locale) if locale else None, isinstance(content, dict))
+        index = cls._cache.get(key)
+        if index is None:
+            index = cls._cache[key] = cls(content, locale)
+            while len(cls._cache) > cls.cache_size:
+                cls._cache.popitem(last=False)
+        else:
+            cls._cache.move_to_end(key)
+        return index
+
+    @classmethod
+    def clear_cache(cls):
+        """Forget every index kept by :meth:`for_content` and :meth:`fetch`."""
+        cls._cache.clear()
+
+    @classmethod
+    async def fetch(cls, client, region: str, locale: Optional[str] = None, deadline: Optional[float] = None) -> "ContentIndex":
+        """Request the content and return its index, reusing the index of the same version if there is one.
+
+        :param client: The client to request the content with.
+        :type client: valaw.Client
+        :param region: The region to execute against.
+        :type region: str
+        :param locale: The locale to request the content in, defaults to None (every locale).
+        :type locale: str, optional
+        :param deadline: The overall time limit in seconds, defaults to the client deadline.
+        :type deadline: float, optional
+        :rtype: ContentIndex
+        :raises InvalidRegion: If the provided region is invalid.
+        :raises InvalidLocale: If the provided locale is invalid.
+        :raises RiotAPIResponseError: If the API response indicates an error.
+        """
+        content = await client.GET_getContent(region, locale or "", deadline=deadline)
+        if isinstance(content, bytes):
+            content = client.json_loads(content)
+        return cls.for_content(content, locale)
+
+    def __len__(self) -> int:
+        return len(self._by_category)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id.lower() in self._by_id
+
+    def __iter__(self) -> Iterator[Item]:
+        return iter(self._by_category.values())
+
+    def get(self, item_id: str, category: Optional[str] = None) -> Optional[Item]:
+        """Return the item with an id, from any category unless ``category`` is given.
+
+        :param item_id: The id, in any case.
+        :type item_id: str
+        :param category: Only look in this list of ContentDto, e.g. "characters".
+        :type category: str, optional
+        :return: The ContentItemDto, ActDto or raw dict, None if there is no such item.
+        """
+        if category is not None:
+            return self._by_category.get((category, item_id.lower()))
+        entry = self._by_id.get(item_id.lower())
+        return entry[1] if entry else None
+
+    def category(self, item_id: str) -> Optional[str]:
+        """Return the list of ContentDto an id belongs to, e.g. "maps", None if there is no such item.
+
+        For an id found in several lists, the first of them in CATEGORIES order is returned.
+        """
+        entry = self._by_id.get(item_id.lower())
+        return entry[0] if entry else None
+
+    def categories(self, item_id: str) -> List[str]:
+        """Return every list of ContentDto an id belongs to, in CATEGORIES order."""
+        key = item_id.lower()
+        return [category for category in CATEGORIES if (category, key) in self._by_category]
+
+    def by_asset_path(self, asset_path: str) -> Optional[Item]:
+        """Return the item with an asset path, such as the ``mapId`` of a match, None if there is no such item."""
+        entry = self._by_asset_path.get(asset_path.lower())
+        return entry[1] if entry else None
+
+    def names(self, locale: str) -> Dict[str, str]:
+        """Return a dict of lowercase id to the name of every item in ``locale``.
+
+        The dict is built the first time a locale is asked for and reused after that.
+        Items without a name in that locale fall back to their default name.
+
+        :param locale: The locale, e.g. "fr-FR".
+        :type locale: str
+        :rtype: Dict[str, str]
+        :raises InvalidLocale: If the locale is invalid.
+        """
+        locale = normalize_locale(locale)
+        projection = self._projections.get(locale)
+        if projection is None:
+            projection = self._projections[locale] = {
+                item_id: (self._name(item, locale) or "") for item_id, (_, item) in self._by_id.items()
+            }
+        return projection
+
+    def _name(self, item: Item, locale: Optional[str]) -> Optional[str]:
+        if locale is None or locale == self.locale:
+            return _field(item, "name")
+        return _localized(item, locale) or _field(item, "name")
+
+    def name(self, item_id: str, locale: Optional[str] = None) -> Optional[str]:
+        """Return the name of the item with an id, or of the item with that asset path.
+
+        :param item_id: The id in any case, or an asset path such as the ``mapId`` of a match.
+        :type item_id: str
+        :param locale: The locale of the name, defaults to None (the default name).
+        :type locale: str, optional
+        :return: The name, None if there is no such item.
+        :rtype: Optional[str]
+        :raises InvalidLocale: If the locale is invalid.
+        """
+        key = item_id.lower()
+        if locale is not None:
+            name = self.names(locale).get(key)
+            if name is not None:
+                return name
+        entry = self._by_id.get(key) or self._by_asset_path.get(key)
+        if entry is None:
+            return None
+        return self._name(entry[1], normalize_locale(locale) if locale else None)
+
+    def items(self, category: str) -> List[Item]:
+        """Return every item of a list of ContentDto, e.g. "characters".
+
+        :raises ValueError: If the category is not one of CATEGORIES.
+        """
+        if category not in CATEGORIES:
+            raise ValueError(f"Invalid category, valid categories are: {', '.join(CATEGORIES)}.")
+        return list(_field(self.content, category) or [])
+
+### Content Manager ###
+class ContentManager:
+    """Keeps the content of a region up to date, downloading the whole catalog only after a patch.
+
+    :meth:`refresh` first requests the content in a single locale, which is a fraction of
+    the size of the every-locale catalog and is not decoded into objects, and compares its
+    ``version`` with the one held. Only when it changed is the rest downloaded and a new
+    ContentIndex built. The API has no version-only endpoint, so this is the cheapest
+    check available.
+
+    With ``locales``, each locale is requested separately and in parallel, and the
+    results are merged into one catalog whose items carry localizedNames for just those
+    locales. The content is kept as a raw dict, and with ``path`` also in a JSON file,
+    so a restart does not need to download it again.
+
+    :param client: The client to request the content with.
+    :type client: valaw.Client
+    :param region: The region to execute against.
+    :type region: str
+    :param locales: The locales needed, defaults to None (one request for every locale).
+    :type locales: Iterable[str], optional
+    :param path: A JSON file the content is kept in, defaults to None (memory only).
+    :type path: str, optional
+    :param check_locale: The locale of the version check when ``locales`` is not given, defaults to "en-US".
+    :type check_locale: str
+    :raises InvalidRegion: If the provided region is invalid.
+    :raises InvalidLocale: If a locale is invalid.
+    """
+
+    def __init__(self, client, region: str, locales: Optional[Iterable[str]] = None, path: Optional[str] = None, check_locale: str = "en-US"):
+        validate_region(region)
+        self.client = client
+        self.region = region
+        self.locales: Optional[List[str]] = list(dict.fromkeys(normalize_locale(locale) for locale in locales)) if locales else None
+        self.path = path
+        self.check_locale = normalize_locale(check_locale)
+        self.content: Optional[Dict[str, Any]] = None
+        """The raw content held, None until it is loaded."""
+        self.index: Optional[ContentIndex] = None
+        """The index of the content held, None until it is loaded."""
+        self.checked_at: Optional[float] = None
+        """When the version was last checked, as a time.time() value."""
+        self._refreshing: Optional[asyncio.Future] = None
+
+    @property
+    def version(self) -> Optional[str]:
+        """The version of the content held, None until it is loaded."""
+        return self.content.get("version") if self.content is not None else None
+
+    async def load(self, deadline: Optional[float] = None) -> ContentIndex:
+        """Return the index of the content, reading it from ``path`` or downloading it if it is not held yet.
+
+        Content read from disk is returned without checking its version, call :meth:`refresh` for that.
+
+        :param deadline: The time limit in seconds of each request, defaults to the client deadline.
+        :type deadline: float, optional
+        :rtype: ContentIndex
+        """
+        if self.index is None and self.path is not None:
+            self._read()
+        if self.index is None:
+            await self.refresh(deadline=deadline)
+        return self.index
+
+    async def refresh(self, force: bool = False, deadline: Optional[float] = None) -> bool:
+        """Check the content version, and download and index the content if it changed.
+
+        Concurrent calls share one check. A client cache delays changes by up to its
+        GET_getContent TTL.
+
+        :param force: Whether or not to download the content even if the version is unchanged, defaults to False.
+        :type force: bool
+        :param deadline: The time limit in seconds of each request, defaults to the client deadline.
+        :type deadline: float, optional
+        :return: Whether or not the content changed. False if the locales kept disagreeing on the version, the content is then kept until the next call.
+        :rtype: bool
+        :raises RiotAPIResponseError: If the API response indicates an error.
+        """
+        if self._refreshing is None:
+            self._refreshing = asyncio.ensure_future(self._refresh(force, deadline))
+            self._refreshing.add_done_callback(self._forget_refresh)
+        return await asyncio.shield(self._refreshing)
+
+    def _forget_refresh(self, task: asyncio.Future):
+        self._refreshing = None
+        if not task.cancelled():
+            task.exception()
+
+    async def _get(self, locale: str, deadline: Optional[float]) -> Dict[str, Any]:
+        content = await self.client._content(self.region, locale, deadline)
+        return self.client.json_loads(content) if isinstance(content, bytes) else content
+
+    async def _refresh(self, force: bool, deadline: Optional[float]) -> bool:
+        probe_locale = self.locales[0] if self.locales else self.check_locale
+        probe = await self._get(probe_locale, deadline)
+        self.checked_at = time.time()
+        if not force and self.content is not None and probe.get("version") == self.version:
+            return False
+
+        if self.locales is None:
+            content = await self._get("", deadline)
+        else:
+            contents = {probe_locale: probe}
+            for _ in range(3):
+                missing = [locale for locale in self.locales if locale not in contents]
+                contents.update(zip(missing, await asyncio.gather(*(self._get(locale, deadline) for locale in missing))))
+                newest = max((page.get("version") for page in contents.values()), key=version_key)
+                if all(page.get("version") == newest for page in contents.values()):
+                    break
+                # A patch landed between the requests, request the locales still on the old version again.
+                contents = {locale: page for locale, page in contents.items() if page.get("version") == newest}
+            else:
+                # Some locales are still served at an older version, keep the current content until the next check.
+                return False
+            content = merge_locales({locale: contents[locale] for locale in self.locales})
+
+        self._set(content)
+        if self.path is not None:
+            self._write()
+        return True
+
+    def _set(self, content: Dict[str, Any]):
+        self.content = content
+        self.index = ContentIndex(content)
+
+    def _read(self):
+        try:
+            with open(self.path, "rb") as f:
+                saved = self.client.json_loads(f.read())
+        except FileNotFoundError:
+            return
+        if saved.get("region") == self.region and saved.get("locales") == self.locales:
+            self._set(saved["content"])
+
+    def _write(self):
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "w") as f:
+            json.dump({"region": self.region, "locales": self.locales, "content": self.content}, f)
+        os.replace(temporary, self.path)
+
+    async def run(self, interval: float = 600.0, on_change: Optional[Callable[[ContentIndex], Optional[Awaitable[None]]]] = None):
+        """Check the content version every ``interval`` seconds forever.
+
+        Failed checks are retried at the next interval.
+
+        :param interval: The time between two checks in seconds, defaults to 600.
+        :type interval: float
+        :param on_change: Called with the new index whenever the content changes, may be a coroutine function.
+        :type on_change: Callable[[ContentIndex], None], optional
+        """
+        await self.load()
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                changed = await self.refresh()
+            except (Exceptions.RiotAPIResponseError, Exceptions.DeadlineExceeded, Exceptions.CircuitOpen, Exceptions.FailedToParseJSON, OSError, asyncio.TimeoutError):
+                continue
+            if changed and on_change is not None:
+                result = on_change(self.index)
+                if asyncio.iscoroutine(result):
+                    await result
@@ -0,0 +1,374 @@
+### Imports ###
+import asyncio
+import copy
+import hashlib
+import heapq
+import itertools
+import json
+import math
+import os
+import time
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from .client import Exceptions, validate_region
+from .objects import MatchDto
+
+### Bloom Filter ###
+class BloomFilter:
+    """A fixed-size set of strings that answers membership with a bounded false positive rate.
+
+    Never reports a present string as absent. Uses about 1.2 bytes per item at a 1% error
+    rate, whatever the length of the items.
+
+    :param capacity: The number of items the filter is sized for.
+    :type capacity: int
+    :param error_rate: The false positive rate once ``capacity`` items are added, defaults to 0.001.
+    :type error_rate: float
+    :raises ValueError: If the capacity is less than 1 or the error rate is not between 0 and 1.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        if capacity < 1:
+            raise ValueError("Invalid capacity, must be at least 1.")
+        if not 0 < error_rate < 1:
+            raise ValueError("Invalid error_rate, must be between 0 and 1.")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _positions(self, item: str) -> List[int]:
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+        return [(first + i * second) % self.size for i in range(self.hashes)]
+
+    def __contains__(self, item: str) -> bool:
+        bits = self._bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    def add(self, item: str) -> bool:
+        """Add an item and return whether it was absent before.
+
+        :param item: The item to add.
+        :type item: str
+        :rtype: bool
+        """
+        bits = self._bits
+        added = False
+        for position in self._positions(item):
+            mask = 1 << (position & 7)
+            if not bits[position >> 3] & mask:
+                bits[position >> 3] |= mask
+                added = True
+        self.count += added
+        return added
+
+    def copy(self) -> "BloomFilter":
+        """Return an independent copy of the filter."""
+        bloom = copy.copy(self)
+        bloom._bits = self._bits.copy()
+        return bloom
+
+    def save(self, path: str):
+        """Write the filter to a file."""
+        header = json.dumps({"capacity": self.capacity, "error_rate": self.error_rate, "count": self.count}).encode()
+        with open(path, "wb") as file:
+            file.write(len(header).to_bytes(4, "little"))
+            file.write(header)
+            file.write(self._bits)
+
+    @classmethod
+    def load(cls, path: str) -> "BloomFilter":
+        """Read a filter written by save."""
+        with open(path, "rb") as file:
+            header = json.loads(file.read(int.from_bytes(file.read(4), "little")))
+            bloom = cls(header["capacity"], header["error_rate"])
+            bloom.count = header["count"]
+            file.readinto(bloom._bits)
+        return bloom
+
+### Helper Functions ###
+def _parse(client, response: Any) -> Any:
+    return client.json_loads(response) if isinstance(response, bytes) else response
+
+def _get(data: Any, name: str) -> Any:
+    return data.get(name) if isinstance(data, dict) else getattr(data, name)
+
+def _write_atomic(path: str, write: Callable[[str], None]):
+    temporary = f"{path}.tmp"
+    write(temporary)
+    os.replace(temporary, path)
+
+### Crawler ###
+class Crawler:
+    """Grows a set of matches from seed players by following the players of each fetched match.
+
+    Players wait in a priority frontier, lowest priority first. The default priority is the
+    distance from the seeds, which makes the crawl breadth-first. Each player's matchlist is
+    requested and every match not seen before is fetched, then the players of that match
+    are added to the frontier. Seen players and matches are tracked with Bloom filters, so
+    memory stays bounded however long the crawl runs; a false positive skips a player or
+    match that was not actually seen, at the configured error rate.
+
+    :param client: The client to crawl with. Give it a MatchStore to keep the fetched matches.
+    :type client: valaw.Client
+    :param region: The region to execute against.
+    :type region: str
+    :param seeds: The puuids to start from.
+    :type seeds: Iterable[str]
+    :param concurrency: The number of players expanded at once, defaults to 10.
+    :type concurrency: int
+    :param max_matches: Stop after this many matches were fetched, defaults to None (no limit).
+    :type max_matches: int, optional
+    :param max_depth: Do not follow players further than this many matches away from the seeds, defaults to None (no limit).
+    :type max_depth: int, optional
+    :param queues: Only fetch matches from these queue ids, defaults to None (every queue).
+    :type queues: Iterable[str], optional
+    :param priority: Called with (puuid, depth) to order the frontier, lower values are expanded first. Defaults to the depth.
+    :type priority: Callable[[str, int], float], optional
+    :param frontier_size: The maximum number of players waiting in the frontier, players found while it is full are dropped. Defaults to 100000.
+    :type frontier_size: int
+    :param expected_players: The number of players the player filter is sized for, defaults to 10000000.
+    :type expected_players: int
+    :param expected_matches: The number of matches the match filter is sized for, defaults to 10000000.
+    :type expected_matches: int
+    :param error_rate: The false positive rate of both filters at their expected size, defaults to 0.001.
+    :type error_rate: float
+    :param checkpoint: A directory the crawl state is saved to, and resumed from if it already holds a checkpoint, in which case the saved filters are used instead of new ones. Defaults to None.
+    :type checkpoint: str, optional
+    :param checkpoint_interval: The time between two checkpoints in seconds, defaults to 60.
+    :type checkpoint_interval: float
+    :raises InvalidRegion: If the provided region is invalid.
+    :raises ValueError: If the concurrency or frontier size is less than 1.
+    """
+
+    def __init__(self, client, region: str, seeds: Iterable[str] = (), concurrency: int = 10, max_matches: Optional[int] = None, max_depth: Optional[int] = None, queues: Optional[Iterable[str]] = None, priority: Optional[Callable[[str, int], float]] = None, frontier_size: int = 100000, expected_players: int = 10000000, expected_matches: int = 10000000, error_rate: float = 0.001, checkpoint: Optional[str] = None, checkpoint_interval: float = 60.0):
+        validate_region(region)
+        if concurrency < 1:
+            raise ValueError("Invalid concurrency, must be at least 1.")
+        if frontier_size < 1:
+            raise ValueError("Invalid frontier_size, must be at least 1.")
+
+        self.client = client
+        self.region = region
+        self.concurrency = concurrency
+        self.max_matches = max_matches
+        self.max_depth = max_depth
+        self.queues = set(queues) if queues is not None else None
+        self.priority = priority or (lambda puuid, depth: depth)
+        self.frontier_size = frontier_size
+        self.checkpoint = checkpoint
+        self.checkpoint_interval = checkpoint_interval
+        self.stats = {"players": 0, "matches": 0, "errors": 0, "dropped": 0}
+        """Counters of expanded players, fetched matches, failed requests and players dropped from a full frontier."""
+
+        self._frontier: List[Tuple[float, int, str, int]] = []
+        self._counter = itertools.count()
+        self._expanding: Dict[str, int] = {}
+        self._pending: Dict[str, int] = {}
+        self._resumed: List[Tuple[str, int]] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        if checkpoint is not None and os.path.exists(os.path.join(checkpoint, "crawler.json")):
+            self._restore()
+        else:
+            self.players = BloomFilter(expected_players, error_rate)
+            self.matches = BloomFilter(expected_matches, error_rate)
+        for puuid in seeds:
+            self.add(puuid)
+
+    def __len__(self) -> int:
+        """The number of players waiting in the frontier."""
+        return len(self._frontier)
+
+    def add(self, puuid: str, depth: int = 0) -> bool:
+        """Add a player to the frontier unless they were already seen or the frontier is full.
+
+        :param puuid: The player's puuid.
+        :type puuid: str
+        :param depth: The distance from the seeds, defaults to 0.
+        :type depth: int
+        :return: Whether or not the player was added.
+        :rtype: bool
+        """
+        if not puuid or puuid in self.players:
+            return False
+        if len(self._frontier) >= self.frontier_size:
+            self.stats["dropped"] += 1
+            return False
+        self.players.add(puuid)
+        heapq.heappush(self._frontier, (self.priority(puuid, depth), next(self._counter), puuid, depth))
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return True
+
+    async def _expand(self, puuid: str, depth: int, results: asyncio.Queue):
+        client = self.client
+        try:
+            matchlist = _parse(client, await client.GET_getMatchlist(puuid, self.region))
+        except Exception:
+            self.stats["errors"] += 1
+            return
+        self.stats["players"] += 1
+
+        for entry in _get(matchlist, "history") or []:
+            matchId = _get(entry, "matchId")
+            if self.queues is not None and _get(entry, "queueId") not in self.queues:
+                continue
+            if matchId in self._pending or matchId in self.matches:
+                continue
+            await self._fetch(matchId, depth, results)
+
+    async def _fetch(self, matchId: str, depth: int, results: asyncio.Queue):
+        # The match stays pending until the consumer has taken it, crawl() then marks it as seen.
+        client = self.client
+        self._pending[matchId] = depth
+        try:
+            match = await client.GET_getMatch(matchId, self.region)
+        except Exception as exc:
+            del self._pending[matchId]
+            self.stats["errors"] += 1
+            if isinstance(exc, Exceptions.RiotAPIResponseError) and exc.status_code == 404:
+                self.matches.add(matchId)
+            return
+        self.stats["matches"] += 1
+        await results.put((matchId, match))
+
+        if self.max_depth is None or depth < self.max_depth:
+            for player in _get(_parse(client, match), "players") or []:
+                self.add(_get(player, "puuid"), depth + 1)
+
+    async def crawl(self) -> AsyncIterator[Tuple[str, Union[MatchDto, Dict[str, Any]]]]:
+        """Run the crawl, yielding every fetched match as soon as it arrives.
+
+        The crawl ends when ``max_matches`` matches were fetched or no player is left to expand.
+        Breaking out of the loop stops it early. With a checkpoint directory, the state is saved
+        every ``checkpoint_interval`` seconds and when the crawl stops, from a worker thread.
+        A match is only marked as seen once the loop asks for the next one, matches fetched but
+        not yet handled are saved with the checkpoint and fetched again when it is resumed.
+
+        Failed requests are counted and skipped, any other error raised while expanding a player,
+        such as from ``priority``, stops the crawl and is raised here.
+
+        :return: An async iterator of (matchId, match) tuples.
+        :rtype: AsyncIterator[Tuple[str, Union[MatchDto, Dict]]]
+        """
+        results: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency)
+        wakeup = self._wakeup = asyncio.Event()
+        done = object()
+        refetching = 0
+        self._resumed.extend(self._pending.items())
+        self._pending.clear()
+
+        async def worker():
+            nonlocal refetching
+            # The consumer waits for one item per worker, so an error is handed over in place of done.
+            item = done
+            try:
+                while True:
+                    if self._resumed:
+                        # Matches that were fetched but not yielded when the crawl last stopped come first.
+                        matchId, depth = self._resumed.pop()
+                        refetching += 1
+                        try:
+                            await self._fetch(matchId, depth, results)
+                        finally:
+                            refetching -= 1
+                            wakeup.set()
+                    elif self._frontier:
+                        entry = heapq.heappop(self._frontier)
+                        _, _, puuid, depth = entry
+                        self._expanding[puuid] = depth
+                        try:
+                            await self._expand(puuid, depth, results)
+                        except BaseException:
+                            # Expand the player again when the crawl is resumed.
+                            heapq.heappush(self._frontier, entry)
+                            raise
+                        finally:
+                            del self._expanding[puuid]
+                            wakeup.set()
+                    elif self._expanding or refetching:
+                        # Players and matches being fetched may still add to the frontier.
+                        wakeup.clear()
+                        await wakeup.wait()
+                    else:
+                        break
+            except Exception as exc:
+                item = exc
+            wakeup.set()
+            await results.put(item)
+
+        workers = [asyncio.ensure_future(worker()) for _ in range(self.concurrency)]
+        saved = time.monotonic()
+        fetched = 0
+        try:
+            remaining = len(workers)
+            while remaining:
+                item = await results.get()
+                if item is done:
+                    remaining -= 1
+                    continue
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+                matchId = item[0]
+                self.matches.add(matchId)
+                self._pending.pop(matchId, None)
+                fetched += 1
+                if self.max_matches is not None and fetched >= self.max_matches:
+                    break
+                if self.checkpoint is not None and time.monotonic() - saved >= self.checkpoint_interval:
+                    await asyncio.to_thread(self._snapshot())
+                    saved = time.monotonic()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            self._wakeup = None
+            if self.checkpoint is not None:
+                await asyncio.to_thread(self._snapshot())
+
+    def save(self):
+        """Write the crawl state to the checkpoint directory.
+
+        Players that were being expanded are put back in the frontier, and matches that were
+        fetched but not yet yielded are saved to be fetched again, so nothing is lost if the
+        process stops before the next checkpoint.
+        """
+        self._snapshot()()
+
+    def _snapshot(self) -> Callable[[], None]:
+        # Copy the state now and return the writes, which can run in another thread while the crawl goes on.
+        checkpoint = self.checkpoint
+        frontier = [[puuid, depth] for _, _, puuid, depth in sorted(self._frontier)]
+        frontier[:0] = [[puuid, depth] for puuid, depth in self._expanding.items()]
+        pending = [[matchId, depth] for matchId, depth in itertools.chain(self._resumed, self._pending.items())]
+        state = {"stats": dict(self.stats), "frontier": frontier, "pending": pending}
+        players, matches = self.players.copy(), self.matches.copy()
+
+        def write(path: str):
+            with open(path, "w") as file:
+                json.dump(state, file)
+
+        def save():
+            os.makedirs(checkpoint, exist_ok=True)
+            _write_atomic(os.path.join(checkpoint, "players.bloom"), players.save)
+            _write_atomic(os.path.join(checkpoint, "matches.bloom"), matches.save)
+            _write_atomic(os.path.join(checkpoint, "crawler.json"), write)
+
+        return save
+
+    def _restore(self):
+        with open(os.path.join(self.checkpoint, "crawler.json")) as file:
+            state = json.load(file)
+        self.players = BloomFilter.load(os.path.join(self.checkpoint, "players.bloom"))
+        self.matches = BloomFilter.load(os.path.join(self.checkpoint, "matches.bloom"))
+        self.stats.update(state["stats"])
+        self._resumed = [(matchId, depth) for matchId, depth in state.get("pending", [])]
+        for puuid, depth in state["frontier"]:
+            heapq.heappush(self._frontier, (self.priority(puuid, depth), next(self._counter), puuid, depth))
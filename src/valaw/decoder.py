@@ -0,0 +1,226 @@
+### Imports ###
+import dataclasses
+import typing
+from typing import Any, Callable, Dict, Type, TypeVar, Union
+
+from dataclass_wizard import fromdict
+
+T = TypeVar("T")
+
+### Decoder Compilation ###
+class _Mismatch(Exception):
+    """Raised by compiled decoders when the data does not have the expected shape."""
+
+_MISSING = object()
+_decoders: Dict[type, Callable[[Any], Any]] = {}
+
+def _as_float(value):
+    if type(value) is float:
+        return value
+    if type(value) is int:
+        return float(value)
+    raise _Mismatch
+
+_PRIMITIVES = {str: "str", int: "int", bool: "bool", dict: "dict"}
+_NULL_DEFAULTS = {str: "", int: 0, bool: False}
+
+class _Compiler:
+    """Generates the source of a decoder function for a dataclass."""
+
+    def __init__(self, cls: type):
+        self.cls = cls
+        self.namespace: Dict[str, Any] = {
+            "_MISSING": _MISSING,
+            "_Mismatch": _Mismatch,
+            "_as_float": _as_float,
+            "cls": cls,
+        }
+        self.lines = []
+        self.counter = 0
+
+    def _temp(self) -> str:
+        self.counter += 1
+        return f"v{self.counter}"
+
+    def _expr(self, hint: Any, value: str, indent: str) -> str:
+        """Emit statements converting ``value`` to ``hint`` and return the resulting expression."""
+        origin = typing.get_origin(hint)
+        args = typing.get_args(hint)
+
+        if origin is Union:
+            inner = [arg for arg in args if arg is not type(None)]
+            if len(inner) != 1:
+                raise TypeError(f"Unsupported union {hint!r} in {self.cls.__name__}.")
+            out = self._temp()
+            self.lines.append(f"{indent}if {value} is None:")
+            self.lines.append(f"{indent}    {out} = None")
+            self.lines.append(f"{indent}else:")
+            self.lines.append(f"{indent}    {out} = {self._expr(inner[0], value, indent + '    ')}")
+            return out
+
+        if origin in (list, typing.List):
+            item = args[0] if args else Any
+            self.lines.append(f"{indent}if type({value}) is not list:")
+            self.lines.append(f"{indent}    raise _Mismatch")
+            if item is str:
+                self.lines.append(f"{indent}for item in {value}:")
+                self.lines.append(f"{indent}    if type(item) is not str:")
+                self.lines.append(f"{indent}        raise _Mismatch")
+                return f"[strings.setdefault(item, item) for item in {value}]"
+            if dataclasses.is_dataclass(item):
+                decoder = self._decoder_name(item)
+                return f"[{decoder}(item, strings) for item in {value}]"
+            if item is Any:
+                return f"list({value})"
+            raise TypeError(f"Unsupported list item {item!r} in {self.cls.__name__}.")
+
+        if dataclasses.is_dataclass(hint):
+            return f"{self._decoder_name(hint)}({value}, strings)"
+
+        if hint is float:
+            return f"_as_float({value})"
+
+        if hint in _PRIMITIVES:
+            self.lines.append(f"{indent}if type({value}) is not {_PRIMITIVES[hint]}:")
+            if hint in _NULL_DEFAULTS:
+                # fromdict turns nulls into the zero value of the field type.
+                self.lines.append(f"{indent}    if {value} is not None:")
+                self.lines.append(f"{indent}        raise _Mismatch")
+                self.lines.append(f"{indent}    {value} = {_NULL_DEFAULTS[hint]!r}")
+            else:
+                self.lines.append(f"{indent}    raise _Mismatch")
+            if hint is str:
+                # Ids such as puuids repeat across every kill and location, keep one copy of each per payload.
+                return f"strings.setdefault({value}, {value})"
+            return value
+
+        if hint is Any:
+            return value
+
+        raise TypeError(f"Unsupported type {hint!r} in {self.cls.__name__}.")
+
+    def _lookup(self, name: str, value: str, indent: str):
+        """Emit a lookup of ``name``, also accepting the hyphenated key used by locale names."""
+        self.lines.append(f"{indent}{value} = data.get({name!r}, _MISSING)")
+        if "_" in name:
+            self.lines.append(f"{indent}if {value} is _MISSING:")
+            self.lines.append(f"{indent}    {value} = data.get({name.replace('_', '-')!r}, _MISSING)")
+
+    def _decoder_name(self, cls: type) -> str:
+        name = f"decode_{cls.__name__}"
+        self.namespace[name] = _compile(cls)
+        return name
+
+    def _direct(self) -> bool:
+        """Whether instances can be built by setting their slots, skipping a frozen __init__."""
+        cls = self.cls
+        return (
+            cls.__dataclass_params__.frozen
+            and "__slots__" in cls.__dict__
+            and not hasattr(cls, "__post_init__")
+            and all(field.init and field.default_factory is dataclasses.MISSING for field in dataclasses.fields(cls))
+        )
+
+    def compile(self) -> Callable[[Any], Any]:
+        hints = typing.get_type_hints(self.cls)
+        direct = self._direct()
+        self.lines.append("def decode(data, strings):")
+        self.lines.append("    try:")
+        indent = "        "
+        positional = []
+        optional = False
+        for field in dataclasses.fields(self.cls):
+            if not field.init:
+                continue
+            value = self._temp()
+            if field.default is not dataclasses.MISSING or field.default_factory is not dataclasses.MISSING:
+                self._lookup(field.name, value, indent)
+                if direct:
+                    self.namespace[f"default_{field.name}"] = field.default
+                    self.lines.append(f"{indent}if {value} is _MISSING:")
+                    self.lines.append(f"{indent}    {value} = default_{field.name}")
+                    self.lines.append(f"{indent}else:")
+                    converted = self._expr(hints[field.name], value, indent + "    ")
+                    self.lines.append(f"{indent}    {value} = {converted}")
+                    positional.append((field.name, value))
+                    continue
+                # Leave missing keys out so the dataclass applies its own default.
+                if not optional:
+                    self.lines.insert(2, f"{indent}kwargs = {{}}")
+                    optional = True
+                self.lines.append(f"{indent}if {value} is not _MISSING:")
+                converted = self._expr(hints[field.name], value, indent + "    ")
+                self.lines.append(f"{indent}    kwargs[{field.name!r}] = {converted}")
+            elif "_" in field.name:
+                self._lookup(field.name, value, indent)
+                self.lines.append(f"{indent}if {value} is _MISSING:")
+                self.lines.append(f"{indent}    raise _Mismatch")
+                positional.append((field.name, self._expr(hints[field.name], value, indent)))
+            else:
+                self.lines.append(f"{indent}{value} = data[{field.name!r}]")
+                positional.append((field.name, self._expr(hints[field.name], value, indent)))
+
+        if direct:
+            self.namespace["_new"] = object.__new__
+            self.lines.append(f"{indent}obj = _new(cls)")
+            for name, expr in positional:
+                self.namespace[f"set_{name}"] = getattr(self.cls, name).__set__
+                self.lines.append(f"{indent}set_{name}(obj, {expr})")
+            self.lines.append(f"{indent}return obj")
+        else:
+            arguments = ", ".join([expr for _, expr in positional] + (["**kwargs"] if optional else []))
+            self.lines.append(f"{indent}return cls({arguments})")
+        self.lines.append("    except (KeyError, TypeError):")
+        self.lines.append("        raise _Mismatch from None")
+
+        source = "\n".join(self.lines)
+        exec(compile(source, f"<valaw decoder for {self.cls.__name__}>", "exec"), self.namespace)
+        decode = self.namespace["decode"]
+        decode.__source__ = source
+        return decode
+
+def _compile(cls: type) -> Callable[[Any], Any]:
+    decoder = _decoders.get(cls)
+    if decoder is None:
+        decoder = _decoders[cls] = _Compiler(cls).compile()
+    return decoder
+
+### Public API ###
+def compile_decoder(cls: Type[T]) -> Callable[[Dict[str, Any]], T]:
+    """Build a decoder specialized for the dataclass ``cls``.
+
+    The decoder is generated once per class and returns the same objects as
+    ``dataclass_wizard.fromdict``. Data that does not have the exact shape
+    described by the dataclass annotations is handed to ``fromdict`` instead.
+    Equal strings within one payload, such as the puuids repeated in every
+    kill, share a single string object.
+
+    :param cls: The dataclass to build a decoder for.
+    :type cls: type
+    :return: A function converting a dict into an instance of ``cls``.
+    :raises TypeError: If a field uses a type the decoder does not support.
+    """
+    fast = _compile(cls)
+
+    def decode(data: Dict[str, Any]) -> T:
+        try:
+            return fast(data, {})
+        except _Mismatch:
+            return fromdict(cls, data)
+
+    decode.__wrapped__ = fast
+    return decode
+
+def decode(cls: Type[T], data: Dict[str, Any]) -> T:
+    """Convert a dict into an instance of the dataclass ``cls`` using a compiled decoder.
+
+    :param cls: The dataclass to convert to.
+    :type cls: type
+    :param data: The raw JSON data.
+    :type data: Dict[str, Any]
+    :rtype: T
+    """
+    try:
+        return _compile(cls)(data, {})
+    except _Mismatch:
+        return fromdict(cls, data)
@@ -0,0 +1,278 @@
+### Imports ###
+import os
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from .objects import MatchDto
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+### Constants ###
+STRING = "string"
+INT = "int"
+BOOL = "bool"
+STRINGS = "strings"
+
+TABLES: Dict[str, Tuple[Tuple[str, str], ...]] = {
+    "matches": (
+        ("matchId", STRING), ("mapId", STRING), ("gameLengthMillis", INT), ("gameStartMillis", INT),
+        ("provisioningFlowId", STRING), ("isCompleted", BOOL), ("customGameName", STRING), ("queueId", STRING),
+        ("gameMode", STRING), ("isRanked", BOOL), ("seasonId", STRING),
+    ),
+    "players": (
+        ("matchId", STRING), ("puuid", STRING), ("gameName", STRING), ("tagLine", STRING), ("teamId", STRING),
+        ("partyId", STRING), ("characterId", STRING), ("competitiveTier", INT), ("isObserver", BOOL),
+        ("playerCard", STRING), ("playerTitle", STRING), ("accountLevel", INT), ("score", INT), ("roundsPlayed", INT),
+        ("kills", INT), ("deaths", INT), ("assists", INT), ("playtimeMillis", INT),
+    ),
+    "rounds": (
+        ("matchId", STRING), ("roundNum", INT), ("roundResult", STRING), ("roundCeremony", STRING),
+        ("winningTeam", STRING), ("bombPlanter", STRING), ("bombDefuser", STRING), ("plantRoundTime", INT),
+        ("plantSite", STRING), ("defuseRoundTime", INT), ("roundResultCode", STRING),
+    ),
+    "kills": (
+        ("matchId", STRING), ("roundNum", INT), ("killer", STRING), ("victim", STRING),
+        ("timeSinceGameStartMillis", INT), ("timeSinceRoundStartMillis", INT), ("victimX", INT), ("victimY", INT),
+        ("damageType", STRING), ("damageItem", STRING), ("isSecondaryFireMode", BOOL), ("assistants", STRINGS),
+    ),
+    "damage": (
+        ("matchId", STRING), ("roundNum", INT), ("puuid", STRING), ("receiver", STRING),
+        ("damage", INT), ("legshots", INT), ("bodyshots", INT), ("headshots", INT),
+    ),
+    "economy": (
+        ("matchId", STRING), ("roundNum", INT), ("puuid", STRING), ("score", INT),
+        ("loadoutValue", INT), ("weapon", STRING), ("armor", STRING), ("remaining", INT), ("spent", INT),
+    ),
+}
+"""The columns and column types of every table. Rows are keyed by matchId, then roundNum and puuid where present."""
+FORMATS = {"parquet": ".parquet", "arrow": ".arrows"}
+"""The supported file formats and their file extensions."""
+
+_MATCH_FIELDS = tuple(name for name, _ in TABLES["matches"])
+_PLAYER_FIELDS = tuple(name for name, _ in TABLES["players"][1:12])
+_PLAYER_STATS_FIELDS = tuple(name for name, _ in TABLES["players"][12:])
+_ROUND_FIELDS = tuple(name for name, _ in TABLES["rounds"][2:])
+_DAMAGE_FIELDS = tuple(name for name, _ in TABLES["damage"][4:])
+_ECONOMY_FIELDS = tuple(name for name, _ in TABLES["economy"][4:])
+
+### Helper Functions ###
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("pyarrow is required for exporting matches, install it with: pip install valaw[arrow]")
+
+def _arrow_type(kind: str) -> "pa.DataType":
+    if kind == STRING:
+        return pa.dictionary(pa.int32(), pa.string())
+    if kind == INT:
+        return pa.int64()
+    if kind == BOOL:
+        return pa.bool_()
+    return pa.list_(pa.string())
+
+def schema(table: str) -> "pa.Schema":
+    """Return the Arrow schema of a table, with every string column dictionary-encoded.
+
+    :param table: A name in TABLES.
+    :type table: str
+    :rtype: pyarrow.Schema
+    """
+    _require_pyarrow()
+    return pa.schema([(name, _arrow_type(kind)) for name, kind in TABLES[table]])
+
+### Match Exporter ###
+class MatchExporter:
+    """Streams matches into columnar files, one file per table in TABLES.
+
+    Requires pyarrow. Matches are buffered as rows and written every ``batch_size``
+    matches, as one Parquet row group or Arrow record batch per table, so memory use
+    depends on the batch size and not on the number of matches exported. String
+    columns are dictionary-encoded, so repeated values such as puuids, maps and
+    weapons are stored once per batch.
+
+    Files are written as ``{table}{extension}.tmp`` and renamed when the exporter is
+    closed, so a file is never read while incomplete. Used as a context manager, the
+    files are discarded instead if the block raises.
+
+    :param directory: The directory the files are written to, created if missing.
+    :type directory: str
+    :param format: "parquet" for Parquet files, or "arrow" for Arrow IPC stream files. Defaults to "parquet".
+    :type format: str
+    :param batch_size: The number of matches buffered before they are written, defaults to 100.
+    :type batch_size: int
+    :param compression: The Parquet compression codec, defaults to "zstd".
+    :type compression: str
+    :param tables: The tables to write, defaults to None (every table in TABLES).
+    :type tables: Iterable[str], optional
+    :raises ValueError: If the format, batch size or a table is invalid.
+    """
+
+    def __init__(self, directory: str, format: str = "parquet", batch_size: int = 100, compression: str = "zstd", tables: Optional[Iterable[str]] = None):
+        _require_pyarrow()
+        if format not in FORMATS:
+            raise ValueError(f"Invalid format, valid formats are: {', '.join(FORMATS)}.")
+        if batch_size < 1:
+            raise ValueError("Invalid batch size, must be at least 1.")
+        self.tables = list(tables) if tables is not None else list(TABLES)
+        unknown = [table for table in self.tables if table not in TABLES]
+        if unknown:
+            raise ValueError(f"Unknown tables: {unknown}, valid tables are: {', '.join(TABLES)}.")
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.format = format
+        self.batch_size = batch_size
+        self.compression = compression
+        self.matches = 0
+        """The number of matches written."""
+        self.rows: Dict[str, int] = {table: 0 for table in self.tables}
+        """The number of rows written to each table."""
+        self._rows: Dict[str, List[tuple]] = {table: [] for table in TABLES}
+        self._buffered = 0
+        self._schemas = {table: schema(table) for table in self.tables}
+        self._writers: Dict[str, Any] = {}
+        self._closed = False
+
+    def path(self, table: str) -> str:
+        """Return the file a table is written to."""
+        return os.path.join(self.directory, f"{table}{FORMATS[self.format]}")
+
+    def write(self, match: Union[MatchDto, Dict[str, Any]]):
+        """Add a match, writing the buffered matches once there are ``batch_size`` of them.
+
+        :param match: A MatchDto or raw match dict.
+        :type match: Union[MatchDto, Dict]
+        :raises ValueError: If the exporter is closed.
+        """
+        if self._closed:
+            raise ValueError("The exporter is closed.")
+        # dict.get and getattr take the same arguments, so one function reads both raw dicts and objects.
+        get = dict.get if isinstance(match, dict) else getattr
+        info = get(match, "matchInfo")
+        matchId = get(info, "matchId")
+        rows = self._rows
+        rows["matches"].append(tuple(get(info, name) for name in _MATCH_FIELDS))
+
+        for player in get(match, "players") or ():
+            stats = get(player, "stats")
+            rows["players"].append((
+                matchId, *(get(player, name) for name in _PLAYER_FIELDS),
+                *((get(stats, name) for name in _PLAYER_STATS_FIELDS) if stats is not None else (None,) * len(_PLAYER_STATS_FIELDS)),
+            ))
+
+        kills, damage, economy = rows["kills"], rows["damage"], rows["economy"]
+        for roundResult in get(match, "roundResults") or ():
+            roundNum = get(roundResult, "roundNum")
+            rows["rounds"].append((matchId, roundNum, *(get(roundResult, name) for name in _ROUND_FIELDS)))
+            for stats in get(roundResult, "playerStats") or ():
+                puuid = get(stats, "puuid")
+                spending = get(stats, "economy")
+                economy.append((
+                    matchId, roundNum, puuid, get(stats, "score"),
+                    *((get(spending, name) for name in _ECONOMY_FIELDS) if spending is not None else (None,) * len(_ECONOMY_FIELDS)),
+                ))
+                for kill in get(stats, "kills") or ():
+                    location, finishing = get(kill, "victimLocation"), get(kill, "finishingDamage")
+                    kills.append((
+                        matchId, roundNum, get(kill, "killer"), get(kill, "victim"),
+                        get(kill, "timeSinceGameStartMillis"), get(kill, "timeSinceRoundStartMillis"),
+                        get(location, "x") if location is not None else None, get(location, "y") if location is not None else None,
+                        get(finishing, "damageType") if finishing is not None else None,
+                        get(finishing, "damageItem") if finishing is not None else None,
+                        get(finishing, "isSecondaryFireMode") if finishing is not None else None,
+                        get(kill, "assistants") or [],
+                    ))
+                for hit in get(stats, "damage") or ():
+                    damage.append((matchId, roundNum, puuid, get(hit, "receiver"), *(get(hit, name) for name in _DAMAGE_FIELDS)))
+
+        self._buffered += 1
+        if self._buffered >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Write the buffered matches."""
+        for table in self.tables:
+            rows = self._rows[table]
+            if rows:
+                self._write(table, rows)
+                self.rows[table] += len(rows)
+        for rows in self._rows.values():
+            rows.clear()
+        self.matches += self._buffered
+        self._buffered = 0
+
+    def _writer(self, table: str):
+        writer = self._writers.get(table)
+        if writer is None:
+            path = f"{self.path(table)}.tmp"
+            if self.format == "parquet":
+                writer = pq.ParquetWriter(path, self._schemas[table], compression=self.compression)
+            else:
+                writer = pa.ipc.new_stream(path, self._schemas[table])
+            self._writers[table] = writer
+        return writer
+
+    def _write(self, table: str, rows: List[tuple]):
+        tableSchema = self._schemas[table]
+        columns = []
+        for field, values in zip(tableSchema, zip(*rows)):
+            if pa.types.is_dictionary(field.type):
+                columns.append(pa.array(values, pa.string()).dictionary_encode())
+            else:
+                columns.append(pa.array(values, field.type))
+        self._writer(table).write_table(pa.Table.from_arrays(columns, schema=tableSchema))
+
+    def close(self):
+        """Write the buffered matches, finish every file and move it into place."""
+        if self._closed:
+            return
+        self.flush()
+        self._closed = True
+        for table in self.tables:
+            self._writer(table).close()
+            os.replace(f"{self.path(table)}.tmp", self.path(table))
+
+    def discard(self):
+        """Drop the buffered matches, finish every file and delete it, keeping any file written by a previous export."""
+        if self._closed:
+            return
+        self._closed = True
+        for table, writer in self._writers.items():
+            writer.close()
+            os.remove(f"{self.path(table)}.tmp")
+
+    def __enter__(self) -> "MatchExporter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+    async def export(self, client, matchIds: Iterable[str], region: str, concurrency: int = 10, console: bool = False) -> Dict[str, Exception]:
+        """Fetch matches with :meth:`valaw.Client.get_matches` and write each one as it arrives.
+
+        Set ``raw_data=True`` on the client to skip building MatchDto objects.
+
+        :param client: The client to fetch the matches with.
+        :type client: valaw.Client
+        :param matchIds: The match ids to export.
+        :type matchIds: Iterable[str]
+        :param region: The region to execute against.
+        :type region: str
+        :param concurrency: The maximum number of matches fetched at once, defaults to 10.
+        :type concurrency: int
+        :param console: Whether or not to fetch console matches, defaults to False.
+        :type console: bool
+        :return: The exception raised for each match that could not be fetched.
+        :rtype: Dict[str, Exception]
+        """
+        failed = {}
+        async for matchId, match in client.get_matches(matchIds, region, concurrency=concurrency, console=console):
+            if isinstance(match, Exception):
+                failed[matchId] = match
+                continue
+            self.write(client.json_loads(match) if isinstance(match, bytes) else match)
+        return failed
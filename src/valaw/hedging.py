@@ -0,0 +1,102 @@
+### Imports ###
+import math
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, FrozenSet, List
+
+### Latency Histogram ###
+class LatencyHistogram:
+    """Latency distribution of the most recent requests, kept in log-spaced buckets.
+
+    Only the latest ``window`` samples are counted, so percentiles follow changes in
+    latency instead of averaging over the life of the client. Percentiles are reported
+    as the upper edge of their bucket, about 12% above the exact value at most.
+
+    :param window: The number of recent samples counted, defaults to 1000.
+    :type window: int
+    :param min_latency: The upper edge of the lowest bucket in seconds, defaults to 0.001.
+    :type min_latency: float
+    :param max_latency: Samples above this many seconds are counted in the highest bucket, defaults to 120.
+    :type max_latency: float
+    :param buckets_per_decade: The number of buckets between two powers of ten, defaults to 20.
+    :type buckets_per_decade: int
+    """
+
+    def __init__(self, window: int = 1000, min_latency: float = 0.001, max_latency: float = 120.0, buckets_per_decade: int = 20):
+        if window < 1:
+            raise ValueError("Invalid window, must be at least 1.")
+        self.min_latency = min_latency
+        self.buckets_per_decade = buckets_per_decade
+        self.counts: List[int] = [0] * (math.ceil(math.log10(max_latency / min_latency) * buckets_per_decade) + 1)
+        self._samples: Deque[int] = deque(maxlen=window)
+        self.total = 0
+        """The number of samples recorded since the histogram was created."""
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def _bucket(self, seconds: float) -> int:
+        if seconds <= self.min_latency:
+            return 0
+        return min(math.ceil(math.log10(seconds / self.min_latency) * self.buckets_per_decade), len(self.counts) - 1)
+
+    def upper_bound(self, bucket: int) -> float:
+        """Return the upper edge of a bucket in seconds."""
+        return self.min_latency * 10 ** (bucket / self.buckets_per_decade)
+
+    def add(self, seconds: float):
+        """Record a latency in seconds."""
+        samples = self._samples
+        if len(samples) == samples.maxlen:
+            self.counts[samples[0]] -= 1
+        bucket = self._bucket(seconds)
+        samples.append(bucket)
+        self.counts[bucket] += 1
+        self.total += 1
+
+    def percentile(self, q: float) -> float:
+        """Return the latency in seconds below which a fraction ``q`` of the recent samples fall.
+
+        :param q: The fraction, between 0 and 1.
+        :type q: float
+        :raises ValueError: If no samples were recorded.
+        """
+        if not self._samples:
+            raise ValueError("No samples recorded.")
+        rank = max(1, math.ceil(q * len(self._samples)))
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return self.upper_bound(bucket)
+        return self.upper_bound(len(self.counts) - 1)
+
+### Hedge Policy ###
+@dataclass(frozen=True)
+class HedgePolicy:
+    """Controls when the client sends a duplicate of a slow request.
+
+    If a request to one of ``endpoints`` has not completed after the ``percentile``
+    latency of recent requests to that endpoint, one duplicate is sent and whichever
+    succeeds first is used. The other is cancelled; if it was already sent it still
+    counts against the rate limits.
+
+    :param percentile: The fraction of recent latencies to wait for before hedging, defaults to 0.95.
+    :type percentile: float
+    :param endpoints: The client methods that are hedged, defaults to GET_getMatch and GET_getConsoleMatch.
+    :type endpoints: FrozenSet[str]
+    :param min_samples: The number of recent requests needed before an endpoint is hedged, defaults to 20.
+    :type min_samples: int
+    :param min_delay: The shortest wait before hedging in seconds, defaults to 0.05.
+    :type min_delay: float
+    """
+    percentile: float = 0.95
+    endpoints: FrozenSet[str] = frozenset({"GET_getMatch", "GET_getConsoleMatch"})
+    min_samples: int = 20
+    min_delay: float = 0.05
+
+    def delay(self, histogram: LatencyHistogram) -> float:
+        """Return how long to wait before hedging, or infinity if there are not enough samples yet."""
+        if len(histogram) < self.min_samples:
+            return math.inf
+        return max(self.min_delay, histogram.percentile(self.percentile))
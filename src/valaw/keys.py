@@ -0,0 +1,146 @@
+### Imports ###
+import asyncio
+import time
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from .ratelimit import RateLimiter, retry_after_seconds
+
+### Key Pool ###
+class KeyPool:
+    """A set of Riot API keys that requests are spread over.
+
+    Each key has its own rate limiter, since Riot applies limits per key. Every request
+    goes out with the key that can send soonest and, among those, has the most of its
+    budget left. A key is parked, and only used when every other key is parked too,
+    after a 401 or 403 response or after ``park_after`` rate limited responses in a row.
+
+    :param tokens: The Riot API keys.
+    :type tokens: Iterable[str]
+    :param park_seconds: How long a key is parked for after a 401 or 403, or at least after repeated 429s, defaults to 60.
+    :type park_seconds: float
+    :param park_after: The number of consecutive application or method 429s after which a key is parked, defaults to 3.
+    :type park_after: int
+    :raises ValueError: If no keys are given, a key is repeated, or park_after is less than 1.
+    """
+
+    def __init__(self, tokens: Iterable[str], park_seconds: float = 60.0, park_after: int = 3):
+        self.tokens: List[str] = list(tokens)
+        if not self.tokens:
+            raise ValueError("At least one API key is required.")
+        if len(set(self.tokens)) != len(self.tokens):
+            raise ValueError("API keys must not be repeated.")
+        if park_after < 1:
+            raise ValueError("Invalid park_after, must be at least 1.")
+        self.park_seconds = park_seconds
+        self.park_after = park_after
+        self.limiters: Dict[str, RateLimiter] = {token: RateLimiter() for token in self.tokens}
+        self._parked_until: Dict[str, float] = {token: 0.0 for token in self.tokens}
+        self._rate_limited: Dict[str, int] = {token: 0 for token in self.tokens}
+        self._last_used: Dict[str, float] = {token: 0.0 for token in self.tokens}
+        self._changed: Optional[asyncio.Event] = None
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def parked(self, token: str) -> bool:
+        """Return whether or not a key is currently parked."""
+        return self._parked_until[token] > time.monotonic()
+
+    def available(self) -> List[str]:
+        """Return the keys that are not parked."""
+        now = time.monotonic()
+        return [token for token in self.tokens if self._parked_until[token] <= now]
+
+    def _best(self, route: str, endpoint: str) -> Tuple[str, float]:
+        """Return the best key for a request and how long it would have to wait."""
+        candidates = self.available()
+        if not candidates:
+            # Every key is parked, fall back to the one that comes back first.
+            candidates = [min(self.tokens, key=self._parked_until.__getitem__)]
+
+        best, best_score = None, None
+        for token in candidates:
+            delay, remaining = self.limiters[token].headroom(route, endpoint)
+            score = (delay, -remaining, self._last_used[token])
+            if best_score is None or score < best_score:
+                best, best_score = token, score
+        return best, best_score[0]
+
+    def delay(self, route: str, endpoint: str) -> float:
+        """Return how long the next request to ``endpoint`` on ``route`` would wait on the rate limits of the best key."""
+        return self._best(route, endpoint)[1]
+
+    def choose(self, route: str, endpoint: str) -> str:
+        """Return the key the next request to ``endpoint`` on ``route`` should use, without waiting on its rate limits.
+
+        :param route: The routing value (region or cluster) of the request.
+        :param endpoint: The endpoint the request is made against.
+        :rtype: str
+        """
+        token, _ = self._best(route, endpoint)
+        self._last_used[token] = time.monotonic()
+        return token
+
+    async def acquire(self, route: str, endpoint: str) -> str:
+        """Wait until some key can make a request to ``endpoint`` on ``route`` and return it.
+
+        The request is counted against that key's rate limiter, so :meth:`update` must be
+        called once the request completes.
+
+        :param route: The routing value (region or cluster) of the request.
+        :param endpoint: The endpoint the request is made against.
+        :rtype: str
+        """
+        while True:
+            token, delay = self._best(route, endpoint)
+            if delay <= 0:
+                self._last_used[token] = time.monotonic()
+                await self.limiters[token].acquire(route, endpoint)
+                return token
+            # Wait for the best key to free up, or for a response that changes which key is best.
+            if self._changed is None:
+                self._changed = asyncio.Event()
+            try:
+                await asyncio.wait_for(self._changed.wait(), None if delay == float("inf") else delay)
+            except asyncio.TimeoutError:
+                pass
+
+    def park(self, token: str, seconds: Optional[float] = None):
+        """Stop using a key for ``seconds``, defaults to park_seconds."""
+        seconds = self.park_seconds if seconds is None else seconds
+        self._parked_until[token] = max(self._parked_until[token], time.monotonic() + seconds)
+
+    def unpark(self, token: str):
+        """Start using a parked key again."""
+        self._parked_until[token] = 0.0
+
+    def update(self, token: str, route: str, endpoint: str, status: Optional[int] = None, headers: Optional[Mapping[str, str]] = None, limited: bool = True, blame: bool = True):
+        """Update the state and rate limits of a key from the response to a request made with it.
+
+        :param token: The key the request was made with.
+        :param route: The routing value (region or cluster) of the request.
+        :param endpoint: The endpoint the request was made against.
+        :param status: The HTTP status code of the response, None if the request failed before a response was received.
+        :param headers: The response headers, None if the request failed before a response was received.
+        :param limited: Whether or not the request was counted with :meth:`acquire`, defaults to True.
+        :param blame: Whether or not a 401 or 403 parks the key, False for requests authenticated with a player's access token. Defaults to True.
+        """
+        if limited:
+            self.limiters[token].update(route, endpoint, status, headers)
+        if status is not None and headers is not None:
+            self._report(token, status, headers, blame)
+        if self._changed is not None:
+            self._changed.set()
+            self._changed = None
+
+    def _report(self, token: str, status: int, headers: Mapping[str, str], blame: bool):
+        if status in (401, 403):
+            if blame:
+                self.park(token)
+        elif status == 429 and (headers.get("X-Rate-Limit-Type") or "").lower() in ("application", "method"):
+            self._rate_limited[token] += 1
+            if self._rate_limited[token] >= self.park_after:
+                self._rate_limited[token] = 0
+                self.park(token, max(retry_after_seconds(headers) or 0.0, self.park_seconds))
+        elif status < 400:
+            self._rate_limited[token] = 0
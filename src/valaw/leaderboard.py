@@ -0,0 +1,243 @@
+### Imports ###
+import json
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from .objects import LeaderboardDto, PlayerDto
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+### Constants ###
+COLUMNS = ("leaderboardRank", "rankedRating", "numberOfWins", "competitiveTier")
+"""The integer PlayerDto fields stored by a snapshot, in addition to the puuid."""
+
+### Helper Functions ###
+def _require_numpy():
+    if np is None:
+        raise ImportError("numpy is required for leaderboard snapshots, install it with: pip install valaw[numpy]")
+
+def _field(player: Union[PlayerDto, Dict[str, Any]], name: str, default: Any) -> Any:
+    if isinstance(player, dict):
+        value = player.get(name)
+        return default if value is None else value
+    return getattr(player, name)
+
+### Leaderboard Snapshot ###
+@dataclass
+class LeaderboardDiff:
+    """The changes between two leaderboard snapshots.
+
+    Players are matched by puuid, players without a puuid (private profiles) are never matched.
+    Deltas are ``after - before`` except ``rank``, which is ``before - after`` so climbing is positive.
+
+    :param puuids: The puuids present in both snapshots, ordered by their rank in the newer one.
+    :param rank: Ranks gained by each player in ``puuids``.
+    :param rankedRating: RR gained by each player in ``puuids``.
+    :param numberOfWins: Wins gained by each player in ``puuids``.
+    :param entered: The puuids only present in the newer snapshot.
+    :param dropped: The puuids only present in the older snapshot.
+    """
+    puuids: "np.ndarray"
+    rank: "np.ndarray"
+    rankedRating: "np.ndarray"
+    numberOfWins: "np.ndarray"
+    entered: "np.ndarray"
+    dropped: "np.ndarray"
+
+    def movers(self, limit: Optional[int] = None) -> List[Tuple[str, int, int]]:
+        """Return the players whose rank changed, biggest change first.
+
+        :param limit: The maximum number of players to return, defaults to None (every mover).
+        :type limit: int, optional
+        :return: (puuid, rank delta, RR delta) tuples.
+        :rtype: List[Tuple[str, int, int]]
+        """
+        moved = np.flatnonzero(self.rank)
+        order = moved[np.argsort(-np.abs(self.rank[moved]), kind="stable")][:limit]
+        return [(self.puuids[i].decode(), int(self.rank[i]), int(self.rankedRating[i])) for i in order]
+
+
+class LeaderboardSnapshot:
+    """A leaderboard stored as columns: puuids plus one integer array per PlayerDto field in COLUMNS.
+
+    Requires numpy. Rows are kept in the order they were given, which is rank order for snapshots
+    built from the API.
+
+    :param puuids: The puuid of every row as a bytes array, empty for private profiles.
+    :type puuids: numpy.ndarray
+    :param columns: An integer array for every name in COLUMNS.
+    :type columns: Dict[str, numpy.ndarray]
+    :param actId: The act the leaderboard belongs to, defaults to "".
+    :type actId: str
+    :param region: The region the leaderboard was fetched from, defaults to "".
+    :type region: str
+    :param platformType: The console platform type, or None for the PC leaderboard.
+    :type platformType: str, optional
+    :param takenAt: The unix time in seconds the snapshot was taken at, defaults to now.
+    :type takenAt: float, optional
+    """
+
+    def __init__(self, puuids: "np.ndarray", columns: Dict[str, "np.ndarray"], actId: str = "", region: str = "", platformType: Optional[str] = None, takenAt: Optional[float] = None):
+        _require_numpy()
+        missing = [name for name in COLUMNS if name not in columns]
+        if missing:
+            raise ValueError(f"Missing snapshot columns: {missing}.")
+        if any(len(columns[name]) != len(puuids) for name in COLUMNS):
+            raise ValueError("Every snapshot column must have one value per puuid.")
+        self.puuids = puuids
+        self.columns = {name: columns[name] for name in COLUMNS}
+        self.actId = actId
+        self.region = region
+        self.platformType = platformType
+        self.takenAt = time.time() if takenAt is None else takenAt
+        self._sorted: Optional[Tuple["np.ndarray", "np.ndarray"]] = None
+
+    def __len__(self) -> int:
+        return len(self.puuids)
+
+    def __getattr__(self, name: str) -> "np.ndarray":
+        columns = self.__dict__.get("columns")
+        if columns is not None and name in columns:
+            return columns[name]
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+    @classmethod
+    def from_players(cls, players: Iterable[Union[PlayerDto, Dict[str, Any]]], **kwargs) -> "LeaderboardSnapshot":
+        """Build a snapshot from PlayerDto objects or raw player dicts.
+
+        Keyword arguments are passed to the constructor.
+
+        :param players: The leaderboard rows, in rank order.
+        :type players: Iterable[Union[PlayerDto, Dict[str, Any]]]
+        :rtype: LeaderboardSnapshot
+        """
+        _require_numpy()
+        puuids, values = [], {name: [] for name in COLUMNS}
+        for player in players:
+            puuids.append(_field(player, "puuid", "").encode())
+            for name in COLUMNS:
+                values[name].append(_field(player, name, 0))
+        return cls(
+            np.array(puuids, dtype=bytes) if puuids else np.array([], dtype="S1"),
+            {name: np.array(column, dtype=np.int32) for name, column in values.items()},
+            **kwargs
+        )
+
+    @classmethod
+    def from_leaderboard(cls, leaderboard: Union[LeaderboardDto, Dict[str, Any]], **kwargs) -> "LeaderboardSnapshot":
+        """Build a snapshot from a single leaderboard page.
+
+        :param leaderboard: A LeaderboardDto or raw leaderboard dict.
+        :type leaderboard: Union[LeaderboardDto, Dict[str, Any]]
+        :rtype: LeaderboardSnapshot
+        """
+        kwargs.setdefault("actId", _field(leaderboard, "actId", ""))
+        return cls.from_players(_field(leaderboard, "players", []), **kwargs)
+
+    @classmethod
+    async def fetch(cls, client, actId: str, region: str, platformType: Optional[str] = None, **kwargs) -> "LeaderboardSnapshot":
+        """Fetch a whole leaderboard with Client.iter_leaderboard and store it as a snapshot.
+
+        Keyword arguments are passed to iter_leaderboard.
+
+        :param client: The client to fetch with.
+        :type client: valaw.Client
+        :param actId: The act id.
+        :type actId: str
+        :param region: The region to execute against.
+        :type region: str
+        :param platformType: The console platform type, defaults to None (the PC leaderboard).
+        :type platformType: str, optional
+        :rtype: LeaderboardSnapshot
+        """
+        takenAt = time.time()
+        players = [player async for player in client.iter_leaderboard(actId, region, platformType, **kwargs)]
+        return cls.from_players(players, actId=actId, region=region, platformType=platformType, takenAt=takenAt)
+
+    def _index(self) -> Tuple["np.ndarray", "np.ndarray"]:
+        """Return the identified puuids sorted, and the row each of them came from."""
+        if self._sorted is None:
+            rows = np.flatnonzero(self.puuids != b"")
+            order = np.argsort(self.puuids[rows], kind="stable")
+            self._sorted = (self.puuids[rows][order], rows[order])
+        return self._sorted
+
+    def find(self, puuid: str) -> int:
+        """Return the row of the player with the given puuid, or -1 if they are not on the leaderboard.
+
+        :param puuid: The puuid to look up.
+        :type puuid: str
+        :rtype: int
+        """
+        keys, rows = self._index()
+        key = puuid.encode()
+        position = int(np.searchsorted(keys, key))
+        if position < len(keys) and keys[position] == key:
+            return int(rows[position])
+        return -1
+
+    def diff(self, older: "LeaderboardSnapshot") -> LeaderboardDiff:
+        """Compare this snapshot against an older one.
+
+        :param older: The snapshot to compare against.
+        :type older: LeaderboardSnapshot
+        :rtype: LeaderboardDiff
+        """
+        new_keys, new_rows = self._index()
+        old_keys, old_rows = older._index()
+        # Both key arrays are sorted, so each new key only needs a binary search in the old ones.
+        positions = np.minimum(np.searchsorted(old_keys, new_keys), max(len(old_keys) - 1, 0))
+        found = old_keys[positions] == new_keys if len(old_keys) else np.zeros(len(new_keys), dtype=bool)
+        after, before = new_rows[found], old_rows[positions[found]]
+        order = np.argsort(after, kind="stable")
+        after, before = after[order], before[order]
+        kept = np.zeros(len(old_keys), dtype=bool)
+        kept[positions[found]] = True
+
+        return LeaderboardDiff(
+            puuids=self.puuids[after],
+            rank=older.leaderboardRank[before] - self.leaderboardRank[after],
+            rankedRating=self.rankedRating[after] - older.rankedRating[before],
+            numberOfWins=self.numberOfWins[after] - older.numberOfWins[before],
+            entered=self.puuids[np.sort(new_rows[~found])],
+            dropped=older.puuids[np.sort(old_rows[~kept])],
+        )
+
+    def save(self, path: str):
+        """Write the snapshot to a directory, one .npy file per column plus meta.json.
+
+        :param path: The directory to write to, created if it does not exist.
+        :type path: str
+        """
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, "puuid.npy"), self.puuids)
+        for name, column in self.columns.items():
+            np.save(os.path.join(path, f"{name}.npy"), column)
+        meta = {"actId": self.actId, "region": self.region, "platformType": self.platformType, "takenAt": self.takenAt}
+        with open(os.path.join(path, "meta.json"), "w") as file:
+            json.dump(meta, file)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "LeaderboardSnapshot":
+        """Read a snapshot written by save.
+
+        :param path: The directory to read from.
+        :type path: str
+        :param mmap: Whether or not to memory-map the columns read-only instead of reading them into memory, defaults to True.
+        :type mmap: bool
+        :rtype: LeaderboardSnapshot
+        """
+        _require_numpy()
+        mode = "r" if mmap else None
+        with open(os.path.join(path, "meta.json")) as file:
+            meta = json.load(file)
+        return cls(
+            np.load(os.path.join(path, "puuid.npy"), mmap_mode=mode),
+            {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mode) for name in COLUMNS},
+            **meta
+        )
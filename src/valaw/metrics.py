@@ -0,0 +1,341 @@
+### Imports ###
+import bisect
+import inspect
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+### Constants ###
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+"""Upper bounds in seconds of the histogram buckets, an implicit +Inf bucket follows the last one."""
+
+### Helper Functions ###
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(names: Sequence[str], values: Sequence[Any], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _format(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+### Histogram ###
+class Histogram:
+    """A cumulative histogram of durations with fixed buckets, as used by Prometheus.
+
+    :param buckets: The upper bounds of the buckets in seconds, in increasing order. Defaults to DEFAULT_BUCKETS.
+    :type buckets: Sequence[float]
+    """
+
+    __slots__ = ("buckets", "counts", "count", "sum")
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts: List[int] = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float):
+        """Record a duration in seconds."""
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def merge(self, other: "Histogram"):
+        """Add the samples of another histogram with the same buckets to this one."""
+        for index, count in enumerate(other.counts):
+            self.counts[index] += count
+        self.count += other.count
+        self.sum += other.sum
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Estimate the duration below which a fraction ``q`` of the samples fall, interpolating within buckets.
+
+        :param q: The fraction, between 0 and 1.
+        :type q: float
+        :return: The estimate in seconds, None if there are no samples. Samples above the last bucket are reported as its upper bound.
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                if index == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[index - 1] if index else 0.0
+                return lower + (self.buckets[index] - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+    def summary(self) -> Dict[str, Any]:
+        """Return the count, sum, mean and estimated 50th, 95th and 99th percentiles."""
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else None,
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99)
+        }
+
+### Request Event ###
+@dataclass
+class RequestEvent:
+    """A client request, passed to the on_request_start and on_request_end hooks.
+
+    :param endpoint: The client method making the request, e.g. GET_getMatch.
+    :param route: The region or cluster the request is made against.
+    :param url: The requested URL.
+    :param started: The time.monotonic() value when the request started.
+    :param duration: How long the request took in seconds, None until it ends.
+    :param status: The HTTP status code of the final response, None if no response was received or the request was served from the cache.
+    :param cached: Whether or not the response was served from the cache.
+    :param error: The exception the request raised, if any.
+    """
+    endpoint: str
+    route: str
+    url: str
+    started: float
+    duration: Optional[float] = None
+    status: Optional[int] = None
+    cached: bool = False
+    error: Optional[BaseException] = None
+
+Hook = Callable[[RequestEvent], Union[None, Awaitable[None]]]
+
+### Metrics ###
+class Metrics:
+    """Counters and latency histograms for the requests of a client.
+
+    Install an instance with ``valaw.Client(..., metrics=Metrics())``. Without one the
+    client records nothing and skips the timing code. Without hooks, no RequestEvent is
+    built for a request. Request counts and latencies are kept per endpoint and per
+    route, where the endpoint is the client method (one per URL template, never per raw
+    URL) and the route is the region or cluster.
+
+    Recorded for every request: its latency from call to result, including retries, cache
+    lookups and coalescing; the status code of every response; the time spent queued by
+    the rate limiter; the time spent parsing JSON; and cache hits and misses. The time
+    spent building objects from JSON is recorded per object type.
+
+    :param on_request_start: Called with a RequestEvent when a request starts, may be a coroutine function.
+    :type on_request_start: Callable[[RequestEvent], None], optional
+    :param on_request_end: Called with the same RequestEvent, completed, when the request ends, may be a coroutine function.
+    :type on_request_end: Callable[[RequestEvent], None], optional
+    :param buckets: The upper bounds of the histogram buckets in seconds, defaults to DEFAULT_BUCKETS.
+    :type buckets: Sequence[float]
+    """
+
+    def __init__(self, on_request_start: Optional[Hook] = None, on_request_end: Optional[Hook] = None, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.on_request_start = on_request_start
+        self.on_request_end = on_request_end
+        self.buckets = tuple(buckets)
+        self.in_flight = 0
+        self.requests: Dict[Tuple[str, str], int] = {}
+        self.errors: Dict[Tuple[str, str, str], int] = {}
+        self.statuses: Dict[Tuple[str, str, int], int] = {}
+        self.cache: Dict[Tuple[str, bool], int] = {}
+        self.latency: Dict[Tuple[str, str], Histogram] = {}
+        self.rate_limit_wait: Dict[Tuple[str, str], Histogram] = {}
+        self.json_decode: Dict[str, Histogram] = {}
+        self.fromdict: Dict[str, Histogram] = {}
+
+    def _observe(self, histograms: Dict[Any, Histogram], key: Any, seconds: float):
+        histogram = histograms.get(key)
+        if histogram is None:
+            histogram = histograms[key] = Histogram(self.buckets)
+        histogram.observe(seconds)
+
+    async def _call(self, hook: Optional[Hook], event: RequestEvent):
+        if hook is None:
+            return
+        result = hook(event)
+        if inspect.isawaitable(result):
+            await result
+
+    @property
+    def hooked(self) -> bool:
+        """Whether or not a hook is set, without one no RequestEvent is built."""
+        return self.on_request_start is not None or self.on_request_end is not None
+
+    @asynccontextmanager
+    async def track(self, endpoint: str, route: str, url: str) -> AsyncIterator[Optional[RequestEvent]]:
+        """Record a client request made inside the block and call the hooks around it.
+
+        :param endpoint: The client method making the request.
+        :param route: The region or cluster the request is made against.
+        :param url: The requested URL.
+        :return: An async context manager yielding the RequestEvent, or None if no hook is set. Set ``status`` on the event once the response arrives and ``cached`` if the response came from the cache.
+        """
+        route = route.lower()
+        started = time.monotonic()
+        event = RequestEvent(endpoint, route, url, started) if self.hooked else None
+        key = (endpoint, route)
+        self.requests[key] = self.requests.get(key, 0) + 1
+        self.in_flight += 1
+        try:
+            if event is not None:
+                await self._call(self.on_request_start, event)
+            try:
+                yield event
+            except BaseException as exc:
+                if event is not None:
+                    event.error = exc
+                    event.status = getattr(exc, "status_code", None)
+                error_key = (endpoint, route, type(exc).__name__)
+                self.errors[error_key] = self.errors.get(error_key, 0) + 1
+                raise
+            finally:
+                duration = time.monotonic() - started
+                self._observe(self.latency, key, duration)
+                if event is not None:
+                    event.duration = duration
+                    await self._call(self.on_request_end, event)
+        finally:
+            self.in_flight -= 1
+
+    def record_cache(self, endpoint: str, hit: bool):
+        """Record a cache lookup."""
+        key = (endpoint, hit)
+        self.cache[key] = self.cache.get(key, 0) + 1
+
+    def record_status(self, endpoint: str, route: str, status: int):
+        """Record the status code of a response."""
+        key = (endpoint, route, status)
+        self.statuses[key] = self.statuses.get(key, 0) + 1
+
+    def record_rate_limit_wait(self, endpoint: str, route: str, seconds: float):
+        """Record the time a request was queued by the rate limiter."""
+        self._observe(self.rate_limit_wait, (endpoint, route), seconds)
+
+    def record_json_decode(self, endpoint: str, seconds: float):
+        """Record the time spent parsing a JSON response."""
+        self._observe(self.json_decode, endpoint, seconds)
+
+    def record_fromdict(self, cls: type, seconds: float):
+        """Record the time spent building an object of type ``cls`` from JSON."""
+        self._observe(self.fromdict, cls.__name__, seconds)
+
+    def reset(self):
+        """Forget everything recorded so far, except requests still in flight."""
+        for values in (self.requests, self.errors, self.statuses, self.cache, self.latency, self.rate_limit_wait, self.json_decode, self.fromdict):
+            values.clear()
+
+    def _merged(self, histograms: Dict[Tuple[str, str], Histogram], index: int) -> Dict[str, Histogram]:
+        merged: Dict[str, Histogram] = {}
+        for key, histogram in histograms.items():
+            target = merged.get(key[index])
+            if target is None:
+                target = merged[key[index]] = Histogram(self.buckets)
+            target.merge(histogram)
+        return merged
+
+    def _summary(self, histograms: Dict[str, Histogram], key: str) -> Dict[str, Any]:
+        return (histograms.get(key) or Histogram(self.buckets)).summary()
+
+    @staticmethod
+    def _totals(values: Dict[tuple, int], *indices: int) -> Dict[Any, int]:
+        totals: Dict[Any, int] = {}
+        for key, count in values.items():
+            total_key = key[indices[0]] if len(indices) == 1 else tuple(key[index] for index in indices)
+            totals[total_key] = totals.get(total_key, 0) + count
+        return totals
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return everything recorded so far as a dict of plain values.
+
+        The dict has the keys ``in_flight``, ``requests``, ``errors``, ``statuses`` (counts by
+        status code), ``cache_hit_rate``, ``endpoints`` and ``routes`` (counts and timing
+        summaries for each endpoint and each route) and ``fromdict`` (timing summaries by
+        object type). Timing summaries are in seconds.
+        """
+        latency = (self._merged(self.latency, 0), self._merged(self.latency, 1))
+        wait = (self._merged(self.rate_limit_wait, 0), self._merged(self.rate_limit_wait, 1))
+        requests = (self._totals(self.requests, 0), self._totals(self.requests, 1))
+        errors = (self._totals(self.errors, 0), self._totals(self.errors, 1))
+        statuses = self._totals(self.statuses, 0, 2)
+
+        endpoints = {}
+        for endpoint in sorted(requests[0]):
+            hits, misses = self.cache.get((endpoint, True), 0), self.cache.get((endpoint, False), 0)
+            endpoints[endpoint] = {
+                "requests": requests[0][endpoint],
+                "errors": errors[0].get(endpoint, 0),
+                "statuses": {status: count for (name, status), count in sorted(statuses.items()) if name == endpoint},
+                "latency": self._summary(latency[0], endpoint),
+                "rate_limit_wait": self._summary(wait[0], endpoint),
+                "json_decode": self._summary(self.json_decode, endpoint),
+                "cache": {"hits": hits, "misses": misses, "hit_rate": hits / (hits + misses) if hits + misses else None}
+            }
+
+        routes = {
+            route: {
+                "requests": requests[1][route],
+                "errors": errors[1].get(route, 0),
+                "latency": self._summary(latency[1], route),
+                "rate_limit_wait": self._summary(wait[1], route)
+            }
+            for route in sorted(requests[1])
+        }
+
+        hits = sum(count for (_, hit), count in self.cache.items() if hit)
+        lookups = sum(self.cache.values())
+        return {
+            "in_flight": self.in_flight,
+            "requests": sum(self.requests.values()),
+            "errors": sum(self.errors.values()),
+            "statuses": dict(sorted(self._totals(self.statuses, 2).items())),
+            "cache_hit_rate": hits / lookups if lookups else None,
+            "endpoints": endpoints,
+            "routes": routes,
+            "fromdict": {name: histogram.summary() for name, histogram in sorted(self.fromdict.items())}
+        }
+
+    def prometheus(self, prefix: str = "valaw") -> str:
+        """Return everything recorded so far in the Prometheus text exposition format.
+
+        :param prefix: The prefix of every metric name, defaults to "valaw".
+        :type prefix: str
+        :rtype: str
+        """
+        lines: List[str] = []
+
+        def header(name: str, kind: str, help_text: str):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+
+        def counter(name: str, help_text: str, names: Sequence[str], values: Iterable[Tuple[tuple, int]]):
+            header(name, "counter", help_text)
+            for key, count in sorted(values, key=lambda item: tuple(map(str, item[0]))):
+                lines.append(f"{prefix}_{name}{_labels(names, key)} {count}")
+
+        def histogram(name: str, help_text: str, names: Sequence[str], values: Iterable[Tuple[Any, Histogram]]):
+            header(name, "histogram", help_text)
+            for key, hist in sorted(values, key=lambda item: str(item[0])):
+                key = key if isinstance(key, tuple) else (key,)
+                cumulative = 0
+                for bound, count in zip(hist.buckets + (float("inf"),), hist.counts):
+                    cumulative += count
+                    le = 'le="' + _format(bound) + '"'
+                    lines.append(f"{prefix}_{name}_bucket{_labels(names, key, le)} {cumulative}")
+                lines.append(f"{prefix}_{name}_sum{_labels(names, key)} {_format(hist.sum)}")
+                lines.append(f"{prefix}_{name}_count{_labels(names, key)} {hist.count}")
+
+        header("requests_in_flight", "gauge", "Requests that have started and not ended.")
+        lines.append(f"{prefix}_requests_in_flight {self.in_flight}")
+        counter("requests_total", "Requests made through the client.", ("endpoint", "route"), self.requests.items())
+        counter("request_errors_total", "Requests that raised, by exception type.", ("endpoint", "route", "error"), self.errors.items())
+        counter("responses_total", "HTTP responses received, by status code.", ("endpoint", "route", "status"), self.statuses.items())
+        counter("cache_lookups_total", "Cache lookups.", ("endpoint", "result"), (((endpoint, "hit" if hit else "miss"), count) for (endpoint, hit), count in self.cache.items()))
+        histogram("request_duration_seconds", "Time from call to result, including retries.", ("endpoint", "route"), self.latency.items())
+        histogram("rate_limit_wait_seconds", "Time requests were queued by the rate limiter.", ("endpoint", "route"), self.rate_limit_wait.items())
+        histogram("json_decode_seconds", "Time spent parsing JSON responses.", ("endpoint",), self.json_decode.items())
+        histogram("fromdict_seconds", "Time spent building objects from JSON.", ("type",), self.fromdict.items())
+        return "\n".join(lines) + "\n"
@@ -21,7 +21,8 @@ from .match import (
     AbilityCastsDto,
     PlayerStatsDto,
     MatchInfoDto,
-    MatchDto
+    MatchDto,
+    LazyMatchDto
 )
 
 from .ranked import (
@@ -66,6 +67,7 @@ __all__ = [
     "PlayerStatsDto",
     "MatchInfoDto",
     "MatchDto",
+    "LazyMatchDto",
     "PlayerDto",
     "LeaderboardDto",
     "UpdateDto",
@@ -0,0 +1,42 @@
+import sys
+from dataclasses import dataclass, fields
+
+def dto(cls=None, *, frozen: bool = False):
+    """Decorate a data object as a dataclass with ``__slots__``.
+
+    ``dataclass(slots=True)`` is only available from Python 3.10, on older
+    versions the class is rebuilt with ``__slots__`` the same way.
+
+    :param frozen: Whether or not instances are immutable, defaults to False.
+    :type frozen: bool
+    """
+    def wrap(cls):
+        if sys.version_info >= (3, 10):
+            return dataclass(cls, frozen=frozen, slots=True)
+        return _add_slots(dataclass(cls, frozen=frozen))
+
+    return wrap if cls is None else wrap(cls)
+
+def _add_slots(cls):
+    field_names = tuple(field.name for field in fields(cls))
+    cls_dict = dict(cls.__dict__)
+    cls_dict["__slots__"] = field_names
+    for name in field_names:
+        # Defaults live in the generated __init__, the class attributes would clash with the slots.
+        cls_dict.pop(name, None)
+    cls_dict.pop("__dict__", None)
+    cls_dict.pop("__weakref__", None)
+    if cls.__dataclass_params__.frozen:
+        # Without a __dict__, pickle and copy restore the state through __setstate__, which must bypass the frozen __setattr__.
+        cls_dict["__getstate__"] = _dataclass_getstate
+        cls_dict["__setstate__"] = _dataclass_setstate
+    slotted = type(cls)(cls.__name__, cls.__bases__, cls_dict)
+    slotted.__qualname__ = cls.__qualname__
+    return slotted
+
+def _dataclass_getstate(self):
+    return [getattr(self, field.name) for field in fields(self)]
+
+def _dataclass_setstate(self, state):
+    for field, value in zip(fields(self), state):
+        object.__setattr__(self, field.name, value)
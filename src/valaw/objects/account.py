@@ -1,13 +1,14 @@
-from dataclasses import dataclass
 from typing import Optional
 
-@dataclass
+from ._compat import dto
+
+@dto
 class AccountDto:
     puuid: str
     gameName: Optional[str] = None
     tagLine: Optional[str] = None
 
-@dataclass
+@dto
 class ActiveShardDto:
     puuid: str
     game: str
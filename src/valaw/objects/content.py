@@ -1,7 +1,8 @@
-from dataclasses import dataclass
 from typing import List, Optional 
 
-@dataclass
+from ._compat import dto
+
+@dto
 class LocalizedNamesDto:
     ar_AE: str
     de_DE: str
@@ -23,7 +24,7 @@ class LocalizedNamesDto:
     zh_CN: str
     zh_TW: str
 
-@dataclass
+@dto
 class ActDto:
     name: str
     id: str
@@ -32,7 +33,7 @@ class ActDto:
     localizedNames: Optional[LocalizedNamesDto] = None
     parentId: Optional[str] = None
 
-@dataclass
+@dto
 class ContentItemDto:
     name: str
     id: str
@@ -40,7 +41,7 @@ class ContentItemDto:
     localizedNames: Optional[LocalizedNamesDto] = None
     assetPath: Optional[str] = None
 
-@dataclass
+@dto
 class ContentDto:
     version: str
     characters: List[ContentItemDto]
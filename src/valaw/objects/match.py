@@ -1,30 +1,31 @@
-from dataclasses import dataclass
-from typing import List, Optional
+from typing import Any, Callable, List, Optional
 
-@dataclass
+from ._compat import dto
+
+@dto
 class MatchlistEntryDto:
     matchId: str
     gameStartTimeMillis: int
     queueId: str
 
-@dataclass
+@dto
 class MatchlistDto:
     puuid: str
     history: List[MatchlistEntryDto]
 
-@dataclass
+@dto
 class RecentMatchesDto:
     currentTime: int
     matchIds: List[str]
 
-@dataclass
+@dto
 class AbilityDto:
     grenadeEffects: str
     ability1Effects: str
     ability2Effects: str
     ultimateEffects: str
 
-@dataclass
+@dto
 class EconomyDto:
     loadoutValue: int
     weapon: str
@@ -32,7 +33,7 @@ class EconomyDto:
     remaining: int
     spent: int
 
-@dataclass
+@dto
 class DamageDto:
     receiver: str
     damage: int
@@ -40,24 +41,24 @@ class DamageDto:
     bodyshots: int
     headshots: int
 
-@dataclass
+@dto(frozen=True)
 class FinishingDamageDto:
     damageType: str
     damageItem: str
     isSecondaryFireMode: bool
 
-@dataclass
+@dto(frozen=True)
 class LocationDto:
     x: int
     y: int
 
-@dataclass
+@dto(frozen=True)
 class PlayerLocationsDto:
     puuid: str
     viewRadians: float
     location: LocationDto
 
-@dataclass
+@dto
 class KillDto:
     timeSinceGameStartMillis: int
     timeSinceRoundStartMillis: int
@@ -68,7 +69,7 @@ class KillDto:
     playerLocations: List[PlayerLocationsDto]
     finishingDamage: FinishingDamageDto
 
-@dataclass
+@dto
 class PlayerRoundStatsDto:
     puuid: str
     kills: List[KillDto]
@@ -77,7 +78,7 @@ class PlayerRoundStatsDto:
     economy: EconomyDto
     ability: AbilityDto
 
-@dataclass
+@dto
 class RoundResultDto:
     roundNum: int
     roundResult: str
@@ -95,7 +96,7 @@ class RoundResultDto:
     playerStats: List[PlayerRoundStatsDto]
     roundResultCode: str
 
-@dataclass
+@dto
 class TeamDto:
     teamId: str
     won: bool
@@ -103,19 +104,19 @@ class TeamDto:
     roundsWon: int
     numPoints: int
 
-@dataclass
+@dto
 class CoachDto:
     puuid: str
     teamId: str
 
-@dataclass
+@dto
 class AbilityCastsDto:
     grenadeCasts: int
     ability1Casts: int
     ability2Casts: int
     ultimateCasts: int
 
-@dataclass
+@dto
 class PlayerStatsDto:
     score: int
     roundsPlayed: int
@@ -125,7 +126,7 @@ class PlayerStatsDto:
     playtimeMillis: int
     abilityCasts: Optional[AbilityCastsDto]
 
-@dataclass
+@dto
 class PlayerDto:
     puuid: str
     gameName: str
@@ -140,7 +141,7 @@ class PlayerDto:
     playerTitle: str
     accountLevel: int
 
-@dataclass
+@dto
 class MatchInfoDto:
     matchId: str
     mapId: str
@@ -154,10 +155,50 @@ class MatchInfoDto:
     isRanked: bool
     seasonId: str
 
-@dataclass
+@dto
 class MatchDto:
     matchInfo: MatchInfoDto	
     players: List[PlayerDto]	
     coaches: List[CoachDto]	
     teams: List[TeamDto]	
-    roundResults: List[RoundResultDto]
\ No newline at end of file
+    roundResults: List[RoundResultDto]
+
+_ROUND_RESULTS = MatchDto.__dict__["roundResults"]
+
+class LazyMatchDto(MatchDto):
+    """A MatchDto that decodes roundResults the first time it is accessed.
+
+    Compares equal to a MatchDto holding the same data.
+    """
+    __slots__ = ("_pendingRoundResults",)
+
+    @classmethod
+    def defer(cls, matchInfo: MatchInfoDto, players: List[PlayerDto], coaches: List[CoachDto], teams: List[TeamDto], rawRoundResults: List[dict], decode: Callable[[List[dict]], List[RoundResultDto]]) -> "LazyMatchDto":
+        """Create a match whose raw roundResults are passed to ``decode`` on first access."""
+        match = cls(matchInfo, players, coaches, teams, [])
+        match._pendingRoundResults = (rawRoundResults, decode)
+        return match
+
+    @property
+    def roundResults(self) -> List[RoundResultDto]:
+        pending = self._pendingRoundResults
+        if pending is not None:
+            rawRoundResults, decode = pending
+            _ROUND_RESULTS.__set__(self, decode(rawRoundResults))
+            self._pendingRoundResults = None
+        return _ROUND_RESULTS.__get__(self, type(self))
+
+    @roundResults.setter
+    def roundResults(self, value: List[RoundResultDto]):
+        self._pendingRoundResults = None
+        _ROUND_RESULTS.__set__(self, value)
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, MatchDto):
+            return NotImplemented
+        return (
+            (self.matchInfo, self.players, self.coaches, self.teams, self.roundResults)
+            == (other.matchInfo, other.players, other.coaches, other.teams, other.roundResults)
+        )
+
+    __hash__ = None
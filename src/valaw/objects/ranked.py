@@ -1,7 +1,8 @@
-from dataclasses import dataclass
 from typing import List, Optional
 
-@dataclass
+from ._compat import dto
+
+@dto
 class PlayerDto:
     leaderboardRank: int
     rankedRating: int
@@ -11,7 +12,7 @@ class PlayerDto:
     gameName: str = "Private"
     tagLine: str = ""
 
-@dataclass
+@dto
 class LeaderboardDto:
     actId: str
     players: List[PlayerDto]
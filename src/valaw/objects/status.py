@@ -1,7 +1,8 @@
-from dataclasses import dataclass
 from typing import List, Optional
 
-@dataclass
+from ._compat import dto
+
+@dto
 class UpdateDto:
     id: int
     author: str
@@ -10,12 +11,12 @@ class UpdateDto:
     created_at: str
     updated_at: str
 
-@dataclass
+@dto
 class ContentDto:
     locale: str
     content: str
 
-@dataclass
+@dto
 class StatusDto:
     id: int
     maintenance_status: str
@@ -27,7 +28,7 @@ class StatusDto:
     platforms: List[str]
     archived_at: Optional[str] = None
 
-@dataclass
+@dto
 class PlatformDataDto:
     id: str
     name: str
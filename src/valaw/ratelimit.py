@@ -0,0 +1,242 @@
+### Imports ###
+import asyncio
+import time
+from collections import deque
+from typing import Deque, Dict, List, Mapping, Optional, Tuple
+
+### Helper Functions ###
+def parse_rate_limit_header(value: Optional[str]) -> List[Tuple[int, int]]:
+    """Parse a Riot rate limit header into ``(amount, seconds)`` pairs.
+
+    Both the limit headers (``X-App-Rate-Limit: 20:1,100:120``) and the count
+    headers (``X-App-Rate-Limit-Count: 1:1,1:120``) share this format.
+
+    :param value: The raw header value.
+    :return: A list of ``(amount, seconds)`` tuples, empty if the header is missing or malformed.
+    """
+    pairs = []
+    if not value:
+        return pairs
+    for part in value.split(","):
+        amount, _, seconds = part.strip().partition(":")
+        try:
+            pairs.append((int(amount), int(seconds)))
+        except ValueError:
+            continue
+    return pairs
+
+def retry_after_seconds(headers: Mapping[str, str]) -> Optional[float]:
+    """Return the ``Retry-After`` header in seconds, or None if missing or malformed."""
+    value = headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        return None
+
+### Rate Limiter ###
+class RateLimitWindow:
+    """A sliding window allowing ``limit`` requests every ``duration`` seconds."""
+
+    __slots__ = ("limit", "duration", "timestamps")
+
+    def __init__(self, limit: int, duration: float):
+        self.limit = limit
+        self.duration = duration
+        self.timestamps: Deque[float] = deque()
+
+    def _prune(self, now: float):
+        cutoff = now - self.duration
+        timestamps = self.timestamps
+        while timestamps and timestamps[0] <= cutoff:
+            timestamps.popleft()
+
+    def delay(self, now: float) -> float:
+        """Return how long to wait before another request fits in the window."""
+        if self.limit <= 0:
+            # A window that allows nothing blocks until new limits replace it.
+            return self.duration
+        self._prune(now)
+        if len(self.timestamps) < self.limit:
+            return 0.0
+        return self.timestamps[-self.limit] + self.duration - now
+
+    def record(self, now: float, amount: int = 1):
+        self.timestamps.extend([now] * amount)
+
+    def remaining(self, now: float) -> float:
+        """Return the fraction of the window that is still unused."""
+        self._prune(now)
+        return max(self.limit - len(self.timestamps), 0) / self.limit if self.limit > 0 else 0.0
+
+    def sync(self, count: int, now: float):
+        """Pad the window so it accounts for at least ``count`` requests.
+
+        The server count also includes requests made by other processes sharing
+        the same key, so the local view can only ever be raised to match it.
+        """
+        self._prune(now)
+        missing = count - len(self.timestamps)
+        if missing > 0:
+            self.record(now, missing)
+
+
+class RateLimitBucket:
+    """The set of windows that apply to a single application or method limit."""
+
+    def __init__(self):
+        self.windows: Optional[Dict[int, RateLimitWindow]] = None
+        self.blocked_until = 0.0
+        self._probe: Optional[asyncio.Event] = None
+
+    @property
+    def known(self) -> bool:
+        return self.windows is not None
+
+    def delay(self, now: float) -> float:
+        delay = self.blocked_until - now
+        for window in (self.windows or {}).values():
+            delay = max(delay, window.delay(now))
+        return max(delay, 0.0)
+
+    def record(self, now: float):
+        for window in (self.windows or {}).values():
+            window.record(now)
+
+    def remaining(self, now: float) -> float:
+        """Return the unused fraction of the most constrained window, 1.0 while the limits are unknown."""
+        return min((window.remaining(now) for window in (self.windows or {}).values()), default=1.0)
+
+    def update(self, limits: List[Tuple[int, int]], counts: List[Tuple[int, int]], now: float):
+        """Apply the limits and counts reported by a response.
+
+        A response without limits, such as an error from a proxy, keeps the limits already learned.
+        """
+        if not limits and self.windows is not None:
+            self._settle_probe()
+            return
+        windows = self.windows or {}
+        updated = {}
+        for limit, duration in limits:
+            window = windows.get(duration)
+            if window is None:
+                window = RateLimitWindow(limit, duration)
+            window.limit = limit
+            updated[duration] = window
+        for count, duration in counts:
+            window = updated.get(duration)
+            if window is not None:
+                window.sync(count, now)
+        self.windows = updated
+        self._settle_probe()
+
+    def block(self, seconds: float, now: float):
+        self.blocked_until = max(self.blocked_until, now + seconds)
+
+    def _settle_probe(self):
+        if self._probe is not None:
+            self._probe.set()
+            self._probe = None
+
+
+class RateLimiter:
+    """Client-side limiter driven by the Riot rate limit response headers.
+
+    Application limits are tracked per routing value (region or cluster) and
+    method limits per routing value and endpoint. Until the limits for a bucket
+    are known, only a single request is let through to discover them.
+    """
+
+    def __init__(self):
+        self._app: Dict[str, RateLimitBucket] = {}
+        self._method: Dict[Tuple[str, str], RateLimitBucket] = {}
+
+    def _buckets(self, route: str, endpoint: str) -> Tuple[RateLimitBucket, RateLimitBucket]:
+        app = self._app.get(route)
+        if app is None:
+            app = self._app[route] = RateLimitBucket()
+        method = self._method.get((route, endpoint))
+        if method is None:
+            method = self._method[(route, endpoint)] = RateLimitBucket()
+        return app, method
+
+    def headroom(self, route: str, endpoint: str) -> Tuple[float, float]:
+        """Return how long a request to ``endpoint`` on ``route`` would wait, and the fraction of its budget left.
+
+        The wait is infinite while a request is discovering the limits of one of the buckets.
+
+        :param route: The routing value (region or cluster) of the request.
+        :param endpoint: The endpoint the request would be made against.
+        :return: A ``(seconds, fraction)`` tuple.
+        """
+        app, method = self._buckets(route, endpoint)
+        if app._probe is not None or method._probe is not None:
+            return float("inf"), 0.0
+        now = time.monotonic()
+        return max(app.delay(now), method.delay(now)), min(app.remaining(now), method.remaining(now))
+
+    async def acquire(self, route: str, endpoint: str) -> float:
+        """Wait until a request to ``endpoint`` on ``route`` fits within every known limit.
+
+        :param route: The routing value (region or cluster) of the request.
+        :param endpoint: The endpoint the request is made against.
+        :return: The number of seconds spent waiting.
+        """
+        start = time.monotonic()
+        while True:
+            app, method = self._buckets(route, endpoint)
+            probe = next((bucket._probe for bucket in (app, method) if bucket._probe is not None), None)
+            if probe is not None:
+                await probe.wait()
+                continue
+            now = time.monotonic()
+            delay = max(app.delay(now), method.delay(now))
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+            for bucket in (app, method):
+                if not bucket.known:
+                    bucket._probe = asyncio.Event()
+                bucket.record(now)
+            return now - start
+
+    def update(self, route: str, endpoint: str, status: Optional[int] = None, headers: Optional[Mapping[str, str]] = None):
+        """Update the buckets for ``route`` and ``endpoint`` from a response.
+
+        Must be called once for every successful :meth:`acquire`, with ``headers``
+        left as None if the request failed before a response was received.
+
+        :param route: The routing value (region or cluster) of the request.
+        :param endpoint: The endpoint the request was made against.
+        :param status: The HTTP status code of the response.
+        :param headers: The response headers.
+        """
+        app, method = self._buckets(route, endpoint)
+        if headers is None:
+            for bucket in (app, method):
+                if not bucket.known:
+                    bucket._settle_probe()
+            return
+
+        now = time.monotonic()
+        app.update(
+            parse_rate_limit_header(headers.get("X-App-Rate-Limit")),
+            parse_rate_limit_header(headers.get("X-App-Rate-Limit-Count")),
+            now
+        )
+        method.update(
+            parse_rate_limit_header(headers.get("X-Method-Rate-Limit")),
+            parse_rate_limit_header(headers.get("X-Method-Rate-Limit-Count")),
+            now
+        )
+
+        if status == 429:
+            retry_after = retry_after_seconds(headers)
+            limit_type = (headers.get("X-Rate-Limit-Type") or "").lower()
+            if retry_after is not None:
+                if limit_type == "application":
+                    app.block(retry_after, now)
+                elif limit_type == "method":
+                    method.block(retry_after, now)
+
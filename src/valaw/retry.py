@@ -0,0 +1,33 @@
+### Imports ###
+import random
+from dataclasses import dataclass
+from typing import FrozenSet
+
+### Retry Policy ###
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Controls how the client retries failed requests.
+
+    ``429`` responses are retried after the ``Retry-After`` header when it is present,
+    every other retry waits for an exponential backoff with full jitter.
+
+    :param max_retries: The maximum number of retries for a single call, defaults to 3.
+    :type max_retries: int
+    :param backoff_base: The backoff before the first retry in seconds, doubled on every retry, defaults to 0.5.
+    :type backoff_base: float
+    :param backoff_max: The maximum backoff between two retries in seconds, defaults to 30.
+    :type backoff_max: float
+    :param retry_statuses: The HTTP status codes that are retried, defaults to 429, 500, 502, 503 and 504.
+    :type retry_statuses: FrozenSet[int]
+    :param retry_connection_errors: Whether or not to retry on connection errors and timeouts, defaults to True.
+    :type retry_connection_errors: bool
+    """
+    max_retries: int = 3
+    backoff_base: float = 0.5
+    backoff_max: float = 30.0
+    retry_statuses: FrozenSet[int] = frozenset({429, 500, 502, 503, 504})
+    retry_connection_errors: bool = True
+
+    def backoff(self, attempt: int) -> float:
+        """Return a jittered backoff in seconds for the given zero-based retry attempt."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
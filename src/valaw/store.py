@@ -0,0 +1,197 @@
+### Imports ###
+import json
+import sqlite3
+import threading
+import zlib
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+### Constants ###
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS matches (
+    match_id TEXT PRIMARY KEY,
+    game_start_millis INTEGER,
+    queue_id TEXT,
+    data BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS matches_game_start_millis ON matches (game_start_millis);
+CREATE INDEX IF NOT EXISTS matches_queue_id ON matches (queue_id, game_start_millis);
+CREATE TABLE IF NOT EXISTS match_players (
+    puuid TEXT NOT NULL,
+    match_id TEXT NOT NULL,
+    PRIMARY KEY (puuid, match_id)
+) WITHOUT ROWID;
+"""
+"""SQLite schema of the match store."""
+
+### Match Store ###
+class MatchStore:
+    """Local SQLite store for raw match JSON, keyed by ``matchInfo.matchId``.
+
+    Matches are stored as zlib-compressed JSON and indexed by start time, queue
+    and the puuid of every player.
+
+    Every method blocks while SQLite and zlib run. The store can be shared between
+    threads, and the client calls it from a worker thread so the event loop keeps
+    running; call it with ``asyncio.to_thread`` from async code for the same reason.
+
+    :param path: The path of the SQLite database file. Defaults to ":memory:".
+    :type path: str
+    :param compression_level: The zlib compression level used for stored matches, defaults to 6.
+    :type compression_level: int
+    """
+
+    def __init__(self, path: str = ":memory:", compression_level: int = 6):
+        self.path = path
+        self.compression_level = compression_level
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __contains__(self, matchId: str) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM matches WHERE match_id = ?", (matchId,)).fetchone() is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM matches").fetchone()[0]
+
+    def close(self):
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def _decode(data: bytes) -> Dict[str, Any]:
+        return json.loads(zlib.decompress(data))
+
+    def _insert(self, match: Union[Dict[str, Any], bytes], body: Optional[bytes] = None):
+        if isinstance(match, bytes):
+            body, match = match, json.loads(match)
+        elif body is None:
+            body = json.dumps(match, separators=(",", ":")).encode()
+        match_info = match["matchInfo"]
+        matchId = match_info["matchId"]
+        self._conn.execute(
+            "INSERT OR REPLACE INTO matches (match_id, game_start_millis, queue_id, data) VALUES (?, ?, ?, ?)",
+            (matchId, match_info.get("gameStartMillis"), match_info.get("queueId"), zlib.compress(body, self.compression_level))
+        )
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO match_players (puuid, match_id) VALUES (?, ?)",
+            [(player["puuid"], matchId) for player in match.get("players") or () if player.get("puuid")]
+        )
+
+    def put(self, match: Union[Dict[str, Any], bytes], body: Optional[bytes] = None):
+        """Store a raw match, replacing any existing match with the same id.
+
+        :param match: The raw match JSON as returned by GET_getMatch, either parsed or as the undecoded response body.
+        :type match: Union[Dict[str, Any], bytes]
+        :param body: The undecoded response body of a parsed ``match``, stored as is instead of encoding the match again. Defaults to None.
+        :type body: bytes, optional
+        """
+        with self._lock, self._conn:
+            self._insert(match, body)
+
+    def put_many(self, matches: Iterable[Union[Dict[str, Any], bytes]]):
+        """Store several raw matches in a single transaction.
+
+        :param matches: The raw matches to store, either parsed or as undecoded response bodies.
+        :type matches: Iterable[Union[Dict[str, Any], bytes]]
+        """
+        with self._lock, self._conn:
+            for match in matches:
+                self._insert(match)
+
+    def get(self, matchId: str) -> Optional[Dict[str, Any]]:
+        """Return the raw match with the given id, or None if it is not stored.
+
+        :param matchId: The match id.
+        :type matchId: str
+        :rtype: Optional[Dict[str, Any]]
+        """
+        data = self._select(matchId)
+        return self._decode(data) if data is not None else None
+
+    def get_raw(self, matchId: str) -> Optional[bytes]:
+        """Return the JSON body of the match with the given id without parsing it, or None if it is not stored.
+
+        :param matchId: The match id.
+        :type matchId: str
+        :rtype: Optional[bytes]
+        """
+        data = self._select(matchId)
+        return zlib.decompress(data) if data is not None else None
+
+    def _select(self, matchId: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM matches WHERE match_id = ?", (matchId,)).fetchone()
+        return row[0] if row is not None else None
+
+    def _query(self, columns: str, puuid: Optional[str], queueId: Optional[str], start: Optional[int], end: Optional[int], limit: Optional[int]) -> Tuple[str, List[Any]]:
+        sql = f"SELECT {columns} FROM matches m"
+        clauses, params = [], []
+        if puuid is not None:
+            sql += " JOIN match_players p ON p.match_id = m.match_id"
+            clauses.append("p.puuid = ?")
+            params.append(puuid)
+        if queueId is not None:
+            clauses.append("m.queue_id = ?")
+            params.append(queueId)
+        if start is not None:
+            clauses.append("m.game_start_millis >= ?")
+            params.append(start)
+        if end is not None:
+            clauses.append("m.game_start_millis < ?")
+            params.append(end)
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY m.game_start_millis DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return sql, params
+
+    def match_ids(self, puuid: Optional[str] = None, queueId: Optional[str] = None, start: Optional[int] = None, end: Optional[int] = None, limit: Optional[int] = None) -> List[str]:
+        """Return the ids of stored matches, most recent first.
+
+        :param puuid: Only include matches this player played in, defaults to None.
+        :type puuid: str, optional
+        :param queueId: Only include matches from this queue, defaults to None.
+        :type queueId: str, optional
+        :param start: Only include matches that started at or after this unix time in milliseconds, defaults to None.
+        :type start: int, optional
+        :param end: Only include matches that started before this unix time in milliseconds, defaults to None.
+        :type end: int, optional
+        :param limit: The maximum number of ids to return, defaults to None.
+        :type limit: int, optional
+        :rtype: List[str]
+        """
+        sql, params = self._query("m.match_id", puuid, queueId, start, end, limit)
+        with self._lock:
+            return [row[0] for row in self._conn.execute(sql, params)]
+
+    def matches(self, puuid: Optional[str] = None, queueId: Optional[str] = None, start: Optional[int] = None, end: Optional[int] = None, limit: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Iterate over stored raw matches, most recent first.
+
+        Takes the same filters as :meth:`match_ids`.
+
+        :rtype: Iterator[Dict[str, Any]]
+        """
+        sql, params = self._query("m.data", puuid, queueId, start, end, limit)
+        with self._lock:
+            cursor = self._conn.execute(sql, params)
+        while True:
+            # Only hold the lock while fetching, so other threads can use the store between two matches.
+            with self._lock:
+                rows = cursor.fetchmany(100)
+            if not rows:
+                break
+            for row in rows:
+                yield self._decode(row[0])
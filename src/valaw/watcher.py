@@ -0,0 +1,213 @@
+### Imports ###
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple, Union
+
+import aiohttp
+
+from .client import CONSOLE_QUEUES, QUEUES, Exceptions, validate_region
+from .objects import MatchDto
+
+### Recent Matches Watcher ###
+class RecentMatchesWatcher:
+    """Polls the recent matches of a queue and emits each match id once.
+
+    The recent matches list is regenerated by the API every so often and stamped with
+    ``currentTime``. The watcher learns how often that happens and schedules each poll
+    for just after the next expected refresh. Polls that return an unchanged list back
+    off exponentially up to ``max_interval``.
+
+    Match ids already emitted are remembered for ``seen_ttl`` seconds, and at most
+    ``seen_maxsize`` of them are kept, so a long running watcher uses bounded memory.
+
+    :param client: The client to poll with.
+    :type client: valaw.Client
+    :param queue: The queue to watch.
+    :type queue: str
+    :param region: The region to execute against.
+    :type region: str
+    :param console: Whether or not to watch console recent matches, defaults to False.
+    :type console: bool
+    :param min_interval: The shortest time between two polls in seconds, defaults to 10.
+    :type min_interval: float
+    :param max_interval: The longest time between two polls in seconds, defaults to 300.
+    :type max_interval: float
+    :param seen_ttl: How long emitted match ids are remembered in seconds, defaults to 900. Must be longer than the window of the recent matches list, 10 minutes for live regions and 12 hours for esports.
+    :type seen_ttl: float
+    :param seen_maxsize: The maximum number of remembered match ids, the oldest are forgotten first. Defaults to 100000.
+    :type seen_maxsize: int
+    :raises InvalidRegion: If the provided region is invalid.
+    :raises InvalidQueue: If the provided queue is invalid.
+    :raises ValueError: If the intervals or seen-set limits are invalid.
+    """
+
+    def __init__(self, client, queue: str, region: str, console: bool = False, min_interval: float = 10.0, max_interval: float = 300.0, seen_ttl: float = 900.0, seen_maxsize: int = 100000):
+        validate_region(region)
+        queues = CONSOLE_QUEUES if console else QUEUES
+        if queue.lower() not in queues:
+            raise Exceptions.InvalidQueue(f"Invalid queue, valid queues are: {queues}.")
+        if min_interval <= 0 or max_interval < min_interval:
+            raise ValueError("Invalid intervals, min_interval must be positive and at most max_interval.")
+        if seen_ttl <= 0 or seen_maxsize < 1:
+            raise ValueError("Invalid seen-set limits, seen_ttl must be positive and seen_maxsize at least 1.")
+
+        self.client = client
+        self.queue = queue
+        self.region = region
+        self.console = console
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.seen_ttl = seen_ttl
+        self.seen_maxsize = seen_maxsize
+        self.delay = min_interval
+        """The time in seconds until the next poll, updated by every poll."""
+        self.period: Optional[float] = None
+        """The estimated time in seconds between two refreshes of the recent matches list."""
+        self._seen: "OrderedDict[str, float]" = OrderedDict()
+        self._current_time: Optional[int] = None
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+    def __contains__(self, matchId: str) -> bool:
+        expires = self._seen.get(matchId)
+        return expires is not None and expires > time.monotonic()
+
+    def _remember(self, matchIds: Iterable[str]) -> List[str]:
+        """Add match ids to the seen-set and return the ones that were not in it."""
+        now = time.monotonic()
+        seen = self._seen
+        while seen and next(iter(seen.values())) <= now:
+            seen.popitem(last=False)
+
+        new = []
+        for matchId in matchIds:
+            if matchId not in seen:
+                seen[matchId] = now + self.seen_ttl
+                new.append(matchId)
+        while len(seen) > self.seen_maxsize:
+            seen.popitem(last=False)
+        return new
+
+    def _schedule(self, current_time: int, found_new: bool):
+        """Set the delay until the next poll from the currentTime of the latest response."""
+        previous, self._current_time = self._current_time, current_time
+        if not current_time or current_time == previous:
+            # The list has not been regenerated yet, back off until it is.
+            self.delay = self.min_interval if found_new else min(self.delay * 2, self.max_interval)
+            return
+
+        if previous and current_time > previous:
+            elapsed = (current_time - previous) / 1000
+            # Slow polls only see multiples of the real period, so prefer the smallest recent gap.
+            self.period = elapsed if self.period is None else min(elapsed, self.period * 1.5)
+        if self.period is None:
+            self.delay = self.min_interval
+            return
+
+        age = max(0.0, time.time() - current_time / 1000)
+        # Aim slightly after the expected refresh so the next poll does not arrive just before it.
+        slack = min(1.0, self.period / 10)
+        self.delay = min(max(self.period - age % self.period + slack, self.min_interval), self.max_interval)
+
+    async def poll(self) -> List[str]:
+        """Request the recent matches once and return the match ids not seen before, oldest first.
+
+        :rtype: List[str]
+        :raises RiotAPIResponseError: If the API response indicates an error.
+        :raises DeadlineExceeded: If the deadline passes before a response is received.
+        """
+        client = self.client
+        fetch = client.GET_getConsoleRecent if self.console else client.GET_getRecent
+        recent = await fetch(self.queue, self.region)
+        if isinstance(recent, bytes):
+            recent = client.json_loads(recent)
+        if isinstance(recent, dict):
+            current_time, matchIds = recent.get("currentTime") or 0, recent.get("matchIds") or []
+        else:
+            current_time, matchIds = recent.currentTime, recent.matchIds
+
+        new = self._remember(matchIds)
+        self._schedule(current_time, bool(new))
+        return new
+
+    async def batches(self) -> AsyncIterator[List[str]]:
+        """Poll forever, yielding the new match ids of every poll that found some.
+
+        Failed polls are retried after the current delay.
+
+        :rtype: AsyncIterator[List[str]]
+        """
+        while True:
+            polled = time.monotonic()
+            try:
+                new = await self.poll()
+            except (Exceptions.RiotAPIResponseError, Exceptions.DeadlineExceeded, Exceptions.CircuitOpen, Exceptions.FailedToParseJSON, aiohttp.ClientError, OSError, asyncio.TimeoutError):
+                new = None
+            if new:
+                yield new
+            await asyncio.sleep(max(0.0, polled + self.delay - time.monotonic()))
+
+    async def __aiter__(self) -> AsyncIterator[str]:
+        async for batch in self.batches():
+            for matchId in batch:
+                yield matchId
+
+    async def matches(self, concurrency: int = 10) -> AsyncIterator[Tuple[str, Union[MatchDto, Dict[str, Any], Exception]]]:
+        """Poll forever and fetch every new match, yielding each one as soon as it completes.
+
+        Polling runs in its own task and keeps to its schedule while matches are being
+        fetched. A failed match does not stop the watcher, the exception it raised is
+        yielded in place of the match instead.
+
+        :param concurrency: The maximum number of matches fetched at once, defaults to 10.
+        :type concurrency: int
+        :return: An async iterator of (matchId, match or exception) tuples.
+        :rtype: AsyncIterator[Tuple[str, Union[MatchDto, Dict, Exception]]]
+        :raises ValueError: If the concurrency is less than 1.
+        """
+        if concurrency < 1:
+            raise ValueError("Invalid concurrency, must be at least 1.")
+
+        client = self.client
+        fetch = client.GET_getConsoleMatch if self.console else client.GET_getMatch
+        matchIds: asyncio.Queue = asyncio.Queue()
+        results: asyncio.Queue = asyncio.Queue(maxsize=concurrency)
+
+        async def poller():
+            try:
+                await self.run(matchIds)
+            except Exception as exc:
+                # Polling errors are retried by batches(), anything else is raised to the consumer.
+                await results.put(exc)
+
+        async def worker():
+            while True:
+                matchId = await matchIds.get()
+                try:
+                    result = await fetch(matchId, self.region)
+                except Exception as exc:
+                    result = exc
+                await results.put((matchId, result))
+
+        tasks = [asyncio.ensure_future(poller())] + [asyncio.ensure_future(worker()) for _ in range(concurrency)]
+        try:
+            while True:
+                item = await results.get()
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def run(self, queue: asyncio.Queue):
+        """Poll forever, putting every new match id on ``queue``.
+
+        :param queue: The queue to put match ids on.
+        :type queue: asyncio.Queue
+        """
+        async for matchId in self:
+            await queue.put(matchId)
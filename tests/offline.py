@@ -0,0 +1,98 @@
+"""Helpers shared by the offline tests: a local server answering with scripted responses, and a test runner."""
+import asyncio
+import inspect
+import sys
+
+from aiohttp import web
+
+import valaw
+
+failures = []
+FAST_RETRIES = valaw.RetryPolicy(max_retries=3, backoff_base=0.01)
+RECENT = {"currentTime": 0, "matchIds": ["a"]}
+
+
+def fail(msg):
+    print(f"FAIL: {msg}")
+    failures.append(msg)
+
+
+def check(condition, msg):
+    if not condition:
+        fail(msg)
+
+
+class Server:
+    """A local server answering each path with its scripted responses in order, repeating the last one."""
+
+    def __init__(self):
+        self.responses = {}
+        self.requests = []
+        self.runner = None
+        self.port = None
+
+    def script(self, path, *responses):
+        """Set the (status, body, headers) responses of a path, such as "/na/val/content/v1/contents"."""
+        self.responses[path] = list(responses)
+
+    async def handle(self, request):
+        self.requests.append(request)
+        queue = self.responses.get(request.path)
+        if not queue:
+            return web.json_response({"status": {"message": "Not found", "status_code": 404}}, status=404)
+        status, body, headers = queue.pop(0) if len(queue) > 1 else queue[0]
+        if callable(body):
+            body = await body(request)
+        return web.json_response(body, status=status, headers=headers)
+
+    def hits(self, path):
+        return sum(request.path == path for request in self.requests)
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.port}/{{route}}"
+
+    async def __aenter__(self):
+        app = web.Application()
+        app.router.add_route("GET", "/{tail:.*}", self.handle)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        return self
+
+    async def __aexit__(self, *args):
+        await self.runner.cleanup()
+
+
+def client(server, **kwargs):
+    kwargs.setdefault("retry_policy", FAST_RETRIES)
+    kwargs.setdefault("coalesce", False)
+    return valaw.Client(kwargs.pop("token", "key"), "americas", base_url=server.base_url, **kwargs)
+
+
+async def _run(tests):
+    for test in tests:
+        try:
+            if inspect.iscoroutinefunction(test):
+                await asyncio.wait_for(test(), 30)
+            else:
+                test()
+        except Exception as e:
+            fail(f"{test.__name__}: {type(e).__name__}: {e}")
+        else:
+            print(f"ok: {test.__name__}")
+
+
+def run(tests):
+    """Run test functions, sync or async, and exit with status 1 if any check failed."""
+    asyncio.run(_run(tests))
+
+    if failures:
+        print(f"\n{len(failures)} test(s) failed:")
+        for f in failures:
+            print(f"  - {f}")
+        sys.exit(1)
+
+    print("All tests passed.")
@@ -0,0 +1,161 @@
+"""Match analytics, checked against a plain per-round loop and a match small enough to compute by hand."""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks import payloads  # noqa: E402
+from offline import check, run  # noqa: E402
+from valaw.analytics import COLUMNS, TRADE_WINDOW_MILLIS, PlayerStats  # noqa: E402
+
+try:
+    import numpy  # noqa: F401
+except ImportError:
+    numpy = None
+
+
+def reference(matches, trade_window=TRADE_WINDOW_MILLIS):
+    """Compute the PlayerStats columns round by round, one row per player and match."""
+    rows = []
+    for match in matches:
+        team = {player["puuid"]: player["teamId"] for player in match["players"] if not player.get("isObserver")}
+        totals = {puuid: dict.fromkeys(COLUMNS, 0) for puuid in team}
+        for puuid in team:
+            totals[puuid]["matches"] = 1
+        for roundResult in match["roundResults"]:
+            kills = [kill for stats in roundResult["playerStats"] for kill in stats["kills"] or ()]
+            firstDeath = {}
+            for kill in kills:
+                if kill["victim"] in team:
+                    firstDeath[kill["victim"]] = min(firstDeath.get(kill["victim"], kill["timeSinceRoundStartMillis"]), kill["timeSinceRoundStartMillis"])
+            if kills:
+                first = min(kills, key=lambda kill: kill["timeSinceRoundStartMillis"])
+                if first["killer"] in team:
+                    totals[first["killer"]]["firstKills"] += 1
+                if first["victim"] in team:
+                    totals[first["victim"]]["firstDeaths"] += 1
+            enemyKills = {}
+            assisted = set()
+            for kill in kills:
+                killer, victim = kill["killer"], kill["victim"]
+                if victim in team:
+                    totals[victim]["deaths"] += 1
+                if killer in team and victim in team and team[killer] != team[victim]:
+                    totals[killer]["kills"] += 1
+                    enemyKills[killer] = enemyKills.get(killer, 0) + 1
+                for assistant in kill["assistants"] or ():
+                    if assistant in team:
+                        totals[assistant]["assists"] += 1
+                        assisted.add(assistant)
+            for killer, count in enemyKills.items():
+                if count >= 2:
+                    totals[killer][("twoKills", "threeKills", "fourKills", "fiveKills")[min(count, 5) - 2]] += 1
+            for stats in roundResult["playerStats"]:
+                puuid = stats["puuid"]
+                if puuid not in team:
+                    continue
+                row = totals[puuid]
+                row["roundsPlayed"] += 1
+                row["score"] += stats["score"]
+                row["spent"] += stats["economy"]["spent"]
+                row["loadoutValue"] += stats["economy"]["loadoutValue"]
+                for hit in stats["damage"] or ():
+                    if hit["receiver"] in team and team[hit["receiver"]] != team[puuid]:
+                        for name in ("damage", "headshots", "bodyshots", "legshots"):
+                            row[name] += hit[name]
+                traded = any(
+                    kill["victim"] == puuid and kill["killer"] in firstDeath
+                    and 0 <= firstDeath[kill["killer"]] - kill["timeSinceRoundStartMillis"] <= trade_window
+                    for kill in kills
+                )
+                if puuid in enemyKills or puuid in assisted or puuid not in firstDeath or traded:
+                    row["kastRounds"] += 1
+        rows.extend(totals.values())
+    return rows
+
+
+def player(puuid, teamId):
+    return {"puuid": puuid, "teamId": teamId, "isObserver": False}
+
+
+def kill(killer, victim, time, assistants=()):
+    return {"killer": killer, "victim": victim, "timeSinceRoundStartMillis": time, "assistants": list(assistants)}
+
+
+def stats(puuid, kills=(), damage=(), score=100):
+    return {"puuid": puuid, "kills": list(kills), "damage": list(damage), "score": score, "economy": {"spent": 1000, "loadoutValue": 2000}}
+
+
+def hand_match():
+    """A and B play for Red, C and D for Blue, and O watches."""
+    return {
+        "matchInfo": {"matchId": "hand"},
+        "players": [player("A", "Red"), player("B", "Red"), player("C", "Blue"), player("D", "Blue"), {"puuid": "O", "teamId": "Neutral", "isObserver": True}],
+        "roundResults": [
+            {"playerStats": [
+                # A opens on C with B's help. D kills A too late to trade C, and B trades A.
+                stats("A", [kill("A", "C", 1000, ["B"])], [
+                    {"receiver": "C", "damage": 150, "headshots": 1, "bodyshots": 2, "legshots": 0},
+                    {"receiver": "B", "damage": 30, "headshots": 0, "bodyshots": 1, "legshots": 0},
+                ], score=200),
+                stats("B", [kill("B", "D", 8000)], [{"receiver": "D", "damage": 100, "headshots": 0, "bodyshots": 3, "legshots": 1}], score=200),
+                stats("C", score=200),
+                stats("D", [kill("D", "A", 7000)], score=200),
+            ]},
+            {"playerStats": [
+                # D opens on B, then dies to A at 3000, which trades B. C kills D again at 9000,
+                # listed after A's kill, so D's first death must not be overwritten by the later one.
+                stats("A", [kill("A", "D", 3000), kill("A", "C", 4000)]),
+                stats("B"),
+                stats("C", [kill("C", "D", 9000)]),
+                stats("D", [kill("D", "B", 1000)]),
+            ]},
+        ],
+    }
+
+
+def test_hand_computed_match():
+    if numpy is None:
+        print("skip: test_hand_computed_match needs numpy")
+        return
+    result = PlayerStats.from_matches(hand_match())
+    check([puuid.decode() for puuid in result.puuids] == ["A", "B", "C", "D"], "analytics: observers should be left out")
+    expected = {
+        "kills": [3, 1, 0, 2], "deaths": [1, 1, 2, 3], "assists": [0, 1, 0, 0], "damage": [150, 100, 0, 0],
+        "headshots": [1, 0, 0, 0], "bodyshots": [2, 3, 0, 0], "legshots": [0, 1, 0, 0],
+        "firstKills": [1, 0, 0, 1], "firstDeaths": [0, 1, 1, 0], "twoKills": [1, 0, 0, 0],
+        "kastRounds": [2, 2, 0, 2], "roundsPlayed": [2, 2, 2, 2], "score": [300, 300, 300, 300], "spent": [2000, 2000, 2000, 2000],
+    }
+    for name, values in expected.items():
+        check(result.columns[name].tolist() == values, f"analytics: {name} should be {values}, got {result.columns[name].tolist()}")
+    check(result.kd.tolist()[:2] == [3.0, 1.0] and result.acs.tolist()[0] == 150.0, "analytics: rates should follow the totals")
+    check(result.kast_percent.tolist() == [100.0, 100.0, 0.0, 100.0], f"analytics: unexpected KAST {result.kast_percent.tolist()}")
+    row = result.to_dicts()[1]
+    check(row["puuid"] == "B" and row["matchId"] == "hand" and row["assists"] == 1, f"analytics: unexpected row {row}")
+
+
+def test_matches_agree_with_the_per_round_loop():
+    if numpy is None:
+        print("skip: test_matches_agree_with_the_per_round_loop needs numpy")
+        return
+    # The benchmark matches have players dying several times a round, listed in killer order.
+    matches = [payloads.make_match(seed, rounds=12) for seed in range(4)] + [hand_match()]
+    result = PlayerStats.from_matches(matches)
+    expected = reference(matches)
+    check(len(result) == len(expected), "analytics: one row per player and match")
+    for name in COLUMNS:
+        got = result.columns[name].tolist()
+        want = [row[name] for row in expected]
+        check(got == want, f"analytics: {name} differs from the per-round loop at rows {[i for i, (a, b) in enumerate(zip(got, want)) if a != b][:5]}")
+    for window in (0, 20000):
+        got = PlayerStats.from_matches(matches, trade_window=window).kastRounds.tolist()
+        check(got == [row["kastRounds"] for row in reference(matches, window)], f"analytics: KAST with a {window}ms trade window differs from the per-round loop")
+
+
+TESTS = [
+    test_hand_computed_match,
+    test_matches_agree_with_the_per_round_loop,
+]
+
+
+if __name__ == "__main__":
+    run(TESTS)
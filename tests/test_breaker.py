@@ -0,0 +1,69 @@
+"""The per-region circuit breaker: opening on failures, probing when half open, and closing again."""
+import asyncio
+
+import valaw
+from offline import Server, check, client, fail, run
+
+PLATFORM = "/{region}/val/status/v1/platform-data"
+UNAVAILABLE = (503, {"status": {"message": "Unavailable", "status_code": 503}}, {})
+HEALTHY = (200, {"id": "NA", "maintenances": [], "incidents": []}, {})
+
+
+async def expect(call, error, msg):
+    try:
+        await call
+        fail(f"{msg}: {error.__name__} should be raised")
+    except error as e:
+        return e
+
+
+async def test_breaker_opens_probes_and_closes():
+    na = PLATFORM.format(region="na")
+    async with Server() as server:
+        server.script(na, UNAVAILABLE, UNAVAILABLE, UNAVAILABLE, HEALTHY)
+        server.script(PLATFORM.format(region="eu"), HEALTHY)
+        policy = valaw.CircuitBreakerPolicy(failure_threshold=2, reset_timeout=0.2, platform_hints=False)
+        async with client(server, circuit_breaker=policy, retry_policy=None, raw_data=True) as c:
+            breaker = c._breaker
+            for _ in range(2):
+                await expect(c.GET_getPlatformData("na"), valaw.Exceptions.RiotAPIResponseError, "breaker: a 503")
+            check(breaker.state("na") == "open", f"breaker: 2 failures should open the circuit, got {breaker.state('na')}")
+            error = await expect(c.GET_getPlatformData("na"), valaw.Exceptions.CircuitOpen, "breaker: an open circuit")
+            check(error.route == "na" and 0 < error.retry_in <= 0.2, f"breaker: unexpected CircuitOpen {error.route} {error.retry_in}")
+            check(server.hits(na) == 2, "breaker: an open circuit should not send requests")
+            check((await c.GET_getPlatformData("eu"))["id"] == "NA", "breaker: other regions should not be affected")
+
+            # The first probe fails and opens the circuit again.
+            await asyncio.sleep(0.2)
+            check(breaker.state("na") == "half_open", "breaker: the circuit should be half open after reset_timeout")
+            await expect(c.GET_getPlatformData("na"), valaw.Exceptions.RiotAPIResponseError, "breaker: a failed probe")
+            check(breaker.state("na") == "open", "breaker: a failed probe should open the circuit again")
+
+            # The second probe succeeds and closes it. Only one probe is let through at a time.
+            await asyncio.sleep(0.2)
+            probe, other = await asyncio.gather(c.GET_getPlatformData("na"), c.GET_getPlatformData("na"), return_exceptions=True)
+            check(isinstance(probe, dict) and isinstance(other, valaw.Exceptions.CircuitOpen), f"breaker: one probe should be let through, got {probe!r} and {other!r}")
+            check(breaker.state("na") == "closed", "breaker: a successful probe should close the circuit")
+            await c.GET_getPlatformData("na")
+            check(server.hits(na) == 5, f"breaker: a closed circuit should send requests again, got {server.hits(na)} requests")
+
+
+def test_platform_hints_lower_the_threshold():
+    breaker = valaw.breaker.CircuitBreaker(valaw.CircuitBreakerPolicy(failure_threshold=5))
+    breaker.hint("na", {"maintenances": [{"maintenance_status": "in_progress"}], "incidents": []})
+    check(breaker.allow("na") is None, "breaker: a closed circuit should allow requests")
+    breaker.record("na", False)
+    check(breaker.state("na") == "open", "breaker: a route under maintenance should open after one failure")
+    breaker.hint("eu", {"maintenances": [], "incidents": [{"incident_severity": "critical", "archived_at": "2024-01-01"}]})
+    breaker.record("eu", False)
+    check(breaker.state("eu") == "closed", "breaker: an archived incident should not lower the threshold")
+
+
+TESTS = [
+    test_breaker_opens_probes_and_closes,
+    test_platform_hints_lower_the_threshold,
+]
+
+
+if __name__ == "__main__":
+    run(TESTS)
@@ -0,0 +1,74 @@
+"""Response caching with MemoryCache and per-method TTLs."""
+import asyncio
+
+import valaw
+from offline import Server, check, client, run
+
+
+async def test_memory_cache_expires_entries():
+    cache = valaw.MemoryCache()
+    await cache.set("short", 1, 0.05)
+    await cache.set("forever", 2, None)
+    check(await cache.get("short") == 1, "cache: a fresh entry should be returned")
+    await asyncio.sleep(0.06)
+    check(await cache.get("short") is None, "cache: an expired entry should be dropped")
+    check(await cache.get("forever") == 2 and len(cache) == 1, "cache: an entry without TTL should never expire")
+
+
+async def test_memory_cache_evicts_least_recently_used():
+    cache = valaw.MemoryCache(maxsize=2)
+    await cache.set("a", 1)
+    await cache.set("b", 2)
+    await cache.get("a")
+    await cache.set("c", 3)
+    check([await cache.get(key) for key in "abc"] == [1, None, 3], "cache: the least recently used entry should be evicted")
+    await cache.delete("a")
+    check(len(cache) == 1, "cache: delete should remove the entry")
+    await cache.clear()
+    check(len(cache) == 0, "cache: clear should remove every entry")
+
+
+async def test_client_cache_ttl_overrides():
+    path = "/na/val/content/v1/contents"
+    async with Server() as server:
+        server.script(path, (200, {"version": "1"}, {}))
+        for ttls, expected in ((None, 1), ({"GET_getContent": 0}, 3), ({"GET_getContent": None}, 1)):
+            server.requests.clear()
+            cache = valaw.MemoryCache()
+            async with client(server, raw_data=True, cache=cache, cache_ttls=ttls) as c:
+                for _ in range(3):
+                    await c.GET_getContent("na")
+            check(server.hits(path) == expected, f"cache_ttls={ttls}: {expected} request(s) should be sent, got {server.hits(path)}")
+            if ttls == {"GET_getContent": None}:
+                check(all(expires is None for expires, _ in cache._entries.values()), "cache_ttls: None should never expire")
+
+        server.requests.clear()
+        server.script("/americas/riot/account/v1/accounts/me", (200, {"puuid": "p"}, {}))
+        async with client(server, raw_data=True, cache=valaw.MemoryCache()) as c:
+            for _ in range(2):
+                await c.GET_getByAccessToken("token")
+        check(server.hits("/americas/riot/account/v1/accounts/me") == 2, "cache: calls with an access token should never be cached")
+
+
+async def test_only_completed_matches_are_cached():
+    async with Server() as server:
+        server.script("/na/val/match/v1/matches/live", (200, {"matchInfo": {"matchId": "live", "isCompleted": False}}, {}))
+        server.script("/na/val/match/v1/matches/done", (200, {"matchInfo": {"matchId": "done", "isCompleted": True}}, {}))
+        async with client(server, raw_data=True, cache=valaw.MemoryCache()) as c:
+            for _ in range(2):
+                await c.GET_getMatch("live", "na")
+                await c.GET_getMatch("done", "na")
+        check(server.hits("/na/val/match/v1/matches/live") == 2, "cache: a match in progress should not be cached")
+        check(server.hits("/na/val/match/v1/matches/done") == 1, "cache: a completed match should be cached")
+
+
+TESTS = [
+    test_memory_cache_expires_entries,
+    test_memory_cache_evicts_least_recently_used,
+    test_client_cache_ttl_overrides,
+    test_only_completed_matches_are_cached,
+]
+
+
+if __name__ == "__main__":
+    run(TESTS)
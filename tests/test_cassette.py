@@ -0,0 +1,67 @@
+"""Cassette recording and replay."""
+import os
+import tempfile
+
+import valaw
+from offline import RECENT, Server, check, client, fail, run
+
+
+### Cassettes ###
+async def test_cassette_record_does_not_replay_session_responses():
+    path = os.path.join(tempfile.mkdtemp(), "test.cassette")
+    async with Server() as server:
+        server.script("/na/val/match/v1/recent-matches/by-queue/competitive", (503, {}, {}), (200, RECENT, {}))
+        async with client(server, cassette=valaw.Cassette(path, "record")) as c:
+            recent = await c.GET_getRecent("competitive", "na")
+            check(recent.matchIds == ["a"], "record mode: retry should reach the server after a recorded 503")
+            await c.GET_getRecent("competitive", "na")
+        check(server.hits("/na/val/match/v1/recent-matches/by-queue/competitive") == 3, "record mode: every request should reach the server")
+
+        cassette = valaw.Cassette(path, "replay")
+        async with client(server, cassette=cassette) as c:
+            for _ in range(3):
+                recent = await c.GET_getRecent("competitive", "na")
+            check(recent.matchIds == ["a"], "replay mode: the last successful response should be repeated")
+        check(server.hits("/na/val/match/v1/recent-matches/by-queue/competitive") == 3, "replay mode: nothing should be sent")
+
+        # Auto mode replays the loaded records once, then goes back to the network.
+        async with client(server, cassette=valaw.Cassette(path, "auto"), retry_policy=None) as c:
+            for _ in range(4):
+                try:
+                    await c.GET_getRecent("competitive", "na")
+                except valaw.Exceptions.RiotAPIResponseError:
+                    pass
+        check(server.hits("/na/val/match/v1/recent-matches/by-queue/competitive") == 4, "auto mode: requests past the recorded ones should be sent")
+
+
+async def test_cassette_keeps_keys_out_and_misses_unrecorded_urls():
+    path = os.path.join(tempfile.mkdtemp(), "test.cassette")
+    async with Server() as server:
+        server.script("/na/val/content/v1/contents", (200, {"version": "1"}, {"X-App-Rate-Limit": "20:1"}))
+        async with client(server, token="SECRET-KEY", cassette=valaw.Cassette(path, "record"), raw_data=True) as c:
+            await c.GET_getContent("na")
+    with open(path, "rb") as f:
+        check(b"SECRET-KEY" not in f.read(), "cassette: the API key should never be written")
+
+    cassette = valaw.Cassette(path, "replay")
+    record, = cassette.records
+    check(record.endpoint == "GET_getContent" and record.route == "na" and record.status == 200, f"cassette: the record should describe the request, got {record}")
+    check(dict(record.headers).get("X-App-Rate-Limit") == "20:1", "cassette: response headers should be kept")
+    async with valaw.Client("unused", "americas", base_url=server.base_url, cassette=cassette, rate_limit=False, raw_data=True) as c:
+        check((await c.GET_getContent("na"))["version"] == "1", "cassette: the recorded body should be replayed")
+        try:
+            await c.GET_getPlatformData("na")
+            fail("cassette: an unrecorded URL should raise CassetteMiss in replay mode")
+        except valaw.Exceptions.CassetteMiss:
+            pass
+    check(cassette.hits == 1, f"cassette: one request should be served from the file, got {cassette.hits}")
+
+
+TESTS = [
+    test_cassette_record_does_not_replay_session_responses,
+    test_cassette_keeps_keys_out_and_misses_unrecorded_urls,
+]
+
+
+if __name__ == "__main__":
+    run(TESTS)
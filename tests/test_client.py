@@ -7,6 +7,8 @@ import sys
 load_dotenv()
 
 RIOT_API_TOKEN = os.getenv("RIOT_API_TOKEN")
+# Path of a cassette file: responses are recorded to it when a token is set, and replayed from it otherwise.
+VALAW_CASSETTE = os.getenv("VALAW_CASSETTE")
 failures = []
 
 
@@ -29,9 +31,12 @@ async def request(fn):
 
 
 async def main():
-    if RIOT_API_TOKEN is None:
+    cassette = None
+    if VALAW_CASSETTE:
+        cassette = valaw.Cassette(VALAW_CASSETTE, "auto" if RIOT_API_TOKEN else "replay")
+    elif RIOT_API_TOKEN is None:
         raise ValueError("RIOT_API_TOKEN environment variable is not set.")
-    client = valaw.Client(RIOT_API_TOKEN, "americas")
+    client = valaw.Client(RIOT_API_TOKEN or "replay", "americas", cassette=cassette)
 
     try:
         # Get recent matches
@@ -70,6 +75,17 @@ async def main():
                 fail(f"GET_getByPuuid: {e}")
                 return None
 
+        async def safe_get_matches():
+            try:
+                results = [result async for result in client.get_matches(match_ids[:3], "na", concurrency=3)]
+                if len(results) != len(match_ids[:3]):
+                    fail("get_matches: not every match was returned")
+                for match_id, result in results:
+                    if isinstance(result, Exception):
+                        fail(f"get_matches: {match_id}: {result}")
+            except Exception as e:
+                fail(f"get_matches: {e}")
+
         async def safe_get_matchlist():
             try:
                 await request(lambda: client.GET_getMatchlist(player_puuid, "na"))
@@ -89,11 +105,12 @@ async def main():
             except Exception as e:
                 fail(f"GET_getPlatformData: {e}")
 
-        account_by_puuid, _, content, _ = await asyncio.gather(
+        account_by_puuid, _, content, _, _ = await asyncio.gather(
             safe_get_by_puuid(),
             safe_get_matchlist(),
             safe_get_content(),
             safe_get_platform_data(),
+            safe_get_matches(),
         )
 
         # Resolve active act from content (used by both PC and console leaderboards)
@@ -146,7 +163,16 @@ async def main():
                 except Exception as e:
                     fail(f"GET_getLeaderboard: {e}")
 
-            followup_tasks.append(safe_get_leaderboard())
+            async def safe_iter_leaderboard():
+                try:
+                    players = [player async for player in client.iter_leaderboard(act_id, "na", limit=30, pageSize=10, concurrency=3)]
+                    ranks = [player.leaderboardRank for player in players]
+                    if ranks != sorted(ranks):
+                        fail("iter_leaderboard: players are not in rank order")
+                except Exception as e:
+                    fail(f"iter_leaderboard: {e}")
+
+            followup_tasks.extend([safe_get_leaderboard(), safe_iter_leaderboard()])
         else:
             fail("GET_getLeaderboard: no active act found")
 
@@ -0,0 +1,53 @@
+"""Coalescing of identical in-flight requests."""
+import asyncio
+
+import valaw
+from offline import RECENT, Server, check, client, run
+
+
+async def test_identical_requests_share_one_response():
+    async with Server() as server:
+        async def slow(request):
+            await asyncio.sleep(0.1)
+            return {"version": "1"}
+        server.script("/na/val/content/v1/contents", (200, slow, {}))
+        async with client(server, coalesce=True, rate_limit=False, raw_data=True) as c:
+            results = await asyncio.gather(*(c.GET_getContent("na") for _ in range(5)), c.GET_getContent("na", "fr-FR"))
+            check(all(result["version"] == "1" for result in results), "coalescing: every caller should get the response")
+            check(server.hits("/na/val/content/v1/contents") == 2, f"coalescing: one request per distinct URL should be sent, got {server.hits('/na/val/content/v1/contents')}")
+            check(not c._inflight, "coalescing: finished requests should be forgotten")
+            await c.GET_getContent("na")
+        check(server.hits("/na/val/content/v1/contents") == 3, "coalescing: a later call should send a new request")
+
+
+async def test_coalesced_callers_keep_their_own_deadline():
+    async with Server() as server:
+        async def slow(request):
+            await asyncio.sleep(0.3)
+            return RECENT
+        server.script("/na/val/match/v1/recent-matches/by-queue/competitive", (200, slow, {}))
+        async with client(server, coalesce=True, rate_limit=False) as c:
+            url = f"{c._host('na')}/val/match/v1/recent-matches/by-queue/competitive"
+            results = await asyncio.gather(
+                c._request(url, c._headers, "na", "GET_getRecent", 0.1),
+                c._request(url, c._headers, "na", "GET_getRecent", None),
+                return_exceptions=True,
+            )
+            check(isinstance(results[0], valaw.Exceptions.DeadlineExceeded), f"coalescing: the short deadline should expire, got {results[0]!r}")
+            check(results[1] == RECENT, f"coalescing: the caller without a deadline should get the response, got {results[1]!r}")
+            check(server.hits("/na/val/match/v1/recent-matches/by-queue/competitive") == 1, "coalescing: one request should be sent")
+
+            # Once every caller has given up, the shared request is cancelled.
+            await asyncio.gather(*(c._request(url, c._headers, "na", "GET_getRecent", 0.05) for _ in range(2)), return_exceptions=True)
+            await asyncio.sleep(0)
+            check(not c._inflight, "coalescing: the shared request should be dropped once every caller gave up")
+
+
+TESTS = [
+    test_identical_requests_share_one_response,
+    test_coalesced_callers_keep_their_own_deadline,
+]
+
+
+if __name__ == "__main__":
+    run(TESTS)
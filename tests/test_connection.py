@@ -0,0 +1,56 @@
+"""The connection pool and timeouts set by ConnectionConfig."""
+import time
+
+import valaw
+from offline import Server, check, client, fail, run
+
+
+def test_connection_config_timeouts():
+    config = valaw.ConnectionConfig(connect_timeout=1, read_timeout=2, total_timeout=30)
+    timeout = config.timeout()
+    check((timeout.total, timeout.connect, timeout.sock_read) == (30, 1, 2), f"connection: unexpected default timeout {timeout}")
+    check(config.timeout(5).total == 5, "connection: a smaller total should lower the time limit")
+    check(config.timeout(60).total == 30, "connection: a larger total should not raise the time limit")
+    check(valaw.ConnectionConfig(total_timeout=None).timeout(5).total == 5, "connection: a total should apply without a default limit")
+
+
+async def test_connections_are_reused():
+    peers = []
+
+    async def platform(request):
+        peers.append(request.transport.get_extra_info("peername"))
+        return {"id": "NA"}
+
+    async with Server() as server:
+        server.script("/na/val/status/v1/platform-data", (200, platform, {}))
+        connection = valaw.ConnectionConfig(limit=5, keepalive_timeout=30, dns_cache_ttl=None)
+        async with client(server, raw_data=True, connection=connection) as c:
+            connector = c.session.connector
+            check((connector.limit, connector.limit_per_host) == (5, 0), "connection: the pool limits should be applied")
+            for _ in range(3):
+                await c.GET_getPlatformData("na")
+    check(len(peers) == 3 and len(set(peers)) == 1, f"connection: sequential requests should share one connection, got {set(peers)}")
+
+
+async def test_spent_deadline_is_not_sent_without_timeout():
+    check(valaw.ConnectionConfig().limit_per_host == 0, "connection: limit_per_host should default to aiohttp's 0")
+    async with Server() as server:
+        server.script("/na/val/content/v1/contents", (200, {"version": "1"}, {}))
+        async with client(server, rate_limit=False) as c:
+            try:
+                await c._send(f"{c._host('na')}/val/content/v1/contents", c._headers, "na", "GET_getContent", time.monotonic() - 1)
+                fail("spent deadline: DeadlineExceeded should be raised")
+            except valaw.Exceptions.DeadlineExceeded:
+                pass
+        check(not server.requests, "spent deadline: nothing should be sent")
+
+
+TESTS = [
+    test_connection_config_timeouts,
+    test_connections_are_reused,
+    test_spent_deadline_is_not_sent_without_timeout,
+]
+
+
+if __name__ == "__main__":
+    run(TESTS)
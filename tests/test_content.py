@@ -0,0 +1,136 @@
+"""The content index and the content manager that keeps it up to date."""
+import valaw
+from offline import Server, check, client, run
+from valaw.content import CATEGORIES, version_key
+from valaw.decoder import decode
+from valaw.objects import ContentItemDto
+
+JETT = "ADD6443A-41BD-E414-F6AD-E58D267F4E95"
+ASCENT = "7EAECC1B-4337-BBF6-6AB9-04B8F06B3319"
+SHARED = "D0A3F3BB-4A2B-4B6A-9C5E-1B2C3D4E5F60"
+EPISODE = "EA4B4EBD-4B4E-4A4C-8E8F-1A1A1A1A1A1A"
+ACT = "16118998-4705-5813-86DD-0292A2439D90"
+
+
+def item(name, id, path, **names):
+    return {"name": name, "id": id, "assetName": name, "assetPath": path, "localizedNames": names or None}
+
+
+def make_content(version="release-09.00"):
+    content = {category: [] for category in CATEGORIES}
+    content.update({
+        "version": version,
+        "characters": [item("Jett", JETT, "ShooterGame/Content/Characters/Wushu", fr_FR="Jett (fr)", ja_JP="ジェット")],
+        "maps": [item("Ascent", ASCENT, "/Game/Maps/Ascent/Ascent")],
+        # The skin and its first level use the same id.
+        "skins": [item("Prime Vandal", SHARED, "ShooterGame/Content/Skins/Prime")],
+        "skinLevels": [item("Prime Vandal Level 1", SHARED, "ShooterGame/Content/SkinLevels/Prime1")],
+        "acts": [
+            {"name": "EPISODE 9", "id": EPISODE, "isActive": True, "type": "episode"},
+            {"name": "ACT II", "id": "00000000-0000-0000-0000-000000000000", "isActive": False, "type": "act", "parentId": EPISODE},
+            {"name": "ACT I", "id": ACT, "isActive": True, "type": "act", "parentId": EPISODE},
+        ],
+    })
+    return content
+
+
+def test_content_index_lookups():
+    index = valaw.ContentIndex(make_content())
+    check(index.get(JETT.lower())["name"] == "Jett" and JETT.lower() in index, "content: ids should match in any case")
+    check(index.get(JETT, category="characters") is not None and index.get(JETT, category="maps") is None, "content: a category should restrict the lookup")
+    check(index.category(ASCENT) == "maps" and index.get("missing") is None, "content: category and missing ids")
+    check(index.by_asset_path("/game/maps/ascent/ascent")["name"] == "Ascent", "content: asset paths should match in any case")
+    check(index.name("/Game/Maps/Ascent/Ascent") == "Ascent", "content: name should accept an asset path")
+    check(index.name(JETT, "fr_fr") == "Jett (fr)" and index.name(JETT, "ja-JP") == "ジェット", "content: localized names should be projected")
+    check(index.name(ASCENT, "fr-FR") == "Ascent", "content: items without localized names should fall back to their name")
+    check(index.names("fr-FR") is index.names("fr-fr"), "content: a locale projection should be built once")
+    check(index.active_act["name"] == "ACT I" and index.active_episode["name"] == "EPISODE 9", "content: the active act and its episode should be found")
+    check(len(index.items("characters")) == 1 and len(index) == 7, f"content: unexpected item counts {len(index)}")
+
+
+def test_content_index_keeps_colliding_ids_apart():
+    index = valaw.ContentIndex(make_content())
+    check(index.get(SHARED, category="skins")["name"] == "Prime Vandal", "content: a skin should be found by its id")
+    check(index.get(SHARED, category="skinLevels")["name"] == "Prime Vandal Level 1", "content: a skin level with the same id should be found too")
+    check(index.get(SHARED)["name"] == "Prime Vandal" and index.category(SHARED) == "skins", "content: without a category the first list should win")
+    check(index.categories(SHARED) == ["skins", "skinLevels"], f"content: both lists should be reported, got {index.categories(SHARED)}")
+    check(sum(1 for _ in index) == len(index) == 7, "content: iteration should include every item")
+
+
+def test_content_index_decoded_and_cached():
+    content = make_content()
+    for entry in content["characters"] + content["maps"] + content["skins"] + content["skinLevels"]:
+        entry["localizedNames"] = None
+    decoded = valaw.ContentIndex(decode(valaw.objects.ContentDto, content))
+    check(isinstance(decoded.get(JETT), ContentItemDto) and decoded.name(ASCENT) == "Ascent", "content: decoded content should be indexed the same way")
+
+    valaw.ContentIndex.clear_cache()
+    first = valaw.ContentIndex.for_content(content)
+    check(valaw.ContentIndex.for_content(make_content()) is first, "content: the same version should reuse its index")
+    check(valaw.ContentIndex.for_content(make_content("release-09.01")) is not first, "content: a new version should get a new index")
+    check(valaw.ContentIndex.for_content(content, "fr-FR") is not first, "content: another locale should get a new index")
+    valaw.ContentIndex.clear_cache()
+    check(valaw.ContentIndex.for_content(content) is not first, "content: clear_cache should forget every index")
+    valaw.ContentIndex.clear_cache()
+
+
+async def test_content_manager_keeps_content_when_locales_disagree():
+    versions = {"en-US": "release-09.00", "fr-FR": "release-09.00"}
+
+    async def by_locale(request):
+        return make_content(versions[request.query["locale"]])
+
+    async with Server() as server:
+        server.script("/na/val/content/v1/contents", (200, by_locale, {}))
+        async with client(server) as c:
+            manager = valaw.ContentManager(c, "na", locales=["en-US", "fr-FR"])
+            check(await manager.refresh(), "content: the first refresh should load the content")
+            versions["en-US"] = "release-09.01"
+            check(not await manager.refresh(), "content: a lagging locale should keep the current content")
+            check(manager.version == "release-09.00", "content: the previous version should be kept")
+            versions["fr-FR"] = "release-09.01"
+            check(await manager.refresh() and manager.version == "release-09.01", "content: the next refresh should pick up the new version")
+
+
+def test_version_key_compares_numbers():
+    check(version_key("release-09.10-shipping-2-1") > version_key("release-09.9-shipping-7-1"), "content: 09.10 should come after 09.9")
+    check(version_key("release-10.00") > version_key("release-09.11"), "content: a new episode should come after the last act")
+    check(version_key(None) < version_key("release-00.00"), "content: a missing version should come first")
+
+
+async def test_content_manager_waits_for_the_numerically_newest_version():
+    async def scripted(*versions):
+        answers = {locale: list(pages) for locale, pages in versions}
+
+        async def by_locale(request):
+            pages = answers[request.query["locale"]]
+            content = make_content(pages.pop(0) if len(pages) > 1 else pages[0])
+            if content["version"] is None:
+                del content["version"]
+            return content
+
+        async with Server() as server:
+            server.script("/na/val/content/v1/contents", (200, by_locale, {}))
+            async with client(server) as c:
+                manager = valaw.ContentManager(c, "na", locales=["en-US", "fr-FR"])
+                return await manager.refresh(), manager.version
+
+    # fr-FR catches up with en-US on its second request.
+    loaded, version = await scripted(("en-US", ["release-09.10"]), ("fr-FR", ["release-09.9", "release-09.10"]))
+    check(loaded and version == "release-09.10", f"content: 09.10 should be waited for over 09.9, got {loaded} {version}")
+    loaded, version = await scripted(("en-US", ["release-09.00"]), ("fr-FR", [None, "release-09.00"]))
+    check(loaded and version == "release-09.00", f"content: a page without a version should be requested again, got {loaded} {version}")
+
+
+TESTS = [
+    test_content_index_lookups,
+    test_content_index_keeps_colliding_ids_apart,
+    test_content_index_decoded_and_cached,
+    test_content_manager_keeps_content_when_locales_disagree,
+    test_version_key_compares_numbers,
+    test_content_manager_waits_for_the_numerically_newest_version,
+]
+
+
+if __name__ == "__main__":
+    run(TESTS)
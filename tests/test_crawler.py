@@ -0,0 +1,116 @@
+"""The matchlist crawler: graph expansion, error handling, and resuming from checkpoints."""
+import shutil
+import tempfile
+
+import valaw
+from offline import Server, check, client, fail, run
+
+
+def match(matchId, puuids):
+    return {"matchInfo": {"matchId": matchId}, "players": [{"puuid": puuid} for puuid in puuids], "roundResults": []}
+
+
+def matchlist(puuid, *matchIds):
+    return {"puuid": puuid, "history": [{"matchId": matchId, "queueId": "competitive"} for matchId in matchIds]}
+
+
+def script(server, graph, players):
+    for matchId, puuids in graph.items():
+        server.script(f"/na/val/match/v1/matches/{matchId}", (200, match(matchId, puuids), {}))
+    for puuid in players:
+        matchIds = [matchId for matchId, puuids in graph.items() if puuid in puuids]
+        server.script(f"/na/val/match/v1/matchlists/by-puuid/{puuid}", (200, matchlist(puuid, *matchIds), {}))
+
+
+async def test_crawler_expands_breadth_first_and_fetches_each_match_once():
+    graph = {"m1": ["seed", "p1", "p2"], "m2": ["p1", "p3"], "m3": ["p2", "p3"], "m4": ["p3", "p4"]}
+    async with Server() as server:
+        script(server, graph, ["seed", "p1", "p2", "p3", "p4"])
+        async with client(server, raw_data=True) as c:
+            crawler = valaw.Crawler(c, "na", seeds=["seed"], concurrency=1, expected_players=1000, expected_matches=1000)
+            matchIds = [matchId async for matchId, _ in crawler.crawl()]
+            check(matchIds == ["m1", "m2", "m3", "m4"], f"crawler: matches should be found breadth-first, got {matchIds}")
+            check(all(server.hits(f"/na/val/match/v1/matches/{matchId}") == 1 for matchId in graph), "crawler: each match should be fetched once")
+            check(crawler.stats["players"] == 5 and crawler.stats["matches"] == 4, f"crawler: unexpected stats {crawler.stats}")
+
+            limited = valaw.Crawler(c, "na", seeds=["seed"], concurrency=1, max_depth=0, expected_players=1000, expected_matches=1000)
+            check([matchId async for matchId, _ in limited.crawl()] == ["m1"], "crawler: max_depth=0 should only expand the seeds")
+
+
+async def test_crawler_resumes_matches_that_were_not_yielded():
+    graph = {"m1": ["seed"], "m2": ["seed"], "m3": ["seed"]}
+    checkpoint = tempfile.mkdtemp()
+    crashed = checkpoint + "-crashed"
+    try:
+        async with Server() as server:
+            script(server, graph, ["seed"])
+            async with client(server, raw_data=True) as c:
+                crawler = valaw.Crawler(c, "na", seeds=["seed"], concurrency=1, expected_players=1000, expected_matches=1000, checkpoint=checkpoint)
+                crawl = crawler.crawl()
+                try:
+                    async for matchId, _ in crawl:
+                        # The consumer fails while handling the first match, after more were fetched.
+                        raise RuntimeError(matchId)
+                    fail("crawler: the consumer error should be raised")
+                except RuntimeError:
+                    pass
+                finally:
+                    await crawl.aclose()
+
+                resumed = valaw.Crawler(c, "na", concurrency=1, checkpoint=checkpoint)
+                matchIds = sorted([matchId async for matchId, _ in resumed.crawl()])
+                check(matchIds == ["m1", "m2", "m3"], f"crawler: matches not handled before the crash should be yielded after resuming, got {matchIds}")
+
+                again = valaw.Crawler(c, "na", concurrency=1, checkpoint=checkpoint)
+                check([matchId async for matchId, _ in again.crawl()] == [], "crawler: a finished crawl should not yield matches again")
+
+                # A checkpoint taken mid-crawl, as if the process died before the crawl could save again.
+                shutil.rmtree(checkpoint)
+                crawler = valaw.Crawler(c, "na", seeds=["seed"], concurrency=1, expected_players=1000, expected_matches=1000, checkpoint=checkpoint)
+                crawl = crawler.crawl()
+                first, _ = await crawl.__anext__()
+                await crawl.__anext__()
+                crawler.save()
+                shutil.copytree(checkpoint, crashed)
+                await crawl.aclose()
+                resumed = valaw.Crawler(c, "na", concurrency=1, checkpoint=crashed)
+                matchIds = sorted([first] + [matchId async for matchId, _ in resumed.crawl()])
+                check(matchIds == ["m1", "m2", "m3"], f"crawler: a mid-crawl checkpoint should keep the matches that were not yielded yet, got {matchIds}")
+    finally:
+        shutil.rmtree(checkpoint)
+        shutil.rmtree(crashed, ignore_errors=True)
+
+
+async def test_crawler_raises_worker_errors():
+    def priority(puuid, depth):
+        if depth:
+            raise ValueError("bad priority")
+        return depth
+
+    async with Server() as server:
+        server.script("/na/val/match/v1/matchlists/by-puuid/seed", (200, matchlist("seed", "m1"), {}))
+        server.script("/na/val/match/v1/matches/m1", (200, match("m1", ["seed", "p1"]), {}))
+        async with client(server, raw_data=True) as c:
+            checkpoint = tempfile.mkdtemp()
+            crawler = valaw.Crawler(c, "na", seeds=["seed"], concurrency=2, expected_players=1000, expected_matches=1000, checkpoint=checkpoint)
+            crawler.priority = priority
+            try:
+                async for _ in crawler.crawl():
+                    pass
+                fail("crawler: the priority error should be raised")
+            except ValueError:
+                pass
+            resumed = valaw.Crawler(c, "na", checkpoint=checkpoint)
+            check(len(resumed) == 1 and "m1" in resumed.matches, "crawler: the failed player should be saved to expand again")
+            shutil.rmtree(checkpoint)
+
+
+TESTS = [
+    test_crawler_expands_breadth_first_and_fetches_each_match_once,
+    test_crawler_resumes_matches_that_were_not_yielded,
+    test_crawler_raises_worker_errors,
+]
+
+
+if __name__ == "__main__":
+    run(TESTS)
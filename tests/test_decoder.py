@@ -0,0 +1,91 @@
+"""Compiled decoders, which must build the same objects as dataclass_wizard.fromdict."""
+import copy
+import os
+import sys
+
+from dataclass_wizard import fromdict
+from dataclass_wizard.errors import MissingFields
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks import payloads  # noqa: E402
+from offline import check, run  # noqa: E402
+from valaw.decoder import compile_decoder, decode  # noqa: E402
+from valaw.objects import AccountDto, ContentDto, LeaderboardDto, MatchDto, MatchlistDto, PlayerDto  # noqa: E402
+
+
+def same(cls, data, name):
+    expected = fromdict(cls, copy.deepcopy(data))
+    for decoded in (decode(cls, copy.deepcopy(data)), compile_decoder(cls)(copy.deepcopy(data))):
+        check(decoded == expected, f"decoder: {name} should decode like fromdict")
+        check(type(decoded) is type(expected), f"decoder: {name} should be a {cls.__name__}")
+    return expected
+
+
+def test_benchmark_payloads_decode_like_fromdict():
+    for seed in range(3):
+        same(MatchDto, payloads.make_match(seed), f"match {seed}")
+    same(MatchlistDto, payloads.make_matchlist("puuid"), "matchlist")
+    same(LeaderboardDto, payloads.make_leaderboard("act", size=50), "leaderboard")
+    same(ContentDto, payloads.make_content(items=20), "content")
+    same(ContentDto, payloads.make_content(items=20, locale="en-US"), "content without localizedNames")
+    same(AccountDto, payloads.make_account("puuid"), "account")
+
+
+def test_missing_keys_and_nulls_decode_like_fromdict():
+    same(AccountDto, {"puuid": "p"}, "account without optional keys")
+    same(AccountDto, {"puuid": "p", "gameName": None, "tagLine": None}, "account with nulls")
+    same(PlayerDto, {"leaderboardRank": 1, "rankedRating": 2, "numberOfWins": 3, "competitiveTier": 4}, "anonymous leaderboard player")
+    same(PlayerDto, {"leaderboardRank": 1, "rankedRating": 2, "numberOfWins": 3, "competitiveTier": 4, "puuid": None, "gameName": None}, "leaderboard player with nulls")
+
+    content = payloads.make_content(items=3)
+    for item in content["characters"]:
+        del item["localizedNames"], item["assetPath"]
+    for act in content["acts"]:
+        act.pop("parentId", None)
+        act["localizedNames"] = None
+    same(ContentDto, content, "content without optional keys")
+
+    match = payloads.make_match(0, rounds=2)
+    round = match["roundResults"][0]
+    for key in ("bombPlanter", "bombDefuser", "plantRoundTime", "plantLocation", "plantSite", "defusePlayerLocations"):
+        round[key] = None
+    match["players"][0]["stats"] = None
+    for stats in round["playerStats"]:
+        stats["abilityCasts"] = None
+        for kill in stats["kills"]:
+            kill["assistants"] = None
+    same(MatchDto, match, "match with null fields")
+
+    del match["coaches"]
+    raised = []
+    for decoder in (lambda data: fromdict(MatchDto, data), lambda data: decode(MatchDto, data), compile_decoder(MatchDto)):
+        try:
+            decoder(copy.deepcopy(match))
+        except MissingFields as e:
+            raised.append(e.missing_fields)
+    check(raised == [["coaches"]] * 3, f"decoder: a missing required key should raise like fromdict, got {raised}")
+
+
+def test_float_fields_given_as_ints_decode_like_fromdict():
+    match = payloads.make_match(0, rounds=2)
+    for stats in match["roundResults"][0]["playerStats"]:
+        for kill in stats["kills"]:
+            for location in kill["playerLocations"]:
+                location["viewRadians"] = 3
+    expected = same(MatchDto, match, "match with integer viewRadians")
+    kills = [kill for stats in expected.roundResults[0].playerStats for kill in stats.kills]
+    if kills:
+        decoded = decode(MatchDto, match).roundResults[0].playerStats
+        radians = [location.viewRadians for stats in decoded for kill in stats.kills for location in kill.playerLocations]
+        check(all(type(value) is float for value in radians), "decoder: integer floats should become floats")
+
+
+TESTS = [
+    test_benchmark_payloads_decode_like_fromdict,
+    test_missing_keys_and_nulls_decode_like_fromdict,
+    test_float_fields_given_as_ints_decode_like_fromdict,
+]
+
+
+if __name__ == "__main__":
+    run(TESTS)
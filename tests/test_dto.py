@@ -0,0 +1,51 @@
+"""Slotted data objects, which must still pickle, copy and work with the dataclasses helpers."""
+import copy
+import dataclasses
+import os
+import pickle
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks import payloads  # noqa: E402
+from offline import check, fail, run  # noqa: E402
+from valaw.decoder import decode  # noqa: E402
+from valaw.objects import LocationDto, MatchDto  # noqa: E402
+
+
+def test_decoded_match_pickles_and_deepcopies():
+    match = decode(MatchDto, payloads.make_match(0, rounds=3))
+    check(pickle.loads(pickle.dumps(match)) == match, "dto: a match should survive pickling")
+    check(copy.deepcopy(match) == match, "dto: a match should survive deepcopy")
+
+    location = match.roundResults[0].playerStats[0].kills[0].victimLocation
+    check(type(location).__dataclass_params__.frozen, "dto: LocationDto should be frozen")
+    check(pickle.loads(pickle.dumps(location)) == location, "dto: a frozen object should survive pickling")
+    check(copy.copy(location) == location, "dto: a frozen object should survive copy")
+
+
+def test_slotted_objects_have_no_dict():
+    match = decode(MatchDto, payloads.make_match(0, rounds=1))
+    location = LocationDto(1, 2)
+    for obj in (match, match.matchInfo, match.players[0], location):
+        check(not hasattr(obj, "__dict__"), f"dto: {type(obj).__name__} should not have a __dict__")
+    try:
+        match.matchInfo.extra = 1
+    except AttributeError:
+        pass
+    else:
+        fail("dto: slotted objects should not accept new attributes")
+
+    check(dataclasses.asdict(location) == {"x": 1, "y": 2}, "dto: asdict should work on slotted objects")
+    check(dataclasses.asdict(match)["matchInfo"]["matchId"] == match.matchInfo.matchId, "dto: asdict should recurse into a match")
+    moved = dataclasses.replace(location, y=3)
+    check(moved == LocationDto(1, 3) and location == LocationDto(1, 2), "dto: replace should return an updated copy")
+
+
+TESTS = [
+    test_decoded_match_pickles_and_deepcopies,
+    test_slotted_objects_have_no_dict,
+]
+
+
+if __name__ == "__main__":
+    run(TESTS)
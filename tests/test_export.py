@@ -0,0 +1,125 @@
+"""The match exporter, read back from the Parquet and Arrow files it writes."""
+import copy
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import valaw  # noqa: E402
+from benchmarks import payloads  # noqa: E402
+from offline import check, run  # noqa: E402
+from valaw.decoder import decode  # noqa: E402
+from valaw.export import TABLES  # noqa: E402
+from valaw.objects import MatchDto  # noqa: E402
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+
+def read(exporter, table):
+    if exporter.format == "parquet":
+        return pq.read_table(exporter.path(table))
+    with pa.ipc.open_stream(exporter.path(table)) as reader:
+        return reader.read_all()
+
+
+def expected_rows(matches):
+    rounds = [roundResult for match in matches for roundResult in match["roundResults"]]
+    stats = [playerStats for roundResult in rounds for playerStats in roundResult["playerStats"]]
+    return {
+        "matches": len(matches),
+        "players": sum(len(match["players"]) for match in matches),
+        "rounds": len(rounds),
+        "kills": sum(len(playerStats["kills"]) for playerStats in stats),
+        "damage": sum(len(playerStats["damage"]) for playerStats in stats),
+        "economy": len(stats),
+    }
+
+
+def test_exported_tables_match_the_matches():
+    if pa is None:
+        print("skip: test_exported_tables_match_the_matches needs pyarrow")
+        return
+    matches = [payloads.make_match(seed, rounds=3) for seed in range(3)]
+    rows = expected_rows(matches)
+    written = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for format in ("parquet", "arrow"):
+            # Two matches per batch, so the files hold more than one row group or record batch.
+            with valaw.MatchExporter(os.path.join(directory, format), format=format, batch_size=2) as exporter:
+                for match in matches:
+                    exporter.write(copy.deepcopy(match))
+            check(exporter.matches == 3 and exporter.rows == rows, f"export: {format} should count {rows}, got {exporter.rows}")
+            check(sorted(os.listdir(exporter.directory)) == sorted(os.path.basename(exporter.path(table)) for table in TABLES), f"export: {format} should write one file per table")
+            tables = written[format] = {table: read(exporter, table) for table in TABLES}
+            for table, columns in TABLES.items():
+                check(tables[table].column_names == [name for name, _ in columns], f"export: the {format} {table} columns should follow TABLES")
+                check(tables[table].num_rows == rows[table], f"export: the {format} {table} table should have {rows[table]} rows, got {tables[table].num_rows}")
+
+            match = matches[0]
+            info = tables["matches"].to_pylist()
+            check([row["matchId"] for row in info] == [match["matchInfo"]["matchId"] for match in matches], f"export: {format} matches should keep their order")
+            check(info[0]["gameStartMillis"] == match["matchInfo"]["gameStartMillis"] and info[0]["isRanked"] is True, f"export: unexpected {format} match row {info[0]}")
+            player = tables["players"].to_pylist()[0]
+            expected = match["players"][0]
+            check(
+                (player["puuid"], player["teamId"], player["kills"], player["accountLevel"]) == (expected["puuid"], expected["teamId"], expected["stats"]["kills"], expected["accountLevel"]),
+                f"export: unexpected {format} player row {player}",
+            )
+            kill = next(kill for stats in match["roundResults"][0]["playerStats"] for kill in stats["kills"])
+            row = tables["kills"].to_pylist()[0]
+            check(
+                row == {
+                    "matchId": match["matchInfo"]["matchId"], "roundNum": 0, "killer": kill["killer"], "victim": kill["victim"],
+                    "timeSinceGameStartMillis": kill["timeSinceGameStartMillis"], "timeSinceRoundStartMillis": kill["timeSinceRoundStartMillis"],
+                    "victimX": kill["victimLocation"]["x"], "victimY": kill["victimLocation"]["y"],
+                    "damageType": kill["finishingDamage"]["damageType"], "damageItem": kill["finishingDamage"]["damageItem"],
+                    "isSecondaryFireMode": False, "assistants": kill["assistants"],
+                },
+                f"export: unexpected {format} kill row {row}",
+            )
+            stats = match["roundResults"][0]["playerStats"][0]
+            economy = tables["economy"].to_pylist()[0]
+            check((economy["puuid"], economy["score"], economy["spent"]) == (stats["puuid"], stats["score"], stats["economy"]["spent"]), f"export: unexpected {format} economy row {economy}")
+
+        for table in TABLES:
+            check(written["parquet"][table].to_pylist() == written["arrow"][table].to_pylist(), f"export: the {table} table should be the same in both formats")
+
+        # MatchDto objects should be written like the raw dicts they were decoded from.
+        with valaw.MatchExporter(os.path.join(directory, "objects"), format="arrow", batch_size=2) as exporter:
+            for match in matches:
+                exporter.write(decode(MatchDto, copy.deepcopy(match)))
+        for table in TABLES:
+            check(read(exporter, table).to_pylist() == written["arrow"][table].to_pylist(), f"export: a decoded match should give the same {table} rows")
+
+
+def test_exporter_discards_files_on_error():
+    if pa is None:
+        print("skip: test_exporter_discards_files_on_error needs pyarrow")
+        return
+    match = {"matchInfo": {"matchId": "m1"}, "players": [], "roundResults": []}
+    with tempfile.TemporaryDirectory() as directory:
+        try:
+            with valaw.MatchExporter(directory, batch_size=1, tables=["matches"]) as exporter:
+                exporter.write(match)
+                raise RuntimeError("stop")
+        except RuntimeError:
+            pass
+        check(os.listdir(directory) == [], f"export: a failed export should leave no files, got {os.listdir(directory)}")
+
+        with valaw.MatchExporter(directory, tables=["matches"]) as exporter:
+            exporter.write(match)
+        check(os.listdir(directory) == ["matches.parquet"], f"export: a finished export should be moved into place, got {os.listdir(directory)}")
+
+
+TESTS = [
+    test_exported_tables_match_the_matches,
+    test_exporter_discards_files_on_error,
+]
+
+
+if __name__ == "__main__":
+    run(TESTS)
@@ -0,0 +1,75 @@
+"""Hedged requests: a duplicate of a slow match request, sent after the recent latency percentile."""
+import asyncio
+import time
+
+import valaw
+from offline import Server, check, client, run
+
+
+def test_latency_histogram_percentiles():
+    histogram = valaw.LatencyHistogram(window=100)
+    for index in range(100):
+        histogram.add(0.010 if index < 90 else 1.0)
+    check(0.010 <= histogram.percentile(0.9) < 0.0113, f"hedging: p90 should be the bucket of 10 ms, got {histogram.percentile(0.9)}")
+    check(1.0 <= histogram.percentile(0.95) < 1.13, f"hedging: p95 should be the bucket of 1 s, got {histogram.percentile(0.95)}")
+    for _ in range(100):
+        histogram.add(0.010)
+    check(histogram.percentile(0.99) < 0.0113 and histogram.total == 200, "hedging: only the latest window should be counted")
+
+    policy = valaw.HedgePolicy(min_samples=100, min_delay=0.05)
+    check(policy.delay(valaw.LatencyHistogram()) == float("inf"), "hedging: too few samples should never hedge")
+    check(policy.delay(histogram) == 0.05, "hedging: the delay should not go below min_delay")
+
+
+async def test_slow_request_is_hedged():
+    calls = 0
+
+    async def match(request):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            await asyncio.sleep(2)
+        return {"matchInfo": {"matchId": "m1"}, "call": calls}
+
+    async with Server() as server:
+        server.script("/na/val/match/v1/matches/m1", (200, match, {}))
+        server.script("/na/val/content/v1/contents", (200, {"version": "1"}, {}))
+        policy = valaw.HedgePolicy(min_samples=5, min_delay=0.01)
+        async with client(server, hedge_policy=policy, rate_limit=False, raw_data=True) as c:
+            for _ in range(5):
+                c._histogram("GET_getMatch").add(0.05)
+            started = time.monotonic()
+            result = await c.GET_getMatch("m1", "na")
+            elapsed = time.monotonic() - started
+            check(result["call"] == 2 and elapsed < 1, f"hedging: the duplicate should answer first, got call {result['call']} after {elapsed:.2f}s")
+            check(len(server.requests) == 2, f"hedging: exactly one duplicate should be sent, got {len(server.requests)} requests")
+
+            await c.GET_getContent("na")
+            check(server.hits("/na/val/content/v1/contents") == 1, "hedging: endpoints outside the policy should not be hedged")
+
+
+async def test_hedging_waits_for_rate_limit_slot():
+    async with Server() as server:
+        async def slow(request):
+            await asyncio.sleep(0.05)
+            return {"matchInfo": {"matchId": request.match_info["tail"]}}
+        # The first request discovers the limits, then two windows of 3 are full.
+        for index in range(7):
+            server.script(f"/na/val/match/v1/matches/m{index}", (200, slow, {"X-Method-Rate-Limit": "3:1", "X-App-Rate-Limit": "100:1"}))
+        policy = valaw.HedgePolicy(min_samples=1, min_delay=0.01)
+        async with client(server, hedge_policy=policy, raw_data=True) as c:
+            for _ in range(5):
+                c._histogram("GET_getMatch").add(0.01)
+            await asyncio.gather(*(c.GET_getMatch(f"m{index}", "na") for index in range(7)))
+        check(len(server.requests) == 7, f"saturated rate limit: no duplicates should be sent, got {len(server.requests)} requests")
+
+
+TESTS = [
+    test_latency_histogram_percentiles,
+    test_slow_request_is_hedged,
+    test_hedging_waits_for_rate_limit_slot,
+]
+
+
+if __name__ == "__main__":
+    run(TESTS)
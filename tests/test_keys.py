@@ -0,0 +1,96 @@
+"""The API key pool: spreading requests over keys and parking keys that fail."""
+from aiohttp import web
+
+import valaw
+from offline import Server, check, client, fail, run
+
+CONTENT = "/na/val/content/v1/contents"
+
+
+async def test_requests_are_spread_over_keys():
+    counts = {}
+
+    async def content(request):
+        token = request.headers["X-Riot-Token"]
+        counts[token] = counts.get(token, 0) + 1
+        return {"version": "1"}
+
+    async with Server() as server:
+        server.script(CONTENT, (200, content, {"X-App-Rate-Limit": "100:10", "X-Method-Rate-Limit": "100:10"}))
+        async with client(server, token=valaw.KeyPool(["k1", "k2"]), raw_data=True) as c:
+            for _ in range(6):
+                await c.GET_getContent("na")
+            limiters = {token: c.keys.limiters[token].headroom("na", "GET_getContent")[1] for token in ("k1", "k2")}
+    check(counts == {"k1": 3, "k2": 3}, f"key pool: requests should be spread evenly over the keys, got {counts}")
+    check(limiters["k1"] == limiters["k2"] < 1, f"key pool: each key should count its own requests, got {limiters}")
+
+
+def test_repeated_rate_limits_park_a_key():
+    pool = valaw.KeyPool(["k1", "k2"], park_seconds=60, park_after=2)
+    limited = {"X-Rate-Limit-Type": "application", "Retry-After": "120"}
+    pool.update("k1", "na", "GET_getContent", 429, limited, limited=False)
+    check(not pool.parked("k1"), "key pool: one 429 should not park a key")
+    pool.update("k1", "na", "GET_getContent", 200, {}, limited=False)
+    pool.update("k1", "na", "GET_getContent", 429, limited, limited=False)
+    check(not pool.parked("k1"), "key pool: a success should reset the 429 count")
+    pool.update("k1", "na", "GET_getContent", 429, limited, limited=False)
+    check(pool.parked("k1") and pool.available() == ["k2"], "key pool: park_after 429s in a row should park a key")
+    check(pool._parked_until["k1"] - pool._parked_until["k2"] > 110, "key pool: a key should stay parked for the Retry-After when it is longer")
+    check(pool.choose("na", "GET_getContent") == "k2", "key pool: a parked key should not be chosen")
+    pool.update("k2", "na", "GET_getContent", 429, {"X-Rate-Limit-Type": "service"}, limited=False)
+    pool.update("k2", "na", "GET_getContent", 429, {"X-Rate-Limit-Type": "service"}, limited=False)
+    check(not pool.parked("k2"), "key pool: service 429s are not the key's fault")
+    pool.unpark("k1")
+    check(len(pool.available()) == 2, "key pool: unpark should bring a key back")
+
+
+async def test_access_token_401_does_not_park_keys():
+    async with Server() as server:
+        server.script("/americas/riot/account/v1/accounts/me", (401, {"status": {"message": "Unauthorized", "status_code": 401}}, {}))
+        async with client(server, token=valaw.KeyPool(["k1", "k2", "k3"])) as c:
+            try:
+                await c.GET_getByAccessToken("expired")
+                fail("GET_getByAccessToken: a 401 should be raised")
+            except valaw.Exceptions.RiotAPIResponseError as e:
+                check(e.status_code == 401, "GET_getByAccessToken: the 401 should be raised")
+            check(server.hits("/americas/riot/account/v1/accounts/me") == 1, "access token 401: only one request should be sent")
+            check(len(c.keys.available()) == 3, "access token 401: no key should be parked")
+
+
+async def test_key_switching_is_bounded():
+    async with Server() as server:
+        path = "/na/val/content/v1/contents"
+        server.script(path, (403, {"status": {"message": "Forbidden", "status_code": 403}}, {}))
+        for park_seconds in (60.0, 0.0):
+            server.requests.clear()
+            async with client(server, token=valaw.KeyPool(["k1", "k2", "k3"], park_seconds=park_seconds)) as c:
+                try:
+                    await c.GET_getContent("na")
+                    fail("403 for every key: an error should be raised")
+                except valaw.Exceptions.RiotAPIResponseError:
+                    pass
+                check(server.hits(path) == 3, f"403 for every key: each key should be tried once (park_seconds={park_seconds})")
+                check(len(c.keys.available()) == 3, "403 for every key: the keys should not stay parked")
+
+        # Only one bad key: it is parked and the request succeeds with another one.
+        async def by_key(request):
+            if request.headers["X-Riot-Token"] == "bad":
+                raise web.HTTPForbidden()
+            return {"version": "1"}
+        server.script(path, (200, by_key, {}))
+        async with client(server, token=valaw.KeyPool(["bad", "good"]), raw_data=True) as c:
+            for _ in range(3):
+                check((await c.GET_getContent("na"))["version"] == "1", "one bad key: requests should succeed")
+            check(c.keys.available() == ["good"], "one bad key: it should be parked")
+
+
+TESTS = [
+    test_requests_are_spread_over_keys,
+    test_repeated_rate_limits_park_a_key,
+    test_access_token_401_does_not_park_keys,
+    test_key_switching_is_bounded,
+]
+
+
+if __name__ == "__main__":
+    run(TESTS)
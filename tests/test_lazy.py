@@ -0,0 +1,37 @@
+"""Matches decoded with lazy_rounds, which only decode roundResults when they are first read."""
+import gc
+import os
+import sys
+import weakref
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks import payloads  # noqa: E402
+from offline import Server, check, client, run  # noqa: E402
+from valaw.decoder import decode  # noqa: E402
+from valaw.objects import LazyMatchDto, MatchDto  # noqa: E402
+
+
+async def test_lazy_match_decodes_rounds_without_keeping_the_client():
+    body = payloads.make_match(0, rounds=3)
+    path = "/na/val/match/v1/matches/" + body["matchInfo"]["matchId"]
+    async with Server() as server:
+        server.script(path, (200, body, {}))
+        for fast_decode in (True, False):
+            c = client(server, lazy_rounds=True, fast_decode=fast_decode)
+            async with c:
+                match = await c.GET_getMatch(body["matchInfo"]["matchId"], "na")
+            check(type(match) is LazyMatchDto, "lazy: lazy_rounds should return a LazyMatchDto")
+            ref = weakref.ref(c)
+            del c
+            gc.collect()
+            check(ref() is None, "lazy: a deferred match should not keep its client alive")
+            check(match == decode(MatchDto, body), "lazy: the deferred rounds should decode like an eager match")
+
+
+TESTS = [
+    test_lazy_match_decodes_rounds_without_keeping_the_client,
+]
+
+
+if __name__ == "__main__":
+    run(TESTS)
@@ -0,0 +1,58 @@
+"""Leaderboard iteration with Client.iter_leaderboard."""
+import asyncio
+
+from offline import Server, check, client, fail, run
+
+LEADERBOARD = "/na/val/ranked/v1/leaderboards/by-act/act"
+
+
+async def test_iter_leaderboard_yields_players_in_rank_order():
+    in_flight, peak = 0, 0
+
+    async def page(request):
+        nonlocal in_flight, peak
+        size, start = int(request.query["size"]), int(request.query["startIndex"])
+        in_flight += 1
+        peak = max(peak, in_flight)
+        # Later pages answer first, so the iterator must reorder them.
+        await asyncio.sleep(0.05 / (1 + start // 10))
+        in_flight -= 1
+        players = [{"puuid": f"p{rank}", "leaderboardRank": rank + 1} for rank in range(start, min(start + size, 95))]
+        return {"actId": "act", "totalPlayers": 95, "players": players}
+
+    async with Server() as server:
+        server.script(LEADERBOARD, (200, page, {}))
+        async with client(server, raw_data=True) as c:
+            players = [player async for player in c.iter_leaderboard("act", "na", pageSize=10, concurrency=3)]
+            check([player["leaderboardRank"] for player in players] == list(range(1, 96)), "iter_leaderboard: every player should be yielded in rank order")
+            check(peak == 3, f"iter_leaderboard: up to 3 pages should be fetched at once, got {peak}")
+
+            requested = len(server.requests)
+            players = [player async for player in c.iter_leaderboard("act", "na", startIndex=15, limit=12, pageSize=10)]
+            check([player["leaderboardRank"] for player in players] == list(range(16, 28)), "iter_leaderboard: startIndex and limit should select a range")
+            sizes = [(int(request.query["startIndex"]), int(request.query["size"])) for request in server.requests[requested:]]
+            check(sizes == [(15, 10), (25, 2)], f"iter_leaderboard: the last page should only request what is left, got {sizes}")
+
+
+async def test_iter_leaderboard_with_zero_limit():
+    async with Server() as server:
+        async with client(server, raw_data=True) as c:
+            players = [player async for player in c.iter_leaderboard("act", "na", limit=0)]
+            check(players == [], f"iter_leaderboard: limit=0 should yield nothing, got {players}")
+            try:
+                async for _ in c.iter_leaderboard("act", "na", limit=-1):
+                    pass
+                fail("iter_leaderboard: a negative limit should raise ValueError")
+            except ValueError:
+                pass
+        check(not server.requests, "iter_leaderboard: nothing should be requested")
+
+
+TESTS = [
+    test_iter_leaderboard_yields_players_in_rank_order,
+    test_iter_leaderboard_with_zero_limit,
+]
+
+
+if __name__ == "__main__":
+    run(TESTS)
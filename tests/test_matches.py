@@ -0,0 +1,59 @@
+"""Bulk match fetching with Client.get_matches."""
+import asyncio
+
+import valaw
+from offline import Server, check, client, run
+
+
+async def test_get_matches_reports_each_failure():
+    in_flight, peak = 0, 0
+
+    def match(delay):
+        async def respond(request):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(delay)
+            in_flight -= 1
+            return {"matchInfo": {"matchId": request.path.rsplit("/", 1)[1]}}
+        return respond
+
+    async with Server() as server:
+        server.script("/na/val/match/v1/matches/slow", (200, match(0.2), {}))
+        server.script("/na/val/match/v1/matches/fast", (200, match(0.0), {}))
+        server.script("/na/val/match/v1/matches/gone", (404, {"status": {"message": "Not found", "status_code": 404}}, {}))
+        server.script("/na/val/match/v1/matches/last", (200, match(0.0), {}))
+        async with client(server, raw_data=True, rate_limit=False) as c:
+            results = [item async for item in c.get_matches(["slow", "fast", "gone", "last"], "na", concurrency=2)]
+
+    order = [matchId for matchId, _ in results]
+    check(sorted(order) == ["fast", "gone", "last", "slow"], f"get_matches: every id should be yielded once, got {order}")
+    check(order[-1] == "slow", f"get_matches: results should arrive in completion order, got {order}")
+    results = dict(results)
+    check(isinstance(results["gone"], valaw.Exceptions.RiotAPIResponseError) and results["gone"].status_code == 404, f"get_matches: the 404 should be yielded for its id, got {results['gone']!r}")
+    check(results["fast"]["matchInfo"]["matchId"] == "fast", "get_matches: successful matches should be yielded")
+    check(peak <= 2, f"get_matches: at most 2 matches should be fetched at once, got {peak}")
+
+
+async def test_get_matches_stops_when_the_loop_breaks():
+    async with Server() as server:
+        async def slow(request):
+            await asyncio.sleep(0.05)
+            return {"matchInfo": {}}
+        for index in range(20):
+            server.script(f"/na/val/match/v1/matches/m{index}", (200, slow, {}))
+        async with client(server, raw_data=True, rate_limit=False) as c:
+            async for _ in c.get_matches([f"m{index}" for index in range(20)], "na", concurrency=2):
+                break
+            await asyncio.sleep(0.2)
+        check(len(server.requests) <= 4, f"get_matches: breaking out should stop fetching, got {len(server.requests)} requests")
+
+
+TESTS = [
+    test_get_matches_reports_each_failure,
+    test_get_matches_stops_when_the_loop_breaks,
+]
+
+
+if __name__ == "__main__":
+    run(TESTS)
@@ -0,0 +1,87 @@
+"""Request metrics: counters, histograms, and the hooks called around every request."""
+import asyncio
+
+import valaw
+import valaw.metrics
+from offline import Server, check, client, fail, run
+
+CONTENT = "/na/val/content/v1/contents"
+
+
+async def test_metrics_without_hooks_build_no_events():
+    built = []
+    original = valaw.metrics.RequestEvent
+
+    def counting(*args):
+        built.append(args)
+        return original(*args)
+
+    metrics = valaw.Metrics()
+    valaw.metrics.RequestEvent = counting
+    try:
+        async with Server() as server:
+            server.script(CONTENT, (200, {"version": "1"}, {}))
+            async with client(server, metrics=metrics, cache=valaw.MemoryCache(), raw_data=True) as c:
+                for _ in range(3):
+                    await c.GET_getContent("na")
+    finally:
+        valaw.metrics.RequestEvent = original
+    check(built == [], f"metrics: no RequestEvent should be built without hooks, got {len(built)}")
+
+    snapshot = metrics.snapshot()
+    endpoint = snapshot["endpoints"]["GET_getContent"]
+    check(snapshot["requests"] == 3 and snapshot["statuses"] == {200: 1}, f"metrics: unexpected totals {snapshot['requests']} {snapshot['statuses']}")
+    check(endpoint["cache"] == {"hits": 2, "misses": 1, "hit_rate": 2 / 3}, f"metrics: unexpected cache counts {endpoint['cache']}")
+    check(endpoint["latency"]["count"] == 3 and snapshot["routes"]["na"]["requests"] == 3, "metrics: latency should be recorded per endpoint and route")
+    check('valaw_requests_total{endpoint="GET_getContent",route="na"} 3' in metrics.prometheus(), "metrics: the Prometheus output should hold the request count")
+
+
+async def test_metrics_hooks_see_each_request():
+    started, ended = [], []
+
+    async def on_end(event):
+        await asyncio.sleep(0)
+        ended.append(event)
+
+    metrics = valaw.Metrics(on_request_start=started.append, on_request_end=on_end)
+    async with Server() as server:
+        server.script(CONTENT, (200, {"version": "1"}, {}))
+        async with client(server, metrics=metrics, raw_data=True) as c:
+            await c.GET_getContent("na")
+            try:
+                await c.GET_getContent("xx")
+                fail("metrics: an invalid region should raise")
+            except valaw.Exceptions.InvalidRegion:
+                pass
+            try:
+                await c.GET_getPlatformData("na")
+                fail("metrics: a 404 should raise")
+            except valaw.Exceptions.RiotAPIResponseError:
+                pass
+    check(len(started) == 2 and [event.endpoint for event in ended] == ["GET_getContent", "GET_getPlatformData"], "metrics: the hooks should see every request sent")
+    check(ended[0].status == 200 and ended[0].duration > 0 and ended[0].error is None, "metrics: a successful event should be completed")
+    check(ended[1].status == 404 and isinstance(ended[1].error, valaw.Exceptions.RiotAPIResponseError), "metrics: a failed event should hold its error")
+    check(metrics.snapshot()["errors"] == 1, "metrics: the error should be counted")
+
+
+async def test_metrics_record_the_response_status():
+    events = []
+    metrics = valaw.Metrics(on_request_end=events.append)
+    async with Server() as server:
+        server.script("/na/val/content/v1/contents", (203, {"version": "1"}, {}))
+        for coalesce in (False, True):
+            events.clear()
+            async with client(server, metrics=metrics, coalesce=coalesce, raw_data=True) as c:
+                await asyncio.gather(c.GET_getContent("na"), c.GET_getContent("na"))
+            check([event.status for event in events] == [203, 203], f"metrics: the response status should be recorded (coalesce={coalesce}), got {[event.status for event in events]}")
+
+
+TESTS = [
+    test_metrics_without_hooks_build_no_events,
+    test_metrics_hooks_see_each_request,
+    test_metrics_record_the_response_status,
+]
+
+
+if __name__ == "__main__":
+    run(TESTS)
@@ -0,0 +1,30 @@
+"""Runs every offline test module, the tests that need no API key. A test_*.py module can also be run on its own."""
+from offline import run
+import test_cassette
+import test_ratelimit
+import test_retry
+import test_matches
+import test_coalescing
+import test_cache
+import test_store
+import test_decoder
+import test_dto
+import test_lazy
+import test_connection
+import test_leaderboard
+import test_snapshot
+import test_watcher
+import test_crawler
+import test_keys
+import test_breaker
+import test_hedging
+import test_metrics
+import test_content
+import test_analytics
+import test_export
+
+MODULES = [test_cassette, test_ratelimit, test_retry, test_matches, test_coalescing, test_cache, test_store, test_decoder, test_dto, test_lazy, test_connection, test_leaderboard, test_snapshot, test_watcher, test_crawler, test_keys, test_breaker, test_hedging, test_metrics, test_content, test_analytics, test_export]
+
+
+if __name__ == "__main__":
+    run([test for module in MODULES for test in module.TESTS])
@@ -0,0 +1,88 @@
+"""Rate limiting from the X-App-Rate-Limit and X-Method-Rate-Limit headers."""
+import asyncio
+import time
+
+from offline import Server, check, client, run
+from valaw.ratelimit import RateLimiter, RateLimitWindow, parse_rate_limit_header
+
+
+def test_parse_rate_limit_header():
+    check(parse_rate_limit_header("20:1,100:120") == [(20, 1), (100, 120)], "parse: both windows should be read")
+    check(parse_rate_limit_header(" 20:1, bad, 5:x") == [(20, 1)], "parse: malformed parts should be skipped")
+    check(parse_rate_limit_header(None) == [], "parse: a missing header should give no windows")
+
+
+def test_window_delay():
+    window = RateLimitWindow(2, 10)
+    window.record(0.0)
+    window.record(1.0)
+    check(window.delay(2.0) == 8.0, f"window: a full window should wait for its oldest request to expire, got {window.delay(2.0)}")
+    check(window.delay(10.5) == 0.0, "window: expired requests should free the window")
+    window.sync(3, 11.0)
+    check(len(window.timestamps) == 3, "window: the server count should raise the local count")
+
+    closed = RateLimitWindow(0, 10)
+    check(closed.delay(0.0) == 10, "window: a limit of 0 should block for the window duration")
+    check(closed.remaining(0.0) == 0.0, "window: a limit of 0 should leave nothing")
+
+
+### Rate Limits ###
+async def test_headerless_response_keeps_rate_limits():
+    limiter = RateLimiter()
+    headers = {"X-App-Rate-Limit": "5:120", "X-App-Rate-Limit-Count": "4:120", "X-Method-Rate-Limit": "100:120", "X-Method-Rate-Limit-Count": "1:120"}
+    await limiter.acquire("na", "m")
+    limiter.update("na", "m", 200, headers)
+    await limiter.acquire("na", "m")
+    limiter.update("na", "m", 503, {})
+    delay, remaining = limiter.headroom("na", "m")
+    check(delay > 0 and remaining == 0.0, f"headerless 503: the learned limits should still apply, got headroom {(delay, remaining)}")
+
+
+async def test_limiter_probes_then_paces():
+    limiter = RateLimiter()
+    await limiter.acquire("na", "m")
+    check(limiter.headroom("na", "m")[0] == float("inf"), "limiter: requests should wait while the first one discovers the limits")
+    limiter.update("na", "m", 200, {"X-Method-Rate-Limit": "3:1", "X-Method-Rate-Limit-Count": "1:1", "X-App-Rate-Limit": "100:1"})
+    started = time.monotonic()
+    waits = [await limiter.acquire("na", "m") for _ in range(3)]
+    check(waits[0] < 0.01 and waits[1] < 0.01, f"limiter: requests within the limit should not wait, got {waits}")
+    check(0.8 < time.monotonic() - started < 1.5, f"limiter: the request past the limit should wait for the window, got {waits}")
+    check(limiter.headroom("na", "other")[0] == 0.0, "limiter: method limits should not apply to other endpoints")
+
+
+async def test_limiter_blocks_on_429_retry_after():
+    limiter = RateLimiter()
+    await limiter.acquire("na", "m")
+    limiter.update("na", "m", 429, {"X-Method-Rate-Limit": "100:1", "X-App-Rate-Limit": "100:1", "Retry-After": "2", "X-Rate-Limit-Type": "method"})
+    delay, _ = limiter.headroom("na", "m")
+    check(1.5 < delay <= 2, f"limiter: a method 429 should block the method for Retry-After, got {delay}")
+    check(limiter.headroom("na", "other")[0] == 0.0, "limiter: a method 429 should not block other endpoints")
+
+
+async def test_client_paces_requests_from_headers():
+    sent = []
+
+    async def content(request):
+        sent.append(time.monotonic())
+        return {"version": "1"}
+
+    async with Server() as server:
+        server.script("/na/val/content/v1/contents", (200, content, {"X-Method-Rate-Limit": "2:1", "X-App-Rate-Limit": "100:1"}))
+        async with client(server, raw_data=True) as c:
+            await asyncio.gather(*(c.GET_getContent("na") for _ in range(4)))
+    # At 2 per second, the last two requests wait for the window to slide.
+    check(len(sent) == 4 and sent[1] - sent[0] < 0.5 and sent[3] - sent[0] >= 0.9, f"client: requests should be paced by the headers, got {[round(t - sent[0], 2) for t in sent]}")
+
+
+TESTS = [
+    test_parse_rate_limit_header,
+    test_window_delay,
+    test_headerless_response_keeps_rate_limits,
+    test_limiter_probes_then_paces,
+    test_limiter_blocks_on_429_retry_after,
+    test_client_paces_requests_from_headers,
+]
+
+
+if __name__ == "__main__":
+    run(TESTS)
@@ -0,0 +1,75 @@
+"""Retries of 429 and 5xx responses, Retry-After, jittered backoff and deadlines."""
+import time
+
+import valaw
+from offline import Server, check, client, fail, run
+
+PATH = "/na/val/content/v1/contents"
+UNAVAILABLE = (503, {"status": {"message": "Unavailable", "status_code": 503}}, {})
+
+
+def test_backoff_is_jittered_and_capped():
+    policy = valaw.RetryPolicy(backoff_base=1.0, backoff_max=5.0)
+    for attempt, cap in ((0, 1.0), (1, 2.0), (2, 4.0), (5, 5.0)):
+        delays = [policy.backoff(attempt) for _ in range(200)]
+        check(all(0 <= delay <= cap for delay in delays), f"backoff: attempt {attempt} should stay within [0, {cap}]")
+        check(len(set(delays)) > 1 and max(delays) > cap / 2, f"backoff: attempt {attempt} should be jittered over the whole range")
+
+
+async def test_429_waits_for_retry_after():
+    async with Server() as server:
+        server.script(PATH, (429, {"status": {"message": "Rate limit exceeded", "status_code": 429}}, {"Retry-After": "1"}), (200, {"version": "1"}, {}))
+        async with client(server, rate_limit=False, raw_data=True) as c:
+            started = time.monotonic()
+            content = await c.GET_getContent("na")
+            elapsed = time.monotonic() - started
+        check(content["version"] == "1", "429: the retry should succeed")
+        check(1.0 <= elapsed < 1.5, f"429: the retry should wait for Retry-After, took {elapsed:.2f}s")
+        check(server.hits(PATH) == 2, "429: one retry should be sent")
+
+
+async def test_5xx_retries_up_to_max_retries():
+    async with Server() as server:
+        server.script(PATH, UNAVAILABLE)
+        async with client(server, rate_limit=False, retry_policy=valaw.RetryPolicy(max_retries=2, backoff_base=0.01)) as c:
+            try:
+                await c.GET_getContent("na")
+                fail("5xx: the last error should be raised")
+            except valaw.Exceptions.RiotAPIResponseError as e:
+                check(e.status_code == 503, f"5xx: the 503 should be raised, got {e.status_code}")
+        check(server.hits(PATH) == 3, f"5xx: the request and 2 retries should be sent, got {server.hits(PATH)}")
+
+        server.requests.clear()
+        server.script(PATH, (404, {"status": {"message": "Not found", "status_code": 404}}, {}))
+        async with client(server, rate_limit=False) as c:
+            try:
+                await c.GET_getContent("na")
+            except valaw.Exceptions.RiotAPIResponseError:
+                pass
+        check(server.hits(PATH) == 1, "404: client errors should not be retried")
+
+
+async def test_retry_that_would_pass_the_deadline_is_not_attempted():
+    async with Server() as server:
+        server.script(PATH, (429, {"status": {"message": "Rate limit exceeded", "status_code": 429}}, {"Retry-After": "5"}))
+        async with client(server, rate_limit=False, deadline=0.5) as c:
+            started = time.monotonic()
+            try:
+                await c.GET_getContent("na")
+                fail("deadline: the 429 should be raised")
+            except valaw.Exceptions.RiotAPIResponseError as e:
+                check(e.status_code == 429 and e.retry_after == 5, "deadline: the 429 should be raised with its Retry-After")
+            check(time.monotonic() - started < 0.5, "deadline: the client should not sleep past the deadline")
+        check(server.hits(PATH) == 1, "deadline: no retry should be sent")
+
+
+TESTS = [
+    test_backoff_is_jittered_and_capped,
+    test_429_waits_for_retry_after,
+    test_5xx_retries_up_to_max_retries,
+    test_retry_that_would_pass_the_deadline_is_not_attempted,
+]
+
+
+if __name__ == "__main__":
+    run(TESTS)
@@ -0,0 +1,86 @@
+"""Leaderboard snapshots: building, diffing, and saving them as memory-mapped columns."""
+import shutil
+import tempfile
+
+import valaw
+from offline import Server, check, client, run
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def player(puuid, rank, rr, wins):
+    return {"puuid": puuid, "leaderboardRank": rank, "rankedRating": rr, "numberOfWins": wins, "competitiveTier": 27}
+
+
+OLDER = [player("a", 1, 500, 50), player("b", 2, 450, 40), player("", 3, 400, 30), player("c", 4, 350, 20), player("d", 5, 300, 10)]
+NEWER = [player("c", 1, 520, 25), player("a", 2, 510, 51), player("", 3, 400, 30), player("e", 4, 390, 5), player("b", 5, 380, 41)]
+
+
+def test_snapshot_diff():
+    if np is None:
+        print("skip: test_snapshot_diff needs numpy")
+        return
+    older = valaw.LeaderboardSnapshot.from_players(OLDER, actId="act")
+    newer = valaw.LeaderboardSnapshot.from_leaderboard({"actId": "act", "players": NEWER})
+    check(newer.actId == "act" and len(newer) == 5, "snapshot: from_leaderboard should read the act and every player")
+    check((newer.find("e"), newer.find("d"), newer.find("")) == (3, -1, -1), "snapshot: find should return the row, -1 when absent or private")
+
+    diff = newer.diff(older)
+    # c climbed 4 -> 1, a fell 1 -> 2, b fell 2 -> 5. The private row is never matched.
+    check(diff.puuids.tolist() == [b"c", b"a", b"b"], f"snapshot: matched players should follow the newer ranks, got {diff.puuids}")
+    check(diff.rank.tolist() == [3, -1, -3], f"snapshot: unexpected rank deltas {diff.rank}")
+    check(diff.rankedRating.tolist() == [170, 10, -70], f"snapshot: unexpected RR deltas {diff.rankedRating}")
+    check(diff.numberOfWins.tolist() == [5, 1, 1], f"snapshot: unexpected win deltas {diff.numberOfWins}")
+    check(diff.entered.tolist() == [b"e"] and diff.dropped.tolist() == [b"d"], f"snapshot: unexpected entered {diff.entered} or dropped {diff.dropped}")
+    check(diff.movers() == [("c", 3, 170), ("b", -3, -70), ("a", -1, 10)], f"snapshot: unexpected movers {diff.movers()}")
+    check(diff.movers(limit=1) == [("c", 3, 170)], "snapshot: movers should respect the limit")
+
+    unchanged = older.diff(older)
+    check(not unchanged.rank.any() and not len(unchanged.entered) and unchanged.movers() == [], "snapshot: a snapshot should not differ from itself")
+
+
+def test_snapshot_save_and_load():
+    if np is None:
+        print("skip: test_snapshot_save_and_load needs numpy")
+        return
+    directory = tempfile.mkdtemp()
+    try:
+        snapshot = valaw.LeaderboardSnapshot.from_players(NEWER, actId="act", region="na", platformType="playstation", takenAt=1700000000.0)
+        snapshot.save(directory)
+        for mmap in (True, False):
+            loaded = valaw.LeaderboardSnapshot.load(directory, mmap=mmap)
+            check(isinstance(loaded.rankedRating, np.memmap) == mmap, f"snapshot: load(mmap={mmap}) should {'' if mmap else 'not '}memory-map the columns")
+            check(loaded.puuids.tolist() == snapshot.puuids.tolist(), "snapshot: puuids should survive a round trip")
+            for name in valaw.leaderboard.COLUMNS:
+                check(np.array_equal(getattr(loaded, name), getattr(snapshot, name)), f"snapshot: {name} should survive a round trip")
+            meta = (loaded.actId, loaded.region, loaded.platformType, loaded.takenAt)
+            check(meta == ("act", "na", "playstation", 1700000000.0), f"snapshot: unexpected metadata {meta}")
+            check(loaded.diff(snapshot).movers() == [] and loaded.find("b") == 4, "snapshot: a loaded snapshot should diff and find like the original")
+            del loaded
+    finally:
+        shutil.rmtree(directory)
+
+
+async def test_snapshot_fetch():
+    if np is None:
+        print("skip: test_snapshot_fetch needs numpy")
+        return
+    async with Server() as server:
+        server.script("/na/val/ranked/v1/leaderboards/by-act/act", (200, {"actId": "act", "totalPlayers": 5, "players": NEWER}, {}))
+        async with client(server, raw_data=True) as c:
+            snapshot = await valaw.LeaderboardSnapshot.fetch(c, "act", "na")
+    check(snapshot.leaderboardRank.tolist() == [1, 2, 3, 4, 5] and snapshot.region == "na", "snapshot: fetch should store the whole leaderboard")
+
+
+TESTS = [
+    test_snapshot_diff,
+    test_snapshot_save_and_load,
+    test_snapshot_fetch,
+]
+
+
+if __name__ == "__main__":
+    run(TESTS)
@@ -0,0 +1,69 @@
+"""The SQLite match store and its write-through from GET_getMatch."""
+import os
+import tempfile
+import threading
+
+import valaw
+from offline import Server, check, client, run
+
+
+def match(matchId, start, queueId, puuids, completed=True):
+    return {"matchInfo": {"matchId": matchId, "gameStartMillis": start, "queueId": queueId, "isCompleted": completed}, "players": [{"puuid": puuid} for puuid in puuids]}
+
+
+def test_match_store_queries_and_persists():
+    path = os.path.join(tempfile.mkdtemp(), "matches.db")
+    with valaw.MatchStore(path) as store:
+        store.put_many([match("a", 1, "competitive", ["p1", "p2"]), match("b", 2, "unrated", ["p1"])])
+        store.put(b'{"matchInfo": {"matchId": "c", "gameStartMillis": 3, "queueId": "competitive"}, "players": [{"puuid": "p2"}]}')
+        store.put(match("a", 1, "competitive", ["p1", "p2", "p3"]))
+
+    with valaw.MatchStore(path) as store:
+        check(len(store) == 3 and "a" in store and "z" not in store, "store: matches should survive reopening")
+        check(store.match_ids() == ["c", "b", "a"], f"store: ids should be most recent first, got {store.match_ids()}")
+        check(store.match_ids(puuid="p1") == ["b", "a"], "store: the puuid filter should use the players")
+        check(store.match_ids(queueId="competitive", start=2) == ["c"], "store: the queue and start filters should combine")
+        check(store.match_ids(end=2, limit=5) == ["a"], "store: end should be exclusive")
+        check(store.get("a")["players"][2]["puuid"] == "p3", "store: put should replace a match with the same id")
+        check(store.get_raw("c").startswith(b'{"matchInfo"'), "store: a body should be stored as given")
+        check([m["matchInfo"]["matchId"] for m in store.matches(puuid="p2")] == ["c", "a"], "store: matches should take the same filters")
+        check(store.get("z") is None and store.get_raw("z") is None, "store: a missing match should be None")
+
+
+async def test_match_store_runs_off_the_event_loop():
+    store = valaw.MatchStore()
+    loop_thread = threading.get_ident()
+    threads, inserted = [], []
+    select, insert = store._select, store._insert
+
+    def recorded(method):
+        def call(*args):
+            threads.append(threading.get_ident())
+            if method is insert:
+                inserted.append(args[0])
+            return method(*args)
+        return call
+
+    store._select, store._insert = recorded(select), recorded(insert)
+
+    match = {"matchInfo": {"matchId": "m1", "isCompleted": True}, "players": [{"puuid": "p1"}]}
+    async with Server() as server:
+        server.script("/na/val/match/v1/matches/m1", (200, match, {}))
+        async with client(server, match_store=store, raw_bytes=True) as c:
+            body = await c.GET_getMatch("m1", "na")
+            check(await c.GET_getMatch("m1", "na") == body, "match store: the stored body should be returned")
+        check(server.hits("/na/val/match/v1/matches/m1") == 1, "match store: the second call should be served from the store")
+    check(inserted and isinstance(inserted[0], dict), "match store: the body parsed by the client should not be parsed again")
+    check(threads and loop_thread not in threads, "match store: SQLite should not run on the event loop thread")
+    check(store.match_ids(puuid="p1") == ["m1"], "match store: the players should be indexed")
+    store.close()
+
+
+TESTS = [
+    test_match_store_queries_and_persists,
+    test_match_store_runs_off_the_event_loop,
+]
+
+
+if __name__ == "__main__":
+    run(TESTS)
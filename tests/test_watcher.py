@@ -0,0 +1,81 @@
+"""The recent matches watcher: deduplication, polling through errors, and fetching while polling."""
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import valaw  # noqa: E402
+from benchmarks import payloads  # noqa: E402
+from offline import Server, check, client, run  # noqa: E402
+
+RECENT = "/na/val/match/v1/recent-matches/by-queue/competitive"
+
+
+async def test_watcher_emits_each_match_once():
+    async with Server() as server:
+        server.script(
+            RECENT,
+            (200, {"currentTime": 1, "matchIds": ["a", "b"]}, {}),
+            (200, {"currentTime": 1, "matchIds": ["a", "b"]}, {}),
+            (200, {"currentTime": 2, "matchIds": ["b", "c"]}, {}),
+        )
+        async with client(server, raw_data=True) as c:
+            watcher = valaw.RecentMatchesWatcher(c, "competitive", "na", min_interval=0.01, max_interval=0.01)
+            check(await watcher.poll() == ["a", "b"], "watcher: the first poll should emit every id")
+            check(await watcher.poll() == [], "watcher: an unchanged list should emit nothing")
+            check(await watcher.poll() == ["c"], "watcher: only new ids should be emitted")
+            check("a" in watcher and len(watcher) == 3, "watcher: emitted ids should be remembered")
+
+
+async def test_watcher_keeps_polling_after_errors():
+    async with Server() as server:
+        error = (503, {"status": {"message": "Unavailable", "status_code": 503}}, {})
+        server.script(RECENT, error, error, (200, {"currentTime": 1, "matchIds": ["a", "b"]}, {}))
+        async with client(server, retry_policy=None) as c:
+            watcher = valaw.RecentMatchesWatcher(c, "competitive", "na", min_interval=0.01, max_interval=0.01)
+            batches = watcher.batches()
+            check(await batches.__anext__() == ["a", "b"], "watcher: polling should go on after failed polls")
+            await batches.aclose()
+        check(server.hits(RECENT) == 3, "watcher: each failed poll should be retried once")
+
+
+async def test_watcher_polls_while_fetching_matches():
+    slow = asyncio.Event()
+
+    async def match(request):
+        matchId = request.path.rsplit("/", 1)[1]
+        if matchId == "slow":
+            await asyncio.wait_for(slow.wait(), 5)
+        if matchId == "broken":
+            return {"matchInfo": None}
+        return payloads.make_match(0, rounds=1)
+
+    async def recent(request):
+        if server.hits(RECENT) >= 5:
+            slow.set()
+        return {"currentTime": server.hits(RECENT), "matchIds": ["slow", "fast", "broken"][:server.hits(RECENT)]}
+
+    async with Server() as server:
+        server.script(RECENT, (200, recent, {}))
+        for matchId in ("slow", "fast", "broken"):
+            server.script(f"/na/val/match/v1/matches/{matchId}", (200, match, {}))
+        # Without the rate limiter, which holds the second match request until the first one has taught it the limits.
+        async with client(server, rate_limit=False) as c:
+            watcher = valaw.RecentMatchesWatcher(c, "competitive", "na", min_interval=0.01, max_interval=0.01)
+            matches = watcher.matches(concurrency=3)
+            results = dict([await matches.__anext__() for _ in range(3)])
+            await matches.aclose()
+    check(list(results)[-1] == "slow", f"watcher: matches found by later polls should not wait for a slow fetch, got {list(results)}")
+    check(isinstance(results.get("broken"), Exception), "watcher: a failed match should be yielded as its exception")
+    check(isinstance(results.get("fast"), valaw.objects.MatchDto), "watcher: matches should be decoded")
+
+
+TESTS = [
+    test_watcher_emits_each_match_once,
+    test_watcher_keeps_polling_after_errors,
+    test_watcher_polls_while_fetching_matches,
+]
+
+
+if __name__ == "__main__":
+    run(TESTS)